@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from .core import Argument as Argument
 from .core import Command as Command
+from .core import CommandMetadata as CommandMetadata
 from .core import CommandCollection as CommandCollection
 from .core import Context as Context
 from .core import Group as Group
@@ -36,13 +37,19 @@ from .exceptions import UsageError as UsageError
 from .formatting import HelpFormatter as HelpFormatter
 from .formatting import wrap_text as wrap_text
 from .globals import get_current_context as get_current_context
+from .termui import EWMARateEstimator as EWMARateEstimator
+from .termui import RateEstimator as RateEstimator
+from .termui import Style as Style
 from .termui import clear as clear
 from .termui import confirm as confirm
 from .termui import echo_via_pager as echo_via_pager
 from .termui import edit as edit
 from .termui import getchar as getchar
 from .termui import launch as launch
+from .termui import multiprogress as multiprogress
+from .termui import open_pager as open_pager
 from .termui import pause as pause
+from .termui import progress_channel as progress_channel
 from .termui import progressbar as progressbar
 from .termui import prompt as prompt
 from .termui import secho as secho
@@ -62,7 +69,12 @@ from .types import IntRange as IntRange
 from .types import ParamType as ParamType
 from .types import Path as Path
 from .types import Tuple as Tuple
+from .utils import OutputBuffer as OutputBuffer
+from .utils import atomic_group as atomic_group
+from .utils import buffered_output as buffered_output
+from .utils import copy_stream as copy_stream
 from .utils import echo as echo
+from .utils import echo_lines as echo_lines
 from .utils import format_filename as format_filename
 from .utils import get_app_dir as get_app_dir
 from .utils import get_binary_stream as get_binary_stream
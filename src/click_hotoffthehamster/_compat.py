@@ -6,6 +6,7 @@ import io
 import os
 import re
 import sys
+import threading
 import typing as t
 from types import TracebackType
 from weakref import WeakKeyDictionary
@@ -360,12 +361,297 @@ def _wrap_io_open(
     mode: str,
     encoding: str | None,
     errors: str | None,
+    buffering: int = -1,
 ) -> t.IO[t.Any]:
     """Handles not passing ``encoding`` and ``errors`` in binary mode."""
     if "b" in mode:
-        return open(file, mode)
+        return open(file, mode, buffering)
 
-    return open(file, mode, encoding=encoding, errors=errors)
+    return open(file, mode, buffering, encoding=encoding, errors=errors)
+
+
+def _advise_sequential(f: t.IO[t.Any]) -> None:
+    """Tell the OS that the file will be read from start to end, so it
+    reads further ahead. This is only a hint, and only available on some
+    platforms.
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except (AttributeError, OSError, ValueError):
+            pass
+
+
+#: Compression codecs by file extension, used by ``compression="auto"``.
+_COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+#: Leading bytes of each compression format, used to detect the codec
+#: of files and streams that don't have a known extension.
+_COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+}
+
+COMPRESSION_CODECS = ("gzip", "bz2", "xz")
+
+
+def _compression_from_magic(head: bytes) -> str | None:
+    for magic, codec in _COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return codec
+
+    return None
+
+
+def _compression_from_name(filename: str) -> str | None:
+    if filename == "-":
+        return None
+
+    return _COMPRESSION_EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def _peek_head(f: t.IO[bytes]) -> bytes:
+    """Return the first bytes of a stream without consuming them, so the
+    same stream can still be read from the start. This works for pipes
+    and FIFOs, which can only be opened and read once.
+    """
+    peek = getattr(f, "peek", None)
+
+    if peek is not None:
+        return t.cast(bytes, peek(6))[:6]
+
+    if not f.seekable():
+        return b""
+
+    pos = f.tell()
+    head = f.read(6)
+    f.seek(pos)
+    return head
+
+
+def _open_codec(codec: str, f: t.IO[bytes], mode: str) -> t.IO[bytes]:
+    if codec == "gzip":
+        import gzip
+
+        return t.cast(t.IO[bytes], gzip.GzipFile(fileobj=f, mode=mode))
+
+    if codec == "bz2":
+        import bz2
+
+        return t.cast(t.IO[bytes], bz2.BZ2File(f, mode))  # type: ignore[call-overload]
+
+    import lzma
+
+    return t.cast(t.IO[bytes], lzma.LZMAFile(f, mode))
+
+
+def _deflate_block(block: bytes, zdict: bytes, level: int) -> bytes:
+    import zlib
+
+    if zdict:
+        c = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, 0, zdict
+        )
+    else:
+        c = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    # A sync flush ends on a byte boundary without ending the stream, so
+    # the compressed blocks can be concatenated.
+    return c.compress(block) + c.flush(zlib.Z_SYNC_FLUSH)
+
+
+class _ParallelGzipWriter(io.BufferedIOBase):
+    """Write a gzip stream, compressing blocks of data in a thread pool.
+    zlib releases the GIL, so the blocks are compressed in parallel.
+
+    Like pigz, each block is deflated separately, using the end of the
+    previous block as a dictionary so the ratio stays close to a single
+    stream. The blocks are written in order as one gzip member, which
+    any gzip reader can decompress. At most two blocks per thread are
+    held in memory.
+    """
+
+    block_size = 128 * 1024
+
+    def __init__(self, f: t.IO[bytes], threads: int, level: int = 9) -> None:
+        import collections
+        import struct
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._f = f
+        self._level = level
+        self._executor = ThreadPoolExecutor(threads)
+        self._pending: collections.deque[t.Any] = collections.deque()
+        self._max_pending = 2 * threads
+        self._buffer = bytearray()
+        self._zdict = b""
+        self._crc = 0
+        self._size = 0
+        self._finished = False
+        # Header with no file name and the same flags as the gzip module.
+        xfl = 2 if level == 9 else 4 if level == 1 else 0
+        mtime = int(time.time())
+        f.write(b"\x1f\x8b\x08\x00" + struct.pack("<LBB", mtime, xfl, 255))
+
+    @property
+    def name(self) -> t.Any:
+        return getattr(self._f, "name", None)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: t.Any) -> int:
+        if self.closed:
+            raise ValueError("write to closed file")
+
+        with memoryview(b) as view:
+            n = view.nbytes
+            self._buffer += view
+
+        while len(self._buffer) >= self.block_size:
+            block = bytes(self._buffer[: self.block_size])
+            del self._buffer[: self.block_size]
+            self._submit(block)
+
+        return n
+
+    def _submit(self, block: bytes) -> None:
+        import zlib
+
+        self._crc = zlib.crc32(block, self._crc)
+        self._size += len(block)
+        self._pending.append(
+            self._executor.submit(_deflate_block, block, self._zdict, self._level)
+        )
+        self._zdict = block[-32 * 1024 :]
+
+        # Write finished blocks in order, waiting for the oldest one if
+        # too many are held in memory.
+        while self._pending and (
+            len(self._pending) > self._max_pending or self._pending[0].done()
+        ):
+            self._f.write(self._pending.popleft().result())
+
+    def _drain(self) -> None:
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+
+        while self._pending:
+            self._f.write(self._pending.popleft().result())
+
+    def flush(self) -> None:
+        if self.closed or self._finished:
+            return
+
+        self._drain()
+        self._f.flush()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            if not self._finished:
+                import struct
+                import zlib
+
+                self._drain()
+                self._finished = True
+                end = zlib.compressobj(self._level, zlib.DEFLATED, -zlib.MAX_WBITS)
+                self._f.write(end.flush())
+                self._f.write(struct.pack("<LL", self._crc, self._size & 0xFFFFFFFF))
+                self._f.flush()
+        finally:
+            self._finished = True
+            self._executor.shutdown()
+            super().close()
+
+
+def _open_compressed_stream(
+    filename: str,
+    mode: str,
+    encoding: str | None,
+    errors: str | None,
+    atomic: bool,
+    buffering: int,
+    sequential: bool,
+    codec: str | None,
+    threads: int = 1,
+    durability: str = "none",
+) -> tuple[t.IO[t.Any], bool]:
+    """Open a file through a compression codec. If ``codec`` is
+    ``None``, the file is read and the codec is detected from its first
+    bytes, or the file is returned as usual if none match.
+    """
+    if "+" in mode:
+        raise ValueError("Compressed files can't be opened for updating.")
+
+    # The codec reads and writes the underlying file in binary, and a
+    # text wrapper goes on top if needed. Atomic writes and standard
+    # streams are handled by the underlying file as usual.
+    codec_mode = mode.replace("t", "").replace("b", "") + "b"
+    f, should_close = open_stream(
+        filename,
+        codec_mode,
+        atomic=atomic,
+        buffering=buffering,
+        sequential=sequential,
+        durability=durability,
+    )
+
+    if codec is None:
+        codec = _compression_from_magic(_peek_head(f))
+
+        if codec is None:
+            if filename == "-":
+                # Peeking didn't consume anything from stdin.
+                return open_stream(
+                    filename, mode, encoding, errors, sequential=sequential
+                )
+
+            if "b" in mode:
+                return f, should_close
+
+            text = io.TextIOWrapper(f, encoding=encoding, errors=errors)
+            text.mode = mode  # type: ignore[misc]
+            return text, should_close
+
+    if codec == "gzip" and threads > 1 and codec_mode != "rb":
+        rv: t.IO[bytes] = t.cast(t.IO[bytes], _ParallelGzipWriter(f, threads))
+    else:
+        rv = _open_codec(codec, f, codec_mode)
+
+    if "b" not in mode:
+        rv = t.cast(t.IO[bytes], io.TextIOWrapper(rv, encoding=encoding, errors=errors))
+    elif codec_mode != "rb" and not isinstance(rv, _ParallelGzipWriter):
+        # The codecs compress each write separately, which is slow for
+        # many small writes. Readers already buffer their output.
+        buffer_size = buffering if buffering > 1 else 128 * 1024
+        rv = t.cast(
+            t.IO[bytes],
+            io.BufferedWriter(t.cast(io.RawIOBase, rv), buffer_size=buffer_size),
+        )
+
+    # Closing the codec writes its trailer, so it must always happen,
+    # even for standard streams which are flushed but left open.
+    cf = _CompressedFile(rv, f, should_close)
+    return t.cast(t.IO[t.Any], cf), True
+
+
+def _check_threads(mode: str, compression: str | None, threads: int) -> None:
+    """Check that ``threads`` can be used, after ``"auto"`` compression
+    was resolved to a codec. Only writing gzip uses threads.
+    """
+    if threads != 1 and (
+        threads < 1 or compression != "gzip" or not any(m in mode for m in "wax")
+    ):
+        raise ValueError(
+            "'threads' must be at least 1, and is only supported for"
+            " writing with 'gzip' compression."
+        )
 
 
 def open_stream(
@@ -374,24 +660,74 @@ def open_stream(
     encoding: str | None = None,
     errors: str | None = "strict",
     atomic: bool = False,
+    buffering: int = -1,
+    sequential: bool = False,
+    compression: str | None = None,
+    threads: int = 1,
+    durability: str = "none",
 ) -> tuple[t.IO[t.Any], bool]:
     binary = "b" in mode
     filename = os.fspath(filename)
 
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"Unknown durability {durability!r}.")
+
+    if durability != "none" and not atomic:
+        raise ValueError("'durability' is only supported for atomic writes.")
+
+    detect = False
+
+    if compression == "auto":
+        compression = _compression_from_name(filename)
+        # Without a known extension, read the file's first bytes,
+        # using the same stream so pipes are only opened once.
+        detect = compression is None and not any(m in mode for m in "wax+")
+    elif compression is not None and compression not in COMPRESSION_CODECS:
+        raise ValueError(f"Unknown compression {compression!r}.")
+
+    _check_threads(mode, compression, threads)
+
+    if compression is not None or detect:
+        return _open_compressed_stream(
+            filename,
+            mode,
+            encoding,
+            errors,
+            atomic,
+            buffering,
+            sequential,
+            compression,
+            threads,
+            durability,
+        )
+
     # Standard streams first. These are simple because they ignore the
-    # atomic flag. Use fsdecode to handle Path("-").
+    # atomic flag and buffering. Use fsdecode to handle Path("-").
     if os.fsdecode(filename) == "-":
         if any(m in mode for m in ["w", "a", "x"]):
             if binary:
                 return get_binary_stdout(), False
             return get_text_stdout(encoding=encoding, errors=errors), False
+        f: t.IO[t.Any]
+
         if binary:
-            return get_binary_stdin(), False
-        return get_text_stdin(encoding=encoding, errors=errors), False
+            f = get_binary_stdin()
+        else:
+            f = get_text_stdin(encoding=encoding, errors=errors)
+
+        if sequential:
+            _advise_sequential(f)
+
+        return f, False
 
     # Non-atomic writes directly go out through the regular open functions.
     if not atomic:
-        return _wrap_io_open(filename, mode, encoding, errors), True
+        f = _wrap_io_open(filename, mode, encoding, errors, buffering)
+
+        if sequential:
+            _advise_sequential(f)
+
+        return f, True
 
     # Some usability stuff for atomic writes
     if "a" in mode:
@@ -410,24 +746,58 @@ def open_stream(
     # as a proxy in the same folder and then using the fdopen
     # functionality to wrap it in a Python file.  Then we wrap it in an
     # atomic file that moves the file over on close.
-    import errno
-    import random
-
     try:
         perm: int | None = os.stat(filename).st_mode
     except OSError:
         perm = None
 
+    real_filename = os.path.realpath(filename)
+    anonymous = _open_anonymous_file(os.path.dirname(real_filename), perm)
+    tmp_filename = None
+    dir_fd = None
+
+    if anonymous is not None:
+        fd, dir_fd = anonymous
+    else:
+        fd, tmp_filename = _open_atomic_tmp_file(filename, binary, perm)
+
+    f = _wrap_io_open(fd, mode, encoding, errors, buffering)
+    af = _AtomicFile(f, tmp_filename, real_filename, durability, dir_fd)
+    return t.cast(t.IO[t.Any], af), True
+
+
+#: How much of an atomic write is flushed to disk before it's done.
+DURABILITY_LEVELS = ("none", "file", "dir")
+
+# Whether the kernel supports O_TMPFILE, and /proc can link it by name.
+_anonymous_files_supported = (
+    sys.platform.startswith("linux")
+    and hasattr(os, "O_TMPFILE")
+    and os.path.isdir("/proc/self/fd")
+)
+
+
+def _atomic_tmp_filename(filename: str) -> str:
+    import random
+
+    return os.path.join(
+        os.path.dirname(filename), f".__atomic-write{random.randrange(1 << 32):08x}"
+    )
+
+
+def _open_atomic_tmp_file(
+    filename: str, binary: bool, perm: int | None
+) -> tuple[int, str]:
+    """Create a file with a random name next to ``filename``."""
+    import errno
+
     flags = os.O_RDWR | os.O_CREAT | os.O_EXCL
 
     if binary:
         flags |= getattr(os, "O_BINARY", 0)
 
     while True:
-        tmp_filename = os.path.join(
-            os.path.dirname(filename),
-            f".__atomic-write{random.randrange(1 << 32):08x}",
-        )
+        tmp_filename = _atomic_tmp_filename(filename)
         try:
             fd = os.open(tmp_filename, flags, 0o666 if perm is None else perm)
             break
@@ -444,16 +814,110 @@ def open_stream(
     if perm is not None:
         os.chmod(tmp_filename, perm)  # in case perm includes bits in umask
 
-    f = _wrap_io_open(fd, mode, encoding, errors)
-    af = _AtomicFile(f, tmp_filename, os.path.realpath(filename))
-    return t.cast(t.IO[t.Any], af), True
+    return fd, tmp_filename
+
+
+def _open_anonymous_file(directory: str, perm: int | None) -> tuple[int, int] | None:
+    """Open an unnamed file in the directory with ``O_TMPFILE``, which is
+    given a name only once it's complete. Nothing is left behind if the
+    process dies first, and no temporary name needs to be picked.
+
+    Returns the file and the directory, which is kept open to link the
+    file and sync the directory. Returns ``None`` if the file system
+    doesn't support it.
+    """
+    global _anonymous_files_supported
+
+    if not _anonymous_files_supported:
+        return None
+
+    import errno
+
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        # Let the regular path raise a helpful error.
+        return None
+
+    try:
+        fd = os.open(
+            ".",
+            os.O_TMPFILE | os.O_RDWR,
+            0o666 if perm is None else perm,
+            dir_fd=dir_fd,
+        )
+    except OSError as e:
+        os.close(dir_fd)
+
+        # Old kernels report these for an unknown flag, other errors are
+        # raised by the regular path.
+        if e.errno in {errno.EISDIR, errno.EINVAL}:
+            _anonymous_files_supported = False
+
+        return None
+
+    if perm is not None:
+        os.fchmod(fd, perm)  # in case perm includes bits in umask
+
+    return fd, dir_fd
+
+
+def _fsync_dir(directory: str) -> None:
+    # Directories can't be opened for syncing on Windows.
+    if os.name == "nt":
+        return
+
+    fd = os.open(directory or ".", os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _AtomicGroup:
+    def __init__(self) -> None:
+        self.dirs: set[str] = set()
+
+    def commit(self) -> None:
+        for directory in sorted(self.dirs):
+            _fsync_dir(directory)
+
+        self.dirs.clear()
+
+
+_atomic_groups = threading.local()
+
+
+def _current_atomic_group() -> _AtomicGroup | None:
+    stack: list[_AtomicGroup] = getattr(_atomic_groups, "stack", [])
+    return stack[-1] if stack else None
+
+
+def _push_atomic_group() -> _AtomicGroup:
+    group = _AtomicGroup()
+    _atomic_groups.__dict__.setdefault("stack", []).append(group)
+    return group
+
+
+def _pop_atomic_group(group: _AtomicGroup) -> None:
+    _atomic_groups.stack.remove(group)
 
 
 class _AtomicFile:
-    def __init__(self, f: t.IO[t.Any], tmp_filename: str, real_filename: str) -> None:
+    def __init__(
+        self,
+        f: t.IO[t.Any],
+        tmp_filename: str | None,
+        real_filename: str,
+        durability: str = "none",
+        dir_fd: int | None = None,
+    ) -> None:
         self._f = f
         self._tmp_filename = tmp_filename
         self._real_filename = real_filename
+        self._durability = durability
+        self._dir_fd = dir_fd
         self.closed = False
 
     @property
@@ -463,12 +927,108 @@ class _AtomicFile:
     def close(self, delete: bool = False) -> None:
         if self.closed:
             return
-        self._f.close()
-        os.replace(self._tmp_filename, self._real_filename)
-        self.closed = True
+
+        try:
+            try:
+                if self._durability != "none":
+                    self._f.flush()
+                    getattr(os, "fdatasync", os.fsync)(self._f.fileno())
+
+                if self._dir_fd is not None:
+                    self._f.flush()
+                    self._link(self._dir_fd)
+            finally:
+                self._f.close()
+
+            if self._tmp_filename is not None:
+                os.replace(self._tmp_filename, self._real_filename)
+
+            self.closed = True
+
+            if self._durability == "dir":
+                group = _current_atomic_group()
+
+                if group is not None:
+                    group.dirs.add(os.path.dirname(self._real_filename))
+                elif self._dir_fd is not None:
+                    os.fsync(self._dir_fd)
+                else:
+                    _fsync_dir(os.path.dirname(self._real_filename))
+        finally:
+            if self._dir_fd is not None:
+                os.close(self._dir_fd)
+                self._dir_fd = None
+
+    def _link(self, dir_fd: int) -> None:
+        """Give the anonymous file a name. If the target doesn't exist,
+        it's linked there directly, otherwise it's linked next to it and
+        moved over it.
+
+        If linking fails, for example because ``/proc`` doesn't allow
+        it, the data is copied to a named file instead.
+        """
+        # Passing dir_fd makes Python use linkat, which can follow the
+        # link in /proc to the open file.
+        path = f"/proc/self/fd/{self._f.fileno()}"
+        name = os.path.basename(self._real_filename)
+
+        try:
+            try:
+                os.link(path, name, dst_dir_fd=dir_fd, follow_symlinks=True)
+                return
+            except FileExistsError:
+                pass
+
+            while True:
+                tmp_filename = _atomic_tmp_filename(self._real_filename)
+
+                try:
+                    os.link(
+                        path,
+                        os.path.basename(tmp_filename),
+                        dst_dir_fd=dir_fd,
+                        follow_symlinks=True,
+                    )
+                    break
+                except FileExistsError:
+                    continue
+        except OSError:
+            tmp_filename = self._copy_to_tmp_file()
+
+        self._tmp_filename = tmp_filename
+
+    def _copy_to_tmp_file(self) -> str:
+        """Copy the anonymous file to a new file with a temporary name,
+        which is moved over the target on close.
+        """
+        import shutil
+
+        src = self._f.fileno()
+        perm = os.fstat(src).st_mode
+        fd, tmp_filename = _open_atomic_tmp_file(self._real_filename, True, perm)
+
+        try:
+            with open(src, "rb", closefd=False) as fsrc, open(fd, "wb") as fdst:
+                fsrc.seek(0)
+                shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+                if self._durability != "none":
+                    fdst.flush()
+                    getattr(os, "fdatasync", os.fsync)(fdst.fileno())
+        except BaseException:
+            os.unlink(tmp_filename)
+            raise
+
+        return tmp_filename
 
     def __getattr__(self, name: str) -> t.Any:
-        return getattr(self._f, name)
+        value = getattr(self._f, name)
+
+        # Bind methods directly, so later calls skip this lookup.
+        if callable(value):
+            self.__dict__[name] = value
+
+        return value
 
     def __enter__(self) -> _AtomicFile:
         return self
@@ -485,6 +1045,60 @@ class _AtomicFile:
         return repr(self._f)
 
 
+class _CompressedFile:
+    """Closes a compression stream and then the file underneath it. The
+    stdlib codecs leave a passed in file open, which would lose the
+    rename of an atomic file, or leak the file descriptor.
+    """
+
+    def __init__(self, f: t.IO[t.Any], raw: t.IO[t.Any], close_raw: bool) -> None:
+        self._f = f
+        self._raw = raw
+        self._close_raw = close_raw
+
+    @property
+    def closed(self) -> bool:
+        return self._f.closed
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+
+        try:
+            self._f.close()
+        finally:
+            if self._close_raw:
+                self._raw.close()
+            elif not self._raw.closed:
+                self._raw.flush()
+
+    def __getattr__(self, name: str) -> t.Any:
+        value = getattr(self._f, name)
+
+        # Bind methods directly, so later calls skip this lookup.
+        if callable(value):
+            self.__dict__[name] = value
+
+        return value
+
+    def __enter__(self) -> _CompressedFile:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __iter__(self) -> cabc.Iterator[t.Any]:
+        return iter(self._f)
+
+    def __repr__(self) -> str:
+        return repr(self._f)
+
+
 def strip_ansi(value: str) -> str:
     return _ansi_re.sub("", value)
 
@@ -502,7 +1116,7 @@ def should_strip_ansi(
     if color is None:
         if stream is None:
             stream = sys.stdin
-        return not isatty(stream) and not _is_jupyter_kernel_output(stream)
+        return not terminal_info.supports_ansi(stream)
     return not color
 
 
@@ -568,6 +1182,10 @@ else:
 
 
 def term_len(x: str) -> int:
+    # Skip the regex for text without escape sequences.
+    if "\033" not in x:
+        return len(x)
+
     return len(strip_ansi(x))
 
 
@@ -578,6 +1196,95 @@ def isatty(stream: t.IO[t.Any]) -> bool:
         return False
 
 
+class _TerminalInfo:
+    """Caches what is known about the terminal, so that writing many
+    times to a stream doesn't ask the OS each time.
+
+    Whether a stream is a terminal that supports ANSI codes is cached per
+    stream object. The terminal size is cached for ``size_ttl`` seconds,
+    so a resize is noticed shortly after. Changing the ``COLUMNS`` or
+    ``LINES`` environment variables is noticed right away.
+
+    ``stats`` counts how often each value was queried from the OS and how
+    often the cached value was used.
+    """
+
+    #: How many seconds the terminal size is cached for.
+    size_ttl = 0.5
+
+    def __init__(self) -> None:
+        self._streams: cabc.MutableMapping[t.IO[t.Any], bool] = WeakKeyDictionary()
+        self._isatty = isatty
+        self._size: os.terminal_size | None = None
+        self._size_key: tuple[str | None, str | None] = (None, None)
+        self._size_expires = 0.0
+        self.stats = {"isatty": 0, "isatty_cached": 0, "size": 0, "size_cached": 0}
+
+    def supports_ansi(self, stream: t.IO[t.Any]) -> bool:
+        """Whether the stream is a terminal or Jupyter output, where ANSI
+        codes are shown rather than stripped.
+        """
+        if isatty is not self._isatty:
+            # The function was replaced, such as in tests, and may give a
+            # different result for the same stream each time.
+            return isatty(stream) or _is_jupyter_kernel_output(stream)
+
+        try:
+            rv = self._streams[stream]
+        except (KeyError, TypeError):
+            pass
+        else:
+            self.stats["isatty_cached"] += 1
+            return rv
+
+        self.stats["isatty"] += 1
+        rv = isatty(stream) or _is_jupyter_kernel_output(stream)
+
+        try:
+            self._streams[stream] = rv
+        except TypeError:
+            # The stream can't be weakly referenced.
+            pass
+
+        return rv
+
+    def get_size(self) -> os.terminal_size:
+        """Get the terminal size, like :func:`shutil.get_terminal_size`."""
+        import time
+
+        key = (os.environ.get("COLUMNS"), os.environ.get("LINES"))
+        now = time.monotonic()
+
+        if (
+            self._size is not None
+            and key == self._size_key
+            and now < self._size_expires
+        ):
+            self.stats["size_cached"] += 1
+            return self._size
+
+        import shutil
+
+        self.stats["size"] += 1
+        self._size = size = shutil.get_terminal_size()
+        self._size_key = key
+        self._size_expires = now + self.size_ttl
+        return size
+
+    def clear(self) -> None:
+        """Forget all cached values."""
+        self._streams.clear()
+        self._size = None
+
+
+terminal_info = _TerminalInfo()
+
+
+def get_terminal_size() -> os.terminal_size:
+    """Get the terminal size, cached for a short time."""
+    return terminal_info.get_size()
+
+
 def _make_cached_stream_func(
     src_func: t.Callable[[], t.TextIO | None],
     wrapper_func: t.Callable[[], t.TextIO],
@@ -7,13 +7,16 @@ from __future__ import annotations
 
 import collections.abc as cabc
 import contextlib
+import errno
 import math
 import os
 import sys
+import threading
 import time
 import typing as t
 from gettext import gettext as _
 from io import StringIO
+from itertools import islice
 from types import TracebackType
 
 from ._compat import (
@@ -21,14 +24,18 @@ from ._compat import (
     WIN,
     _default_text_stdout,
     get_best_encoding,
+    get_terminal_size,
     isatty,
-    open_stream,
+    should_strip_ansi,
     strip_ansi,
     term_len,
 )
 from .exceptions import ClickException
 from .utils import echo
 
+if t.TYPE_CHECKING:
+    from .termui import RateEstimator
+
 V = t.TypeVar("V")
 
 if os.name == "nt":
@@ -39,6 +46,20 @@ else:
     AFTER_BAR = "\033[?25h\n"
 
 
+def _format_duration(seconds: float) -> str:
+    t = int(seconds)
+    seconds = t % 60
+    t //= 60
+    minutes = t % 60
+    t //= 60
+    hours = t % 24
+    t //= 24
+    if t > 0:
+        return f"{t}d {hours:02}:{minutes:02}:{seconds:02}"
+    else:
+        return f"{hours:02}:{minutes:02}:{seconds:02}"
+
+
 class ProgressBar(t.Generic[V]):
     def __init__(
         self,
@@ -57,7 +78,17 @@ class ProgressBar(t.Generic[V]):
         color: bool | None = None,
         update_min_steps: int = 1,
         width: int = 30,
+        max_fps: float | None = None,
+        rate_estimator: RateEstimator | None = None,
+        rate_unit: str = "",
+        log_format: t.Literal["json", "logfmt"] | None = None,
+        log_interval: float = 10.0,
+        log_percent: float | None = None,
+        log_file: t.TextIO | None = None,
     ) -> None:
+        if log_format not in {None, "json", "logfmt"}:
+            raise ValueError(f"Unknown log format {log_format!r}.")
+
         self.fill_char = fill_char
         self.empty_char = empty_char
         self.bar_template = bar_template
@@ -108,10 +139,33 @@ class ProgressBar(t.Generic[V]):
         self.current_item: V | None = None
         self.is_hidden: bool = not isatty(self.file)
         self._last_line: str | None = None
+        self.max_fps = max_fps
+        self._render_thread: threading.Thread | None = None
+        self._render_lock = threading.Lock()
+        self._stop_rendering = threading.Event()
+        # Set when the bar is rendered as part of a MultiProgress.
+        self._multi: MultiProgress | None = None
+        self.rate_estimator = rate_estimator
+        self.rate_unit = rate_unit
+        self._length_from_files = False
+        self.log_format = log_format
+        self.log_interval = log_interval
+        self.log_percent = log_percent
+        self.log_file = log_file
+        self._next_log_time = -math.inf
+        self._next_log_pos = 0.0
+        self._logged_finish = False
+
+        if rate_estimator is not None:
+            rate_estimator.reset(self.pos, self.start)
 
     def __enter__(self) -> ProgressBar[V]:
         self.entered = True
         self.render_progress()
+
+        if self.max_fps is not None and self.max_fps > 0 and not self.is_hidden:
+            self._start_render_thread()
+
         return self
 
     def __exit__(
@@ -120,12 +174,53 @@ class ProgressBar(t.Generic[V]):
         exc_value: BaseException | None,
         tb: TracebackType | None,
     ) -> None:
+        if self._multi is not None:
+            self.finish()
+            return
+
+        if self._stop_render_thread():
+            self.render_progress()
+
         self.render_finish()
 
+    def _start_render_thread(self) -> None:
+        """Render from a background thread at most ``max_fps`` times per
+        second. Updates then only advance the position.
+        """
+        interval = 1 / t.cast(float, self.max_fps)
+
+        def run() -> None:
+            while not self._stop_rendering.wait(interval):
+                with self._render_lock:
+                    self.make_step(0)
+                    self.render_progress()
+
+        self._stop_rendering.clear()
+        self._render_thread = threading.Thread(
+            target=run, name="click-progressbar", daemon=True
+        )
+        self._render_thread.start()
+
+    def _stop_render_thread(self) -> bool:
+        """Stop the render thread if it is running. Returns ``True`` if it
+        was, so the final state still needs to be rendered.
+        """
+        thread = self._render_thread
+
+        if thread is None:
+            return False
+
+        self._render_thread = None
+        self._stop_rendering.set()
+        thread.join()
+        self.make_step(0)
+        return True
+
     def __iter__(self) -> cabc.Iterator[V]:
         if not self.entered:
             raise RuntimeError("You need to use progress bars in a with block.")
-        self.render_progress()
+        if self._render_thread is None:
+            self.render_progress()
         return self.generator()
 
     def __next__(self) -> V:
@@ -137,7 +232,13 @@ class ProgressBar(t.Generic[V]):
         return next(iter(self))
 
     def render_finish(self) -> None:
-        if self.is_hidden:
+        if self.is_hidden and self.log_format is not None:
+            if not self._logged_finish:
+                self.render_log()
+
+            return
+
+        if self.is_hidden or self._multi is not None:
             return
         self.file.write(AFTER_BAR)
         self.file.flush()
@@ -150,10 +251,30 @@ class ProgressBar(t.Generic[V]):
 
     @property
     def time_per_iteration(self) -> float:
+        if self.rate_estimator is not None:
+            rate = self.rate_estimator.rate
+            return 1 / rate if rate > 0 else 0.0
+
         if not self.avg:
             return 0.0
         return sum(self.avg) / float(len(self.avg))
 
+    @property
+    def rate(self) -> float:
+        """The number of steps per second."""
+        if self.rate_estimator is not None:
+            return self.rate_estimator.rate
+
+        time_per_iteration = self.time_per_iteration
+        return 1 / time_per_iteration if time_per_iteration else 0.0
+
+    @property
+    def is_stalled(self) -> bool:
+        """Whether the rate estimator reports that the bar stalled."""
+        return self.rate_estimator is not None and self.rate_estimator.is_stalled(
+            time.time()
+        )
+
     @property
     def eta(self) -> float:
         if self.length is not None and not self.finished:
@@ -162,19 +283,35 @@ class ProgressBar(t.Generic[V]):
 
     def format_eta(self) -> str:
         if self.eta_known:
-            t = int(self.eta)
-            seconds = t % 60
-            t //= 60
-            minutes = t % 60
-            t //= 60
-            hours = t % 24
-            t //= 24
-            if t > 0:
-                return f"{t}d {hours:02}:{minutes:02}:{seconds:02}"
-            else:
-                return f"{hours:02}:{minutes:02}:{seconds:02}"
+            return _format_duration(self.eta)
         return ""
 
+    def format_elapsed(self) -> str:
+        return _format_duration(time.time() - self.start)
+
+    def format_rate(self) -> str:
+        if self.is_stalled:
+            return _("stalled")
+
+        rate = self.rate
+
+        for prefix in ("", "k", "M", "G"):
+            if rate < 999.5:
+                break
+
+            rate /= 1000
+        else:
+            prefix = "T"
+
+        if rate < 9.995:
+            value = f"{rate:.2f}"
+        elif rate < 99.95:
+            value = f"{rate:.1f}"
+        else:
+            value = f"{rate:.0f}"
+
+        return f"{value}{prefix}{self.rate_unit}/s"
+
     def format_pos(self) -> str:
         pos = str(self.pos)
         if self.length is not None:
@@ -221,19 +358,39 @@ class ProgressBar(t.Generic[V]):
             if item_info is not None:
                 info_bits.append(item_info)
 
-        return (
-            self.bar_template
-            % {
-                "label": self.label,
-                "bar": self.format_bar(),
-                "info": self.info_sep.join(info_bits),
-            }
-        ).rstrip()
+        values = {
+            "label": self.label,
+            "bar": self.format_bar(),
+            "info": self.info_sep.join(info_bits),
+        }
+
+        # Only format the optional values the template uses.
+        for key, format_value in (
+            ("rate", self.format_rate),
+            ("elapsed", self.format_elapsed),
+            ("eta", self.format_eta),
+        ):
+            if f"%({key})" in self.bar_template:
+                values[key] = format_value()
+
+        return (self.bar_template % values).rstrip()
 
     def render_progress(self) -> None:
-        import shutil
+        if self._multi is not None:
+            # The MultiProgress renders all its bars together.
+            return
 
         if self.is_hidden:
+            if self.log_format is not None:
+                if (
+                    self.pos >= self._next_log_pos
+                    or time.time() >= self._next_log_time
+                    or (self.finished and not self._logged_finish)
+                ):
+                    self.render_log()
+
+                return
+
             # Only output the label as it changes if the output is not a
             # TTY. Use file=stderr if you expect to be piping stdout.
             if self._last_line != self.label:
@@ -248,7 +405,7 @@ class ProgressBar(t.Generic[V]):
             old_width = self.width
             self.width = 0
             clutter_length = term_len(self.format_progress_line())
-            new_width = max(0, shutil.get_terminal_size().columns - clutter_length)
+            new_width = max(0, get_terminal_size().columns - clutter_length)
             if new_width < old_width:
                 buf.append(BEFORE_BAR)
                 buf.append(" " * self.max_width)  # type: ignore
@@ -275,25 +432,91 @@ class ProgressBar(t.Generic[V]):
             echo(line, file=self.file, color=self.color, nl=False)
             self.file.flush()
 
+    def format_log_line(self) -> str:
+        """Format the current state as a JSON or logfmt line, for
+        :meth:`render_log`.
+        """
+        values: dict[str, t.Any] = {}
+
+        if self.label:
+            values["label"] = self.label
+
+        values["pos"] = self.pos
+        values["length"] = self.length
+        values["rate"] = round(self.rate, 3)
+        values["eta"] = round(self.eta, 3) if self.eta_known else None
+        values["elapsed"] = round(time.time() - self.start, 3)
+        values["finished"] = self.finished
+
+        if self.item_show_func is not None:
+            values["item"] = self.item_show_func(self.current_item)
+
+        import json
+
+        if self.log_format == "json":
+            return json.dumps(values)
+
+        parts = []
+
+        for key, value in values.items():
+            if value is None:
+                value = ""
+            elif isinstance(value, bool):
+                value = "true" if value else "false"
+            elif isinstance(value, str):
+                if not value or any(c in value for c in ' ="\\'):
+                    value = json.dumps(value)
+            else:
+                value = str(value)
+
+            parts.append(f"{key}={value}")
+
+        return " ".join(parts)
+
+    def render_log(self) -> None:
+        """Write a structured line with the current state, and schedule
+        the next one after ``log_interval`` seconds or ``log_percent``
+        percent of progress.
+        """
+        self.make_step(0)
+        echo(self.format_log_line(), file=self.log_file or self.file)
+        self._logged_finish = self.finished
+        self._next_log_time = time.time() + self.log_interval
+
+        if self.log_percent is not None and self.length:
+            self._next_log_pos = self.pos + max(self.length * self.log_percent / 100, 1)
+
+            # The finished line is written anyway.
+            if self._next_log_pos >= self.length:
+                self._next_log_pos = math.inf
+        else:
+            self._next_log_pos = math.inf
+
     def make_step(self, n_steps: int) -> None:
         self.pos += n_steps
         if self.length is not None and self.pos >= self.length:
             self.finished = True
 
-        if (time.time() - self.last_eta) < 1.0:
+        now = time.time()
+
+        if self.rate_estimator is not None:
+            self.rate_estimator.update(self.pos, now)
+
+        if (now - self.last_eta) < 1.0:
             return
 
-        self.last_eta = time.time()
+        self.last_eta = now
 
-        # self.avg is a rolling list of length <= 7 of steps where steps are
-        # defined as time elapsed divided by the total progress through
-        # self.length.
-        if self.pos:
-            step = (time.time() - self.start) / self.pos
-        else:
-            step = time.time() - self.start
+        if self.rate_estimator is None:
+            # self.avg is a rolling list of length <= 7 of steps where steps
+            # are defined as time elapsed divided by the total progress
+            # through self.length.
+            if self.pos:
+                step = (now - self.start) / self.pos
+            else:
+                step = now - self.start
 
-        self.avg = self.avg[-6:] + [step]
+            self.avg = self.avg[-6:] + [step]
 
         self.eta_known = self.length is not None
 
@@ -316,6 +539,19 @@ class ProgressBar(t.Generic[V]):
         if current_item is not None:
             self.current_item = current_item
 
+        if self._render_thread is not None or self._multi is not None:
+            # The render thread picks up the new position.
+            with self._render_lock:
+                self.pos += n_steps
+
+                if self.length is not None and self.pos >= self.length:
+                    self.finished = True
+
+            if self._multi is not None:
+                self._multi._bar_updated()
+
+            return
+
         self._completed_intervals += n_steps
 
         if self._completed_intervals >= self.update_min_steps:
@@ -343,8 +579,38 @@ class ProgressBar(t.Generic[V]):
         if not self.entered:
             raise RuntimeError("You need to use progress bars in a with block.")
 
-        if self.is_hidden:
+        if self._multi is not None:
+            for rv in self.iter:
+                self.current_item = rv
+                yield rv
+                self.update(1)
+
+            self.finish()
+        elif self.is_hidden and self.log_format is not None:
+            clock = time.time
+
+            for pos, rv in enumerate(self.iter, self.pos + 1):
+                self.current_item = rv
+                yield rv
+                self.pos = pos
+
+                # Checked inline to keep the loop cheap between lines.
+                if pos >= self._next_log_pos or clock() >= self._next_log_time:
+                    self.render_log()
+
+            self.finish()
+            self.render_log()
+        elif self.is_hidden:
             yield from self.iter
+        elif self._render_thread is not None:
+            for rv in self.iter:
+                self.current_item = rv
+                yield rv
+                self.pos += 1
+
+            self._stop_render_thread()
+            self.finish()
+            self.render_progress()
         else:
             for rv in self.iter:
                 self.current_item = rv
@@ -361,9 +627,675 @@ class ProgressBar(t.Generic[V]):
             self.finish()
             self.render_progress()
 
+    def iter_batches(self, size: int) -> cabc.Iterator[list[V]]:
+        """Yield the items in lists of up to ``size`` items, and advance
+        the bar once per list after it is processed. This avoids the
+        per-item cost of updating the bar in very long, fast loops.
+
+        .. code-block:: python
+
+            with click.progressbar(rows) as bar:
+                for batch in bar.iter_batches(10_000):
+                    for row in batch:
+                        process(row)
 
-def pager(generator: cabc.Iterable[str], color: bool | None = None) -> None:
+        A whole batch is read from the iterable before it is yielded.
+
+        :param size: The maximum number of items in each batch.
+
+        .. versionadded:: 8.2
+        """
+        if not self.entered:
+            raise RuntimeError("You need to use progress bars in a with block.")
+
+        if size < 1:
+            raise ValueError("The batch size must be at least 1.")
+
+        it = iter(self.iter)
+
+        while True:
+            batch = list(islice(it, size))
+
+            if not batch:
+                break
+
+            yield batch
+            self.update(len(batch), batch[-1])
+
+        self.finish()
+
+        if self._render_thread is None:
+            self.render_progress()
+
+    def track(
+        self, iterable: cabc.Iterable[V] | None = None, every: int = 1000
+    ) -> cabc.Iterator[V]:
+        """Yield each item, but only advance the bar once every
+        ``every`` items. This makes iterating almost as fast as a plain
+        ``for`` loop, see :meth:`iter_batches`.
+
+        .. code-block:: python
+
+            with click.progressbar(length=len(rows)) as bar:
+                for row in bar.track(rows, every=10_000):
+                    process(row)
+
+        :param iterable: Iterate over this instead of the iterable the
+            bar was created with.
+        :param every: Advance the bar after this many items.
+
+        .. versionadded:: 8.2
+        """
+        if iterable is not None:
+            self.iter = iter(iterable)
+
+        for batch in self.iter_batches(every):
+            yield from batch
+
+    def wrap_reader(self, file: t.IO[t.AnyStr]) -> ProgressReader[t.AnyStr]:
+        """Return a proxy for a file that advances the bar by the number
+        of bytes, or characters in text mode, read through it.
+
+        .. code-block:: python
+
+            with click.progressbar(length=0, rate_unit="B") as bar:
+                digest = hashlib.file_digest(bar.wrap_reader(f), "sha256")
+
+        If the bar was created with ``length=0``, the size of each
+        wrapped file that is left to read is added to the length. The
+        size is known for regular files, including a :class:`File`
+        argument.
+
+        :param file: The file to read from.
+
+        .. versionadded:: 8.2
+        """
+        if self.length == 0 or self._length_from_files:
+            size = _remaining_size(file)
+
+            if size is not None:
+                self._length_from_files = True
+                self.length = (self.length or 0) + size
+
+        return ProgressReader(self, file)
+
+    def wrap_writer(self, file: t.IO[t.AnyStr]) -> ProgressWriter[t.AnyStr]:
+        """Return a proxy for a file that advances the bar by the number
+        of bytes, or characters in text mode, written through it.
+
+        :param file: The file to write to.
+
+        .. versionadded:: 8.2
+        """
+        return ProgressWriter(self, file)
+
+
+def _remaining_size(file: t.IO[t.Any]) -> int | None:
+    """The number of bytes left to read from a regular file, or ``None``
+    if the file has no size.
+    """
+    import stat
+
+    try:
+        if hasattr(file, "encoding"):
+            # tell() on a text stream returns an opaque cookie. Use the
+            # binary buffer's position, which only differs by what the
+            # text layer has read ahead.
+            file = file.buffer  # type: ignore[attr-defined]
+
+        st = os.fstat(file.fileno())
+
+        if not stat.S_ISREG(st.st_mode):
+            return None
+
+        return max(st.st_size - file.tell(), 0)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+class _ProgressFile(t.Generic[t.AnyStr]):
+    """Proxy a file and advance a progress bar as data passes through.
+    Anything else is looked up on the file, which also keeps a
+    :class:`LazyFile` from being opened before it is used.
+    """
+
+    def __init__(self, bar: ProgressBar[t.Any], file: t.IO[t.AnyStr]) -> None:
+        self._bar = bar
+        self._file: t.IO[t.AnyStr] = file
+
+    def __getattr__(self, name: str) -> t.Any:
+        return getattr(self._file, name)
+
+    def __enter__(self) -> _ProgressFile[t.AnyStr]:
+        self._file.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._file.__exit__(exc_type, exc_value, tb)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._file!r}>"
+
+
+class ProgressReader(_ProgressFile[t.AnyStr]):
+    """A file proxy returned by :meth:`ProgressBar.wrap_reader`."""
+
+    def read(self, size: int = -1) -> t.AnyStr:
+        data = self._file.read(size)
+
+        if data:
+            self._bar.update(len(data))
+
+        return data
+
+    def read1(self, size: int = -1) -> t.AnyStr:
+        data: t.AnyStr = self._file.read1(size)  # type: ignore[attr-defined]
+
+        if data:
+            self._bar.update(len(data))
+
+        return data
+
+    def readinto(self, buffer: t.Any) -> int | None:
+        # Read into the caller's buffer, without copying.
+        n: int | None = self._file.readinto(buffer)  # type: ignore[attr-defined]
+
+        if n:
+            self._bar.update(n)
+
+        return n
+
+    def readinto1(self, buffer: t.Any) -> int | None:
+        n: int | None = self._file.readinto1(buffer)  # type: ignore[attr-defined]
+
+        if n:
+            self._bar.update(n)
+
+        return n
+
+    def readline(self, size: int = -1) -> t.AnyStr:
+        line = self._file.readline(size)
+
+        if line:
+            self._bar.update(len(line))
+
+        return line
+
+    def readlines(self, hint: int = -1) -> list[t.AnyStr]:
+        lines = self._file.readlines(hint)
+        self._bar.update(sum(map(len, lines)))
+        return lines
+
+    def __iter__(self) -> cabc.Iterator[t.AnyStr]:
+        for line in self._file:
+            self._bar.update(len(line))
+            yield line
+
+
+class ProgressWriter(_ProgressFile[t.AnyStr]):
+    """A file proxy returned by :meth:`ProgressBar.wrap_writer`."""
+
+    def write(self, data: t.AnyStr) -> int:
+        n = self._file.write(data)
+        # Raw binary files can write less than was passed.
+        self._bar.update(len(data) if n is None else n)
+        return n
+
+    def writelines(self, lines: cabc.Iterable[t.AnyStr]) -> None:
+        for line in lines:
+            self.write(line)
+
+
+class MultiProgress:
+    """Render several progress bars stacked on top of each other, with a
+    bar for the total progress below them. Create it with
+    :func:`click.multiprogress`.
+    """
+
+    def __init__(
+        self,
+        label: str | None = None,
+        show_eta: bool = True,
+        show_percent: bool | None = None,
+        show_pos: bool = False,
+        fill_char: str = "#",
+        empty_char: str = " ",
+        bar_template: str = "%(bar)s",
+        info_sep: str = "  ",
+        width: int = 30,
+        file: t.TextIO | None = None,
+        color: bool | None = None,
+        show_total: bool = True,
+        max_fps: float | None = 10,
+        summary_interval: float = 5.0,
+    ) -> None:
+        if file is None:
+            file = _default_text_stdout()
+
+            if file is None:
+                file = StringIO()
+
+        self.file = file
+        self.color = color
+        self.show_total = show_total
+        self.max_fps = max_fps
+        self.summary_interval = summary_interval
+        self.bars: list[ProgressBar[t.Any]] = []
+        self.is_hidden: bool = not isatty(self.file)
+        self.entered: bool = False
+        self._bar_options: dict[str, t.Any] = {
+            "show_eta": show_eta,
+            "show_percent": show_percent,
+            "show_pos": show_pos,
+            "fill_char": fill_char,
+            "empty_char": empty_char,
+            "bar_template": bar_template,
+            "info_sep": info_sep,
+            "width": width,
+            "file": self.file,
+            "color": color,
+        }
+        self.total: ProgressBar[int] = ProgressBar(
+            None,
+            length=0,
+            label=label if label is not None else _("Total"),
+            **self._bar_options,
+        )
+        self._lock = threading.Lock()
+        self._render_thread: threading.Thread | None = None
+        self._stop_rendering = threading.Event()
+        self._line_count = 0
+        self._last_output: str | None = None
+        self._render_on_update = False
+
+    def add(
+        self,
+        iterable: cabc.Iterable[V] | None = None,
+        length: int | None = None,
+        label: str | None = None,
+        item_show_func: t.Callable[[V | None], str | None] | None = None,
+    ) -> ProgressBar[V]:
+        """Add a bar and return it. The bar can be iterated over, or
+        advanced with its ``update()`` method, from any thread. Leaving
+        the bar's ``with`` block, if it is used, marks it finished.
+
+        :param iterable: An iterable to iterate over. If not provided,
+            the length is required.
+        :param length: The number of items to iterate over.
+        :param label: The label to show next to the bar.
+        :param item_show_func: A function called with the current item
+            which can return a string to show next to the bar.
+        """
+        bar: ProgressBar[V] = ProgressBar(
+            iterable,
+            length=length,
+            label=label,
+            item_show_func=item_show_func,
+            **self._bar_options,
+        )
+        bar._multi = self
+        bar.entered = True
+
+        with self._lock:
+            self.bars.append(bar)
+
+        return bar
+
+    def __enter__(self) -> MultiProgress:
+        self.entered = True
+
+        if self.is_hidden:
+            interval = self.summary_interval
+        elif self.max_fps is not None and self.max_fps > 0:
+            interval = 1 / self.max_fps
+            self.render_progress()
+        else:
+            # Not throttled, each update renders right away.
+            interval = 0
+            self._render_on_update = True
+            self.render_progress()
+
+        if interval > 0:
+
+            def run() -> None:
+                while not self._stop_rendering.wait(interval):
+                    self.render_progress()
+
+            self._stop_rendering.clear()
+            self._render_thread = threading.Thread(
+                target=run, name="click-multiprogress", daemon=True
+            )
+            self._render_thread.start()
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._render_on_update = False
+        thread = self._render_thread
+
+        if thread is not None:
+            self._render_thread = None
+            self._stop_rendering.set()
+            thread.join()
+
+        self.render_progress()
+
+        if not self.is_hidden:
+            self.file.write(AFTER_BAR)
+            self.file.flush()
+
+    def _bar_updated(self) -> None:
+        if self._render_on_update:
+            self.render_progress()
+
+    def _update_total(self, bars: list[ProgressBar[t.Any]]) -> None:
+        total = self.total
+        lengths = [bar.length for bar in bars]
+        total.pos = sum(bar.pos for bar in bars)
+
+        if None in lengths:
+            total.length = None
+        else:
+            total.length = sum(t.cast("list[int]", lengths))
+
+        total.make_step(0)
+        total.finished = bool(bars) and all(bar.finished for bar in bars)
+
+    def format_summary(self) -> str:
+        """Return the line that is printed periodically instead of the
+        bars if the file is not a terminal.
+        """
+        total = self.total
+        done = sum(bar.finished for bar in self.bars)
+        info = total.format_pos()
+
+        if total.length:
+            info += f" ({total.format_pct().strip()})"
+
+        return _("{label}: {info}, {done} of {count} done").format(
+            label=total.label, info=info, done=done, count=len(self.bars)
+        )
+
+    def format_lines(self, bars: list[ProgressBar[t.Any]]) -> list[str]:
+        """Return the lines of one frame. If the terminal is too small
+        for all bars, finished bars are left out first.
+        """
+        size = get_terminal_size()
+        max_lines = max(size.lines - 1 - self.show_total, 1)
+
+        if len(bars) > max_lines:
+            bars = [bar for bar in bars if not bar.finished] or bars
+
+        hidden = 0
+
+        if len(bars) > max_lines:
+            hidden = len(bars) - max_lines + 1
+            bars = bars[: max_lines - 1]
+
+        lines = []
+
+        for bar in bars:
+            with bar._render_lock:
+                bar.make_step(0)
+                lines.append(bar.format_progress_line())
+
+        if hidden:
+            lines.append(_("... and {count} more").format(count=hidden))
+
+        if self.show_total:
+            lines.append(self.total.format_progress_line())
+
+        # Lines that wrap would break moving the cursor back up.
+        return [
+            line[: size.columns - 1] if term_len(line) >= size.columns else line
+            for line in lines
+        ]
+
+    def render_progress(self) -> None:
+        """Render all bars with a single write, or print a summary line
+        if the file is not a terminal and the summary changed.
+        """
+        with self._lock:
+            bars = list(self.bars)
+            self._update_total(bars)
+
+            if self.is_hidden:
+                output = self.format_summary()
+
+                if output != self._last_output:
+                    self._last_output = output
+                    echo(output, file=self.file, color=self.color)
+
+                return
+
+            lines = self.format_lines(bars)
+
+            if should_strip_ansi(self.file, self.color):
+                lines = [strip_ansi(line) for line in lines]
+
+            buf = []
+
+            if self._line_count:
+                # Move back to the start of the first line of the frame.
+                buf.append("\r")
+
+                if self._line_count > 1:
+                    buf.append(f"\033[{self._line_count - 1}A")
+            else:
+                buf.append(BEFORE_BAR)
+
+            buf.append("\033[K\n".join(lines))
+            # Clear the rest of the line and anything left below it.
+            buf.append("\033[J")
+            self._line_count = len(lines)
+            output = "".join(buf)
+
+            if output != self._last_output:
+                self._last_output = output
+                # Styles were already stripped, keep the cursor movement.
+                echo(output, file=self.file, color=True, nl=False)
+                self.file.flush()
+
+
+#: Each slot of a progress channel is an integer on its own cache line,
+#: so processes updating neighbouring slots don't slow each other down.
+_CHANNEL_SLOT_SIZE = 64
+
+
+class ProgressCounter:
+    """Advance one slot of a :class:`ProgressChannel`. Counters can be
+    pickled and passed to other processes. Create them with
+    :meth:`ProgressChannel.counter`.
+    """
+
+    def __init__(self, path: str, slot: int) -> None:
+        import mmap
+
+        self.path = path
+        self.slot = slot
+        self._index = slot * _CHANNEL_SLOT_SIZE // 8
+
+        with open(path, "r+b") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0)
+
+        self._view = memoryview(self._mmap).cast("q")
+
+    def __reduce__(self) -> tuple[type[ProgressCounter], tuple[str, int]]:
+        # Each process maps the file again.
+        return ProgressCounter, (self.path, self.slot)
+
+    def update(self, n_steps: int) -> None:
+        """Advance the slot by a number of steps. Only one counter should
+        update a slot at the same time.
+
+        :param n_steps: Number of steps to advance.
+        """
+        self._view[self._index] += n_steps
+
+    def close(self) -> None:
+        if self._mmap.closed:
+            return
+
+        self._view.release()
+        self._mmap.close()
+
+
+class ProgressChannel:
+    """An array of counters in shared memory that other processes can
+    advance, and that drives progress bars in this process. Create it
+    with :func:`click.progress_channel`.
+    """
+
+    def __init__(self, slots: int = 1) -> None:
+        import mmap
+        import tempfile
+        import weakref
+
+        if slots < 1:
+            raise ValueError("A progress channel needs at least one slot.")
+
+        self.slots = slots
+        fd, self.path = tempfile.mkstemp(prefix="click-progress-")
+
+        try:
+            os.ftruncate(fd, slots * _CHANNEL_SLOT_SIZE)
+            self._mmap = mmap.mmap(fd, slots * _CHANNEL_SLOT_SIZE)
+        finally:
+            os.close(fd)
+
+        self._view = memoryview(self._mmap).cast("q")
+        # Counters created in this process, closed with the channel.
+        self._counters: weakref.WeakSet[ProgressCounter] = weakref.WeakSet()
+
+    def __enter__(self) -> ProgressChannel:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def counter(self, slot: int = 0) -> ProgressCounter:
+        """Return a counter for a slot, to pass to a worker process.
+        Advancing a counter is not atomic, so each worker that runs at
+        the same time as others needs its own slot, or counts are lost.
+
+        :param slot: The index of the slot to advance.
+        """
+        if not 0 <= slot < self.slots:
+            raise IndexError("The slot is out of range.")
+
+        counter = ProgressCounter(self.path, slot)
+        self._counters.add(counter)
+        return counter
+
+    def values(self) -> list[int]:
+        """The current value of each slot."""
+        return self._view[:: _CHANNEL_SLOT_SIZE // 8].tolist()
+
+    @property
+    def total(self) -> int:
+        return sum(self.values())
+
+    @contextlib.contextmanager
+    def watch(
+        self, *bars: ProgressBar[t.Any], interval: float = 0.1
+    ) -> cabc.Iterator[None]:
+        """Advance progress bars from a background thread while the
+        ``with`` block runs, and once more when it exits. A single bar
+        follows the total of all slots, otherwise there must be one bar
+        per slot.
+
+        :param bars: The bars to advance.
+        :param interval: The number of seconds between reading the
+            counters.
+        """
+        if len(bars) != 1 and len(bars) != self.slots:
+            raise ValueError("Pass one bar, or one bar per slot.")
+
+        synced = [0] * len(bars)
+
+        def sync() -> None:
+            if len(bars) == 1:
+                values = [self.total]
+            else:
+                values = self.values()
+
+            for i, (bar, value) in enumerate(zip(bars, values)):
+                if value != synced[i]:
+                    bar.update(value - synced[i])
+                    synced[i] = value
+
+        stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval):
+                sync()
+
+        thread = threading.Thread(
+            target=run, name="click-progress-channel", daemon=True
+        )
+        thread.start()
+
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+            sync()
+
+    def close(self) -> None:
+        """Release the shared memory. Counters that are still open in
+        other processes keep working until they are closed.
+        """
+        for counter in list(self._counters):
+            counter.close()
+
+        self._view.release()
+        self._mmap.close()
+
+        with contextlib.suppress(OSError):
+            os.unlink(self.path)
+
+
+#: The number of characters the pipe pager collects before writing them
+#: to the pager.
+PAGER_BUFFER_SIZE = 64 * 1024
+
+
+def pager(
+    generator: cabc.Iterable[str],
+    color: bool | None = None,
+    buffer_size: int | None = None,
+) -> None:
     """Decide what method to use for paging through text."""
+    with open_pager(color, buffer_size) as write:
+        for text in generator:
+            write(text)
+
+
+def open_pager(
+    color: bool | None = None,
+    buffer_size: int | None = None,
+) -> contextlib.AbstractContextManager[t.Callable[[str], None]]:
+    """Decide what method to use for paging through text and return a
+    context manager that starts it and yields a function writing text to
+    it.  The pager is started before the first write, so output reaches
+    it as soon as it is produced.
+    """
     stdout = _default_text_stdout()
 
     # There are no standard streams attached to write to. For example,
@@ -372,18 +1304,18 @@ def pager(generator: cabc.Iterable[str], color: bool | None = None) -> None:
         stdout = StringIO()
 
     if not isatty(sys.stdin) or not isatty(stdout):
-        return _nullpager(stdout, generator, color)
+        return _nullpager(stdout, color)
     pager_cmd = (os.environ.get("PAGER", None) or "").strip()
     if pager_cmd:
         if WIN:
-            return _tempfilepager(generator, pager_cmd, color)
-        return _pipepager(generator, pager_cmd, color)
+            return _tempfilepager(pager_cmd, color)
+        return _pipepager(pager_cmd, color)
     if os.environ.get("TERM") in ("dumb", "emacs"):
-        return _nullpager(stdout, generator, color)
+        return _nullpager(stdout, color)
     if WIN or sys.platform.startswith("os2"):
-        return _tempfilepager(generator, "more <", color)
+        return _tempfilepager("more <", color)
     if hasattr(os, "system") and os.system("(less) 2>/dev/null") == 0:
-        return _pipepager(generator, "less", color)
+        return _pipepager("less", color, buffer_size)
 
     import tempfile
 
@@ -391,18 +1323,37 @@ def pager(generator: cabc.Iterable[str], color: bool | None = None) -> None:
     os.close(fd)
     try:
         if hasattr(os, "system") and os.system(f'more "{filename}"') == 0:
-            return _pipepager(generator, "more", color)
-        return _nullpager(stdout, generator, color)
+            return _pipepager("more", color, buffer_size)
+        return _nullpager(stdout, color)
     finally:
         os.unlink(filename)
 
 
-def _pipepager(generator: cabc.Iterable[str], cmd: str, color: bool | None) -> None:
+def _is_broken_pipe(e: OSError) -> bool:
+    """Check if writing to a pipe failed because the reader exited. On
+    Windows this is reported as ``EINVAL`` as well as ``EPIPE``.
+    """
+    if isinstance(e, BrokenPipeError):
+        return True
+
+    return WIN and e.errno in (errno.EPIPE, errno.EINVAL)
+
+
+@contextlib.contextmanager
+def _pipepager(
+    cmd: str, color: bool | None, buffer_size: int | None = None
+) -> cabc.Iterator[t.Callable[[str], None]]:
     """Page through text by feeding it to another program.  Invoking a
     pager through this might support colors.
+
+    Text is collected until ``buffer_size`` characters are pending, then
+    styles are stripped and it is encoded and written in one go.
     """
     import subprocess
 
+    if buffer_size is None:
+        buffer_size = PAGER_BUFFER_SIZE
+
     env = dict(os.environ)
 
     # If we're piping to less we might support colors under the
@@ -419,62 +1370,127 @@ def _pipepager(generator: cabc.Iterable[str], cmd: str, color: bool | None) -> N
     c = subprocess.Popen(cmd, shell=True, stdin=subprocess.PIPE, env=env)
     stdin = t.cast(t.BinaryIO, c.stdin)
     encoding = get_best_encoding(stdin)
-    try:
-        for text in generator:
-            if not color:
-                text = strip_ansi(text)
+    pending: list[str] = []
+    pending_size = 0
+    started = False
+
+    broken: OSError | None = None
+
+    def flush() -> None:
+        nonlocal pending_size, broken
+
+        text = "".join(pending)
+        pending.clear()
+        pending_size = 0
+
+        # Most text isn't styled, only run the regex if it could be.
+        if not color and "\033" in text:
+            text = strip_ansi(text)
 
-            stdin.write(text.encode(encoding, "replace"))
-    except (OSError, KeyboardInterrupt):
-        pass
-    else:
-        stdin.close()
-
-    # Less doesn't respect ^C, but catches it for its own UI purposes (aborting
-    # search or other commands inside less).
-    #
-    # That means when the user hits ^C, the parent process (click) terminates,
-    # but less is still alive, paging the output and messing up the terminal.
-    #
-    # If the user wants to make the pager exit on ^C, they should set
-    # `LESS='-K'`. It's not our decision to make.
-    while True:
         try:
-            c.wait()
-        except KeyboardInterrupt:
-            pass
-        else:
-            break
+            stdin.write(text.encode(encoding, "replace"))
+            stdin.flush()
+        except OSError as e:
+            # The pager was quit before reading everything. Remember the
+            # error so it can be told apart from the caller's errors, and
+            # let it stop the caller from producing more text.
+            if _is_broken_pipe(e):
+                broken = e
+
+            raise
+
+    def write(text: str) -> None:
+        nonlocal pending_size, started
+
+        pending.append(text)
+        pending_size += len(text)
+
+        # Hand the first chunk to the pager right away so the first
+        # screen shows up without waiting for the buffer to fill.
+        if pending_size >= buffer_size or not started:
+            started = True
+            flush()
+
+    interrupted = False
 
+    try:
+        yield write
+        flush()
+    except KeyboardInterrupt:
+        interrupted = True
+    except BaseException as e:
+        if e is not broken:
+            # Stop the pager so the caller's error isn't hidden behind it.
+            c.terminate()
+            raise
+    finally:
+        if not interrupted:
+            # Closing flushes, which fails again if the pipe is broken. The
+            # pipe is closed anyway, suppress the error.
+            with contextlib.suppress(OSError):
+                stdin.close()
+
+        # Less doesn't respect ^C, but catches it for its own UI purposes (aborting
+        # search or other commands inside less).
+        #
+        # That means when the user hits ^C, the parent process (click) terminates,
+        # but less is still alive, paging the output and messing up the terminal.
+        #
+        # If the user wants to make the pager exit on ^C, they should set
+        # `LESS='-K'`. It's not our decision to make.
+        while True:
+            try:
+                c.wait()
+            except KeyboardInterrupt:
+                pass
+            else:
+                break
 
-def _tempfilepager(generator: cabc.Iterable[str], cmd: str, color: bool | None) -> None:
-    """Page through text by invoking a program on a temporary file."""
+
+@contextlib.contextmanager
+def _tempfilepager(
+    cmd: str, color: bool | None
+) -> cabc.Iterator[t.Callable[[str], None]]:
+    """Page through text by invoking a program on a temporary file.  The
+    text is written to the file as it is produced rather than collected
+    in memory first.
+    """
     import tempfile
 
     fd, filename = tempfile.mkstemp()
-    # TODO: This never terminates if the passed generator never terminates.
-    text = "".join(generator)
-    if not color:
-        text = strip_ansi(text)
     encoding = get_best_encoding(sys.stdout)
-    with open_stream(filename, "wb")[0] as f:
-        f.write(text.encode(encoding))
+
     try:
+        with os.fdopen(fd, "wb") as f:
+
+            def write(text: str) -> None:
+                if not color:
+                    text = strip_ansi(text)
+
+                f.write(text.encode(encoding))
+
+            # TODO: This never terminates if the text never ends.
+            yield write
+
         os.system(f'{cmd} "{filename}"')
     finally:
-        os.close(fd)
         os.unlink(filename)
 
 
+@contextlib.contextmanager
 def _nullpager(
-    stream: t.TextIO, generator: cabc.Iterable[str], color: bool | None
-) -> None:
+    stream: t.TextIO, color: bool | None
+) -> cabc.Iterator[t.Callable[[str], None]]:
     """Simply print unformatted text.  This is the ultimate fallback."""
-    for text in generator:
+
+    def write(text: str) -> None:
         if not color:
             text = strip_ansi(text)
+
         stream.write(text)
 
+    yield write
+
 
 class Editor:
     def __init__(
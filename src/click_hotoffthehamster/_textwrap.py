@@ -1,11 +1,46 @@
 from __future__ import annotations
 
 import collections.abc as cabc
+import re
 import textwrap
+from bisect import bisect_right
 from contextlib import contextmanager
+from itertools import accumulate
+
+# The whitespace that textwrap splits on, without hyphen handling.
+_wordsep_simple_re = re.compile(r"([\t\n\x0b\x0c\r ]+)")
 
 
 class TextWrapper(textwrap.TextWrapper):
+    """Wraps text like :class:`textwrap.TextWrapper`, with the same
+    output, but in time proportional to the number of lines rather
+    than the number of words.
+
+    Long words are split on a pipe if possible, so that
+    ``[long|option|lists]`` are wrapped between choices.
+    """
+
+    def _split(self, text: str) -> list[str]:
+        # The hyphen-aware regex is only needed for words that contain
+        # a hyphen. Its lookarounds only see word characters, so
+        # splitting each word on its own gives the same chunks as
+        # splitting the whole text.
+        chunks = [c for c in _wordsep_simple_re.split(text) if c]
+
+        if not self.break_on_hyphens or "-" not in text:
+            return chunks
+
+        rv: list[str] = []
+        wordsep_re = self.wordsep_re
+
+        for chunk in chunks:
+            if "-" in chunk:
+                rv.extend(c for c in wordsep_re.split(chunk) if c)
+            else:
+                rv.append(chunk)
+
+        return rv
+
     def _handle_long_word(
         self,
         reversed_chunks: list[str],
@@ -29,6 +64,70 @@ class TextWrapper(textwrap.TextWrapper):
         elif not cur_line:
             cur_line.append(reversed_chunks.pop())
 
+    def _wrap_chunks(self, chunks: list[str]) -> list[str]:
+        # Uncommon settings use the general implementation.
+        if (
+            self.max_lines is not None
+            or self.width - len(self.initial_indent) < 1
+            or self.width - len(self.subsequent_indent) < 1
+        ):
+            return super()._wrap_chunks(chunks)
+
+        # ends[k] is the offset in the text where chunk k ends. The
+        # chunks that fit on a line are found by bisecting it, instead
+        # of adding one chunk at a time.
+        ends = list(accumulate(map(len, chunks)))
+        count = len(chunks)
+        drop_whitespace = self.drop_whitespace
+        lines: list[str] = []
+        i = 0
+
+        while i < count:
+            if lines:
+                indent = self.subsequent_indent
+            else:
+                indent = self.initial_indent
+
+            width = self.width - len(indent)
+
+            # Drop whitespace at the start of a line, unless this is the
+            # very beginning of the text.
+            if drop_whitespace and lines and chunks[i].strip() == "":
+                i += 1
+
+                if i == count:
+                    break
+
+            # The first chunk may have been partly used by a long word
+            # on the previous line.
+            start = ends[i] - len(chunks[i])
+            # Chunks i to j - 1 fit on this line.
+            j = bisect_right(ends, start + width, i)
+            cur_line = chunks[i:j]
+
+            # The line is full, and the next chunk is too big to fit on
+            # any line.
+            if j < count and len(chunks[j]) > width:
+                cur_len = ends[j - 1] - start if j > i else 0
+                pending = [chunks[j]]
+                self._handle_long_word(pending, cur_line, cur_len, width)
+
+                if pending:
+                    chunks[j] = pending[-1]
+                else:
+                    j += 1
+
+            i = j
+
+            # If the last chunk on this line is all whitespace, drop it.
+            if drop_whitespace and cur_line and cur_line[-1].strip() == "":
+                del cur_line[-1]
+
+            if cur_line:
+                lines.append(indent + "".join(cur_line))
+
+        return lines
+
     @contextmanager
     def extra_indent(self, indent: str) -> cabc.Iterator[None]:
         old_initial_indent = self.initial_indent
@@ -29,6 +29,7 @@ from .globals import pop_context, push_context
 from .parser import _flag_needs_value, _OptionParser, _split_opt
 from .termui import confirm, prompt, style
 from .utils import (
+    OutputBuffer,
     PacifyFlushWrapper,
     _detect_program_name,
     _expand_args,
@@ -46,7 +47,7 @@ V = t.TypeVar("V")
 
 def _complete_visible_commands(
     ctx: Context, incomplete: str
-) -> cabc.Iterator[tuple[str, Command]]:
+) -> cabc.Iterator[tuple[str, Command | CommandMetadata]]:
     """List all the subcommands of a group that start with the
     incomplete value and aren't hidden.
 
@@ -57,7 +58,7 @@ def _complete_visible_commands(
 
     for name in multi.list_commands(ctx):
         if name.startswith(incomplete):
-            command = multi.get_command(ctx, name)
+            command = multi.get_command_metadata(ctx, name)
 
             if command is not None and not command.hidden:
                 yield name, command
@@ -226,11 +227,18 @@ class Context:
                                     command before calling invoke (so that
                                     other options, like --color, can be used
                                     in concert with --help).
+    :param buffered_output: Collect the output of :func:`echo` and write
+        it in batches while this context is active, like
+        :func:`buffered_output`. If this value is not set, it defaults to
+        the value from the parent context.
 
     .. versionchanged:: 8.2
         The ``protected_args`` attribute is deprecated and will be removed in
         Click 9.0. ``args`` will contain remaining unparsed tokens.
 
+    .. versionchanged:: 8.2
+        Added the ``buffered_output`` parameter.
+
     .. versionchanged:: 8.1
         The ``show_default`` parameter is overridden by
         ``Command.show_default``, instead of the other way around.
@@ -282,6 +290,7 @@ class Context:
         show_default: bool | None = None,
         # LB: FIXME/2023-05-14: Confirm: help_option_fallthrough
         help_option_fallthrough=False,
+        buffered_output: bool | None = None,
     ) -> None:
         #: the parent context or `None` if none exists.
         self.parent = parent
@@ -437,6 +446,24 @@ class Context:
         self._parameter_source: dict[str, ParameterSource] = {}
         self._exit_stack = ExitStack()
 
+        if buffered_output is None and parent is not None:
+            buffered_output = parent.buffered_output
+
+        #: Collect the output of :func:`echo` and write it in batches.
+        self.buffered_output: bool | None = buffered_output
+        self._output_buffer: OutputBuffer | None = None
+
+        if parent is not None and parent._output_buffer is not None:
+            if buffered_output:
+                self._output_buffer = parent._output_buffer
+            else:
+                # Output from this context is written directly, write
+                # what the parent collected so far first.
+                parent._output_buffer.flush()
+        elif buffered_output:
+            self._output_buffer = OutputBuffer()
+            self.call_on_close(self._output_buffer.flush)
+
     @property
     def protected_args(self) -> list[str]:
         import warnings
@@ -552,16 +579,29 @@ class Context:
         """
         return self._meta
 
-    def make_formatter(self) -> HelpFormatter:
+    def make_formatter(
+        self, sink: t.Callable[[str], t.Any] | None = None
+    ) -> HelpFormatter:
         """Creates the :class:`~click_hotoffthehamster.HelpFormatter` for the help and
         usage output.
 
         To quickly customize the formatter class used without overriding
         this method, set the :attr:`formatter_class` attribute.
 
+        :param sink: passed to the formatter to stream the output instead
+            of collecting it in memory.
+
+        .. versionchanged:: 8.2
+            Added the ``sink`` parameter.
+
         .. versionchanged:: 8.0
             Added the :attr:`formatter_class` attribute.
         """
+        if sink is not None:
+            return self.formatter_class(
+                width=self.terminal_width, max_width=self.max_content_width, sink=sink
+            )
+
         return self.formatter_class(
             width=self.terminal_width, max_width=self.max_content_width
         )
@@ -874,6 +914,16 @@ class Command:
 
     :param deprecated: issues a message indicating that
                              the command is deprecated.
+    :param cache_help: Remember the rendered help and usage text, and
+        reuse it for later calls with the same terminal width, content
+        width, color, and ``show_default`` settings. The text is
+        rendered again if the command's params or help text change.
+        Only enable this if the help does not depend on anything else,
+        such as defaults computed by a function or read from the
+        environment.
+
+    .. versionchanged:: 8.2
+        Added the ``cache_help`` parameter.
 
     .. versionchanged:: 8.2
         This is the base class for all commands, not ``BaseCommand``.
@@ -921,6 +971,7 @@ class Command:
         no_args_is_help: bool = False,
         hidden: bool = False,
         deprecated: bool = False,
+        cache_help: bool = False,
     ) -> None:
         #: the name the command thinks it has.  Upon registering a command
         #: on a :class:`Group` the group will default the command name
@@ -949,6 +1000,8 @@ class Command:
         self.no_args_is_help = no_args_is_help
         self.hidden = hidden
         self.deprecated = deprecated
+        self.cache_help = cache_help
+        self._help_cache: dict[t.Hashable, str] = {}
 
     def to_info_dict(self, ctx: Context) -> dict[str, t.Any]:
         return {
@@ -969,9 +1022,7 @@ class Command:
 
         Calls :meth:`format_usage` internally.
         """
-        formatter = ctx.make_formatter()
-        self.format_usage(ctx, formatter)
-        return formatter.getvalue().rstrip("\n")
+        return self._render_help_cached(ctx, "usage", self.format_usage)
 
     def get_params(
         self, ctx: Context, include_parent_params: bool = False
@@ -1050,9 +1101,74 @@ class Command:
 
         Calls :meth:`format_help` internally.
         """
+        return self._render_help_cached(ctx, "help", self.format_help)
+
+    def get_help_cache_key(
+        self, ctx: Context, formatter: HelpFormatter
+    ) -> tuple[t.Any, ...]:
+        """Return the values that the rendered help depends on. If
+        :attr:`cache_help` is enabled, help rendered for an equal key is
+        reused. Override this to add values that custom help output
+        depends on.
+
+        :param ctx: The context the help is rendered for.
+        :param formatter: The formatter the help would be written to.
+
+        .. versionadded:: 8.2
+        """
+        return (
+            type(formatter),
+            formatter.width,
+            ctx.max_content_width,
+            ctx.color,
+            ctx.show_default,
+            ctx.command_path,
+            ctx.parent is None,
+            tuple(ctx.help_option_names),
+            tuple(self.params),
+            self.help,
+            self.epilog,
+            self.short_help,
+            self.options_metavar,
+            self.deprecated,
+        )
+
+    def _render_help_cached(
+        self,
+        ctx: Context,
+        kind: str,
+        format_func: t.Callable[[Context, HelpFormatter], None],
+    ) -> str:
+        """Render help or usage text with ``format_func``, reusing a
+        previous result if :attr:`cache_help` is enabled.
+        """
         formatter = ctx.make_formatter()
-        self.format_help(ctx, formatter)
-        return formatter.getvalue().rstrip("\n")
+        key: t.Hashable = None
+
+        if self.cache_help:
+            key = (kind, self.get_help_cache_key(ctx, formatter))
+
+            try:
+                return self._help_cache[key]
+            except KeyError:
+                pass
+            except TypeError:
+                # Part of the key, such as a custom help value, can't
+                # be hashed. Render without caching.
+                key = None
+
+        format_func(ctx, formatter)
+        rv = formatter.getvalue().rstrip("\n")
+
+        if key is not None:
+            # Bound the cache if the key keeps changing, such as when
+            # the terminal is resized repeatedly.
+            if len(self._help_cache) >= 16:
+                self._help_cache.clear()
+
+            self._help_cache[key] = rv
+
+        return rv
 
     def get_short_help_str(self, ctx: Context, limit: int = 45) -> str:
         """Gets short help for the command or makes it by shortening the
@@ -1459,6 +1575,54 @@ class _BaseCommand(Command, metaclass=_FakeSubclassCheck):
     """
 
 
+class CommandMetadata:
+    """The information a :class:`Group` needs to list a subcommand in
+    its help and completions, without loading the command itself. A
+    group that loads its subcommands lazily, for example from plugins,
+    can return this from :meth:`Group.get_command_metadata` using a
+    registry or manifest.
+
+    :param short_help: The short help shown next to the command name.
+    :param help: The full help text. If ``short_help`` is not given,
+        the short help is made by shortening this.
+    :param hidden: Hide the command from help and completions.
+    :param deprecated: Mark the command as deprecated in its help.
+
+    .. versionadded:: 8.2
+    """
+
+    def __init__(
+        self,
+        short_help: str | None = None,
+        help: str | None = None,
+        hidden: bool = False,
+        deprecated: bool = False,
+    ) -> None:
+        self.short_help = short_help
+        self.help = help
+        self.hidden = hidden
+        self.deprecated = deprecated
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.short_help or self.help!r}>"
+
+    def get_short_help_str(self, ctx: Context, limit: int = 45) -> str:
+        """Gets short help for the command or makes it by shortening the
+        long help string, the same as :meth:`Command.get_short_help_str`.
+        """
+        if self.short_help:
+            text = inspect.cleandoc(self.short_help)
+        elif self.help:
+            text = make_default_short_help(inspect.cleandoc(self.help), limit)
+        else:
+            text = ""
+
+        if self.deprecated:
+            text = _("(Deprecated) {text}").format(text=text)
+
+        return text.strip()
+
+
 class Group(Command):
     """A group is a command that nests other commands (or more groups).
 
@@ -1748,6 +1912,24 @@ class Group(Command):
         """Returns a list of subcommand names in the order they should appear."""
         return sorted(self.commands)
 
+    def get_command_metadata(
+        self, ctx: Context, cmd_name: str
+    ) -> Command | CommandMetadata | None:
+        """Return the information needed to list a subcommand in help
+        and completions. This is its short help, and whether it is
+        hidden or deprecated. Returns ``None`` if the command does not
+        exist.
+
+        By default this returns the command from :meth:`get_command`,
+        which provides the same information. A group that loads its
+        commands lazily can override this to return a
+        :class:`CommandMetadata` instead, so that showing the group's
+        help does not load every subcommand.
+
+        .. versionadded:: 8.2
+        """
+        return self.get_command(ctx, cmd_name)
+
     def collect_usage_pieces(self, ctx: Context) -> list[str]:
         rv = super().collect_usage_pieces(ctx)
         # LB: FIXME/2023-05-14: Verify this if nec.: *UX: Help: Avoid
@@ -1756,6 +1938,15 @@ class Group(Command):
             rv.append(self.subcommand_metavar)
         return rv
 
+    def get_help_cache_key(
+        self, ctx: Context, formatter: HelpFormatter
+    ) -> tuple[t.Any, ...]:
+        return (
+            *super().get_help_cache_key(ctx, formatter),
+            self.subcommand_metavar,
+            tuple(self.list_commands(ctx)),
+        )
+
     def format_options(self, ctx: Context, formatter: HelpFormatter) -> None:
         super().format_options(ctx, formatter)
         self.format_commands(ctx, formatter)
@@ -1767,10 +1958,19 @@ class Group(Command):
         commands = self.format_commands_fetch(ctx)
         self.format_commands_write(commands, ctx, formatter)
 
-    def format_commands_fetch(self, ctx):
+    def format_commands_fetch(
+        self, ctx: Context
+    ) -> list[tuple[str, Command | CommandMetadata]]:
+        """Return the name and :meth:`get_command_metadata` of each
+        subcommand that is listed in the help.
+
+        .. versionchanged:: 8.2
+            Uses :meth:`get_command_metadata` instead of
+            :meth:`get_command`.
+        """
         commands = []
         for subcommand in self.list_commands(ctx):
-            cmd = self.get_command(ctx, subcommand)
+            cmd = self.get_command_metadata(ctx, subcommand)
             # What is this, the tool lied about a command.  Ignore it
             if cmd is None:
                 continue
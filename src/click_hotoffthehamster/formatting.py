@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import collections.abc as cabc
+import typing as t
 from contextlib import contextmanager
 from gettext import gettext as _
 
+from ._compat import get_terminal_size
 from ._compat import term_len
 from .parser import _split_opt
 
@@ -110,11 +112,20 @@ class HelpFormatter:
     usually just needed for very special internal cases, but it's also
     exposed so that developers can write their own fancy outputs.
 
-    At present, it always writes into memory.
+    By default it writes into memory and the result is available from
+    :meth:`getvalue`.  If a ``sink`` is given, every string is passed to
+    it as soon as it is written instead, so a long help page can be
+    streamed, for example into :func:`~click_hotoffthehamster.open_pager`,
+    while it is still being formatted.
 
     :param indent_increment: the additional increment for each level.
     :param width: the width for the text.  This defaults to the terminal
                   width clamped to a maximum of 78.
+    :param sink: a function that is called with each written string
+                 instead of collecting it in the buffer.
+
+    .. versionchanged:: 8.2
+        Added the ``sink`` parameter.
     """
 
     def __init__(
@@ -122,23 +133,30 @@ class HelpFormatter:
         indent_increment: int = 2,
         width: int | None = None,
         max_width: int | None = None,
+        sink: t.Callable[[str], t.Any] | None = None,
     ) -> None:
-        import shutil
-
         self.indent_increment = indent_increment
         if max_width is None:
             max_width = 80
         if width is None:
             width = FORCED_WIDTH
             if width is None:
-                width = max(min(shutil.get_terminal_size().columns, max_width) - 2, 50)
+                width = max(min(get_terminal_size().columns, max_width) - 2, 50)
         self.width = width
         self.current_indent = 0
         self.buffer: list[str] = []
+        self.sink = sink
+        self._streamed = False
 
     def write(self, string: str) -> None:
-        """Writes a unicode string into the internal buffer."""
-        self.buffer.append(string)
+        """Writes a unicode string into the internal buffer, or passes it
+        to the sink if one was given.
+        """
+        if self.sink is None:
+            self.buffer.append(string)
+        elif string:
+            self._streamed = True
+            self.sink(string)
 
     def indent(self) -> None:
         """Increases the indentation."""
@@ -203,7 +221,7 @@ class HelpFormatter:
 
     def write_paragraph(self) -> None:
         """Writes a paragraph into the buffer."""
-        if self.buffer:
+        if self.buffer or self._streamed:
             self.write("\n")
 
     def write_text(self, text: str) -> None:
@@ -265,6 +283,7 @@ class HelpFormatter:
                         first_width,
                         subsequent_indent=" " * (space_bracket_idx + 2 + 2),
                     )
+                    first_len = term_len(first)
                 except ValueError:
                     pass
 
@@ -273,8 +292,8 @@ class HelpFormatter:
             if not second:
                 self.write("\n")
                 continue
-            if term_len(first) <= first_col - col_spacing:
-                self.write(" " * (first_col - term_len(first)))
+            if first_len <= first_col - col_spacing:
+                self.write(" " * (first_col - first_len))
             else:
                 self.write("\n")
                 self.write(" " * (first_col + self.current_indent))
@@ -325,7 +344,9 @@ class HelpFormatter:
             self.dedent()
 
     def getvalue(self) -> str:
-        """Returns the buffer contents."""
+        """Returns the buffer contents.  This is empty if the output was
+        passed to a sink.
+        """
         return "".join(self.buffer)
 
 
@@ -13,10 +13,12 @@ from ._compat import isatty, strip_ansi
 from .exceptions import Abort, UsageError
 from .globals import resolve_color_default
 from .types import Choice, ParamType, convert_type
-from .utils import LazyFile, echo
+from .utils import LazyFile, _flush_output_buffer, echo
 
 if t.TYPE_CHECKING:
+    from ._termui_impl import MultiProgress
     from ._termui_impl import ProgressBar
+    from ._termui_impl import ProgressChannel
 
 V = t.TypeVar("V")
 
@@ -134,6 +136,7 @@ def prompt(
             # Write the prompt separately so that we get nice
             # coloring through colorama on Windows
             echo(text.rstrip(" "), nl=False, err=err)
+            _flush_output_buffer()
             # Echo a space to stdout to work around an issue where
             # readline causes backspace to clear the whole line.
             return f(" ")
@@ -227,6 +230,7 @@ def confirm(
             # Write the prompt separately so that we get nice
             # coloring through colorama on Windows
             echo(prompt.rstrip(" "), nl=False, err=err)
+            _flush_output_buffer()
             # Echo a space to stdout to work around an issue where
             # readline causes backspace to clear the whole line.
             value = visible_prompt_func(" ").lower().strip()
@@ -250,10 +254,16 @@ def confirm(
 def echo_via_pager(
     text_or_generator: cabc.Iterable[str] | t.Callable[[], cabc.Iterable[str]] | str,
     color: bool | None = None,
+    buffer_size: int | None = None,
 ) -> None:
     """This function takes a text and shows it via an environment specific
     pager on stdout.
 
+    .. versionchanged:: 8.2
+        Added the ``buffer_size`` parameter. Text is written to the
+        pager in chunks, and a generator is closed if the pager exits
+        early.
+
     .. versionchanged:: 3.0
        Added the `color` flag.
 
@@ -261,6 +271,9 @@ def echo_via_pager(
                               generator emitting the text to page.
     :param color: controls if the pager supports ANSI colors or not.  The
                   default is autodetection.
+    :param buffer_size: the number of characters to collect before
+                        writing them to a pager program.  The first
+                        chunk is always written right away.
     """
     color = resolve_color_default(color)
 
@@ -276,7 +289,130 @@ def echo_via_pager(
 
     from ._termui_impl import pager
 
-    return pager(itertools.chain(text_generator, "\n"), color)
+    try:
+        return pager(itertools.chain(text_generator, "\n"), color, buffer_size)
+    finally:
+        # Stop the generator if the pager didn't consume all of it.
+        close = getattr(i, "close", None)
+
+        if close is not None:
+            close()
+
+
+def open_pager(
+    color: bool | None = None,
+    buffer_size: int | None = None,
+) -> AbstractContextManager[t.Callable[[str], None]]:
+    """Start an environment specific pager on stdout and return a
+    context manager that yields a function writing text to it.  This
+    is the push based counterpart of :func:`echo_via_pager`, useful when
+    output is written by something else as it is generated, such as a
+    :class:`~click_hotoffthehamster.HelpFormatter` with a ``sink``.
+    Unlike :func:`echo_via_pager`, no trailing newline is added.
+
+    .. code-block:: python
+
+        with click.open_pager() as write:
+            formatter = ctx.make_formatter(sink=write)
+            ctx.command.format_help(ctx, formatter)
+
+    The pager waits for the user to close it when the block exits.
+
+    .. versionadded:: 8.2
+
+    :param color: controls if the pager supports ANSI colors or not.  The
+                  default is autodetection.
+    :param buffer_size: the number of characters to collect before
+                        writing them to a pager program.
+    """
+    from ._termui_impl import open_pager
+
+    return open_pager(resolve_color_default(color), buffer_size)
+
+
+class RateEstimator:
+    """Estimate how fast a progress bar advances, as the average rate
+    since it started. Pass an instance to :func:`progressbar` as
+    ``rate_estimator``. Subclasses override :meth:`estimate`.
+
+    :param stall_timeout: Report the bar as stalled if its position did
+        not change for this many seconds.
+
+    .. versionadded:: 8.2
+    """
+
+    def __init__(self, stall_timeout: float | None = None) -> None:
+        self.stall_timeout = stall_timeout
+        #: The estimated number of steps per second.
+        self.rate = 0.0
+        self.start_pos = self.pos = 0
+        self.start_time = self.time = self.progress_time = 0.0
+
+    def reset(self, pos: int, now: float) -> None:
+        """Start estimating from a position and time."""
+        self.rate = 0.0
+        self.start_pos = self.pos = pos
+        self.start_time = self.time = self.progress_time = now
+
+    def update(self, pos: int, now: float) -> None:
+        """Record the position at a time. This is called for every step
+        of the bar, so it must be cheap.
+        """
+        if pos != self.pos:
+            self.progress_time = now
+
+        # Wait for the clock to advance, the steps are counted then.
+        if now > self.time:
+            self.rate = self.estimate(pos, now)
+            self.pos = pos
+            self.time = now
+
+    def estimate(self, pos: int, now: float) -> float:
+        """Return the new rate. :attr:`pos` and :attr:`time` are still
+        the previous position and time, which is earlier than ``now``.
+        """
+        return (pos - self.start_pos) / (now - self.start_time)
+
+    def is_stalled(self, now: float) -> bool:
+        """Whether the position did not change for ``stall_timeout``
+        seconds.
+        """
+        return (
+            self.stall_timeout is not None
+            and now - self.progress_time >= self.stall_timeout
+        )
+
+
+class EWMARateEstimator(RateEstimator):
+    """Estimate the rate as an exponentially weighted moving average.
+    Recent progress counts the most, so the rate follows changes in
+    speed, while single slow or fast steps are smoothed out. Steps that
+    are further apart count more, so the result does not depend on how
+    often the bar is updated.
+
+    :param half_life: The number of seconds after which progress counts
+        half as much.
+    :param stall_timeout: Report the bar as stalled if its position did
+        not change for this many seconds.
+
+    .. versionadded:: 8.2
+    """
+
+    def __init__(
+        self, half_life: float = 10.0, stall_timeout: float | None = None
+    ) -> None:
+        super().__init__(stall_timeout=stall_timeout)
+        self.half_life = half_life
+
+    def estimate(self, pos: int, now: float) -> float:
+        elapsed = now - self.time
+        current = (pos - self.pos) / elapsed
+
+        if self.time == self.start_time:
+            return current
+
+        weight: float = 0.5 ** (elapsed / self.half_life)
+        return current + weight * (self.rate - current)
 
 
 def progressbar(
@@ -295,6 +431,13 @@ def progressbar(
     file: t.TextIO | None = None,
     color: bool | None = None,
     update_min_steps: int = 1,
+    max_fps: float | None = None,
+    rate_estimator: RateEstimator | None = None,
+    rate_unit: str = "",
+    log_format: t.Literal["json", "logfmt"] | None = None,
+    log_interval: float = 10.0,
+    log_percent: float | None = None,
+    log_file: t.TextIO | None = None,
 ) -> ProgressBar[V]:
     """This function creates an iterable context manager that can be used
     to iterate over something while showing a progress bar.  It will
@@ -377,7 +520,9 @@ def progressbar(
     :param bar_template: the format string to use as template for the bar.
                          The parameters in it are ``label`` for the label,
                          ``bar`` for the progress bar and ``info`` for the
-                         info section.
+                         info section.  ``rate``, ``elapsed`` and ``eta``
+                         show the steps per second, the time since the
+                         bar started, and the remaining time.
     :param info_sep: the separator between multiple info items (eta etc.)
     :param width: the width of the progress bar in characters, 0 means full
                   terminal width
@@ -389,6 +534,37 @@ def progressbar(
                   which is not the case by default.
     :param update_min_steps: Render only when this many updates have
         completed. This allows tuning for very fast iterators.
+    :param max_fps: Render from a background thread at most this many
+        times per second. Iterating and calling ``update()`` then only
+        advance the position, which makes very fast loops much cheaper.
+        Updates should come from a single thread.
+    :param rate_estimator: A :class:`RateEstimator` that estimates the
+        rate and remaining time, such as :class:`EWMARateEstimator`. It
+        is updated on every step. By default, the average time per step
+        since the start is sampled once a second.
+    :param rate_unit: The unit shown after the rate, such as ``"B"`` if
+        the bar counts bytes.
+    :param log_format: If the file is not a terminal, write a ``"json"``
+        or ``"logfmt"`` line with the label, position, length, rate,
+        remaining and elapsed seconds, and whether the bar finished,
+        instead of only the label. A line is written when the bar
+        starts, every ``log_interval`` seconds or ``log_percent``
+        percent of progress, and when it finishes.
+    :param log_interval: The number of seconds between log lines.
+    :param log_percent: Also write a line after this many percent of
+        progress.
+    :param log_file: Write log lines to this file instead of ``file``.
+
+    .. versionchanged:: 8.2
+        Added the ``log_format``, ``log_interval``, ``log_percent``, and
+        ``log_file`` parameters.
+
+    .. versionchanged:: 8.2
+        Added the ``rate_estimator`` and ``rate_unit`` parameters, and
+        the ``rate``, ``elapsed`` and ``eta`` template values.
+
+    .. versionchanged:: 8.2
+        Added the ``max_fps`` parameter.
 
     .. versionchanged:: 8.0
         Output is shown even if execution time is less than 0.5 seconds.
@@ -428,9 +604,146 @@ def progressbar(
         width=width,
         color=color,
         update_min_steps=update_min_steps,
+        max_fps=max_fps,
+        rate_estimator=rate_estimator,
+        rate_unit=rate_unit,
+        log_format=log_format,
+        log_interval=log_interval,
+        log_percent=log_percent,
+        log_file=log_file,
     )
 
 
+def multiprogress(
+    label: str | None = None,
+    show_eta: bool = True,
+    show_percent: bool | None = None,
+    show_pos: bool = False,
+    fill_char: str = "#",
+    empty_char: str = "-",
+    bar_template: str = "%(label)s  [%(bar)s]  %(info)s",
+    info_sep: str = "  ",
+    width: int = 36,
+    file: t.TextIO | None = None,
+    color: bool | None = None,
+    show_total: bool = True,
+    max_fps: float | None = 10,
+    summary_interval: float = 5.0,
+) -> MultiProgress:
+    """Create a context manager that shows several progress bars stacked
+    on top of each other, with a bar for the total progress below them.
+    This is useful when work is split between several threads, which a
+    single :func:`progressbar` can't show.
+
+    Bars are added with ``add()``, which takes the same ``iterable``,
+    ``length``, ``label``, and ``item_show_func`` arguments as
+    :func:`progressbar`. Each bar can be iterated over or advanced with
+    its ``update()`` method from any thread. Updates only advance a
+    counter, and a single background thread renders all bars at most
+    ``max_fps`` times per second, with one write per frame.
+
+    .. code-block:: python
+
+        with click.multiprogress(label="All shards") as multi:
+            bars = [
+                multi.add(length=len(shard), label=shard.name)
+                for shard in shards
+            ]
+
+            with ThreadPoolExecutor() as executor:
+                for shard, bar in zip(shards, bars):
+                    executor.submit(process_shard, shard, bar)
+
+    If the file is not a terminal, a summary line with the total
+    progress is printed every ``summary_interval`` seconds instead, and
+    once more when the context manager exits.
+
+    :param label: The label of the total bar. Defaults to "Total".
+    :param show_eta: Show the estimated remaining time.
+    :param show_percent: Show the percentage. The default is ``True``
+        if the bar has a length and ``show_pos`` is not set.
+    :param show_pos: Show the absolute position.
+    :param fill_char: The character for the filled part of the bars.
+    :param empty_char: The character for the empty part of the bars.
+    :param bar_template: The format string for each bar, see
+        :func:`progressbar`.
+    :param info_sep: The separator between info items.
+    :param width: The width of each bar in characters.
+    :param file: The file to write to.
+    :param color: Whether ANSI styles in labels are kept. Cursor
+        movement is always written to a terminal.
+    :param show_total: Show the total bar below the other bars.
+    :param max_fps: Render from a background thread at most this many
+        times per second. If ``None`` or not positive, all bars are
+        rendered on every update instead, which is slow with many
+        updates.
+    :param summary_interval: The number of seconds between summary
+        lines if the file is not a terminal. ``0`` prints only the final
+        summary.
+
+    .. versionadded:: 8.2
+    """
+    from ._termui_impl import MultiProgress
+
+    color = resolve_color_default(color)
+    return MultiProgress(
+        label=label,
+        show_eta=show_eta,
+        show_percent=show_percent,
+        show_pos=show_pos,
+        fill_char=fill_char,
+        empty_char=empty_char,
+        bar_template=bar_template,
+        info_sep=info_sep,
+        width=width,
+        file=file,
+        color=color,
+        show_total=show_total,
+        max_fps=max_fps,
+        summary_interval=summary_interval,
+    )
+
+
+def progress_channel(slots: int = 1) -> ProgressChannel:
+    """Create a channel of progress counters in shared memory, so worker
+    processes can drive progress bars shown by the parent process.
+
+    Each worker gets a counter for one of the slots, which can be passed
+    to it like any other argument. Advancing a counter only writes to
+    shared memory. In the parent, ``watch()`` reads the counters in a
+    background thread and advances the bars, which then show the
+    remaining time and rate as usual. A single bar follows the total of
+    all slots, or one bar can be passed for each slot, such as bars
+    added to a :func:`multiprogress`.
+
+    .. code-block:: python
+
+        def process_shard(shard, counter):
+            for row in shard:
+                process(row)
+                counter.update(1)
+
+        with click.progress_channel(slots=len(shards)) as channel:
+            with click.progressbar(length=total_rows) as bar:
+                with channel.watch(bar), ProcessPoolExecutor() as executor:
+                    for i, shard in enumerate(shards):
+                        executor.submit(process_shard, shard, channel.counter(i))
+
+    Advancing a counter is not atomic, so workers that share a slot at
+    the same time lose counts. Use a slot for each worker that runs
+    concurrently. A slot can be reused by tasks that run one after
+    another.
+
+    :param slots: The number of counters, one for each worker that runs
+        at the same time.
+
+    .. versionadded:: 8.2
+    """
+    from ._termui_impl import ProgressChannel
+
+    return ProgressChannel(slots)
+
+
 def clear() -> None:
     """Clears the terminal screen.  This will have the effect of clearing
     the whole visible space of the terminal and moving the cursor to the
@@ -456,6 +769,179 @@ def _interpret_color(color: int | tuple[int, int, int] | str, offset: int = 0) -
     return str(_ansi_colors[color] + offset)
 
 
+class Style:
+    """A text style that can be applied to many strings.  The ANSI codes
+    are built once when the style is created, so applying it only joins
+    strings.  The parameters are the same as for :func:`style`.
+
+    .. code-block:: python
+
+        error = click.Style(fg="red", bold=True)
+        click.echo(error("Failed"))
+        click.secho("Failed", style=error)
+
+    A style should not be changed after it is created, use
+    :meth:`replace` to get a modified copy instead.
+
+    .. versionadded:: 8.2
+    """
+
+    def __init__(
+        self,
+        fg: int | tuple[int, int, int] | str | None = None,
+        bg: int | tuple[int, int, int] | str | None = None,
+        bold: bool | None = None,
+        dim: bool | None = None,
+        underline: bool | None = None,
+        overline: bool | None = None,
+        italic: bool | None = None,
+        blink: bool | None = None,
+        reverse: bool | None = None,
+        strikethrough: bool | None = None,
+        reset: bool = True,
+    ) -> None:
+        self.fg = fg
+        self.bg = bg
+        self.bold = bold
+        self.dim = dim
+        self.underline = underline
+        self.overline = overline
+        self.italic = italic
+        self.blink = blink
+        self.reverse = reverse
+        self.strikethrough = strikethrough
+        self.reset = reset
+
+        bits = []
+
+        if fg:
+            try:
+                bits.append(f"\033[{_interpret_color(fg)}m")
+            except KeyError:
+                raise TypeError(f"Unknown color {fg!r}") from None
+
+        if bg:
+            try:
+                bits.append(f"\033[{_interpret_color(bg, 10)}m")
+            except KeyError:
+                raise TypeError(f"Unknown color {bg!r}") from None
+
+        if bold is not None:
+            bits.append(f"\033[{1 if bold else 22}m")
+        if dim is not None:
+            bits.append(f"\033[{2 if dim else 22}m")
+        if underline is not None:
+            bits.append(f"\033[{4 if underline else 24}m")
+        if overline is not None:
+            bits.append(f"\033[{53 if overline else 55}m")
+        if italic is not None:
+            bits.append(f"\033[{3 if italic else 23}m")
+        if blink is not None:
+            bits.append(f"\033[{5 if blink else 25}m")
+        if reverse is not None:
+            bits.append(f"\033[{7 if reverse else 27}m")
+        if strikethrough is not None:
+            bits.append(f"\033[{9 if strikethrough else 29}m")
+
+        #: The codes written before the text.
+        self.prefix = "".join(bits)
+        #: The code written after the text, empty if ``reset`` is disabled.
+        self.suffix = _ansi_reset_all if reset else ""
+
+    def __call__(self, text: t.Any) -> str:
+        """Apply the style to a text. A non-string value is converted
+        to a string.
+        """
+        if not isinstance(text, str):
+            text = str(text)
+
+        return f"{self.prefix}{text}{self.suffix}"
+
+    def _get_params(self) -> dict[str, t.Any]:
+        return {
+            "fg": self.fg,
+            "bg": self.bg,
+            "bold": self.bold,
+            "dim": self.dim,
+            "underline": self.underline,
+            "overline": self.overline,
+            "italic": self.italic,
+            "blink": self.blink,
+            "reverse": self.reverse,
+            "strikethrough": self.strikethrough,
+            "reset": self.reset,
+        }
+
+    def replace(self, **changes: t.Any) -> Style:
+        """Create a copy of this style with some parameters changed.
+
+        .. code-block:: python
+
+            warning = error.replace(fg="yellow")
+        """
+        params = self._get_params()
+        params.update(changes)
+        return type(self)(**params)
+
+    def __repr__(self) -> str:
+        params = ", ".join(
+            f"{name}={value!r}"
+            for name, value in self._get_params().items()
+            if value is not None and not (name == "reset" and value)
+        )
+        return f"{type(self).__name__}({params})"
+
+
+_style_cache: dict[tuple[t.Any, ...], Style] = {}
+
+
+def _get_style(
+    fg: int | tuple[int, int, int] | str | None = None,
+    bg: int | tuple[int, int, int] | str | None = None,
+    bold: bool | None = None,
+    dim: bool | None = None,
+    underline: bool | None = None,
+    overline: bool | None = None,
+    italic: bool | None = None,
+    blink: bool | None = None,
+    reverse: bool | None = None,
+    strikethrough: bool | None = None,
+    reset: bool = True,
+) -> Style:
+    """Get the :class:`Style` for the given parameters, reusing it for
+    the same parameters.
+    """
+    key = (
+        fg,
+        bg,
+        bold,
+        dim,
+        underline,
+        overline,
+        italic,
+        blink,
+        reverse,
+        strikethrough,
+        reset,
+    )
+
+    try:
+        return _style_cache[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable, such as a list for an RGB color.
+        return Style(*key)
+
+    rv = Style(*key)
+
+    if len(_style_cache) >= 256:
+        _style_cache.clear()
+
+    _style_cache[key] = rv
+    return rv
+
+
 def style(
     text: t.Any,
     fg: int | tuple[int, int, int] | str | None = None,
@@ -532,6 +1018,10 @@ def style(
                   string which means that styles do not carry over.  This
                   can be disabled to compose styles.
 
+    .. versionchanged:: 8.2
+        The escape codes for each combination of styles are cached, see
+        :class:`Style`.
+
     .. versionchanged:: 8.0
         A non-string ``message`` is converted to a string.
 
@@ -547,43 +1037,29 @@ def style(
 
     .. versionadded:: 2.0
     """
+    key = (
+        fg,
+        bg,
+        bold,
+        dim,
+        underline,
+        overline,
+        italic,
+        blink,
+        reverse,
+        strikethrough,
+        reset,
+    )
+
+    try:
+        text_style = _style_cache[key]
+    except (KeyError, TypeError):
+        text_style = _get_style(*key)
+
     if not isinstance(text, str):
         text = str(text)
 
-    bits = []
-
-    if fg:
-        try:
-            bits.append(f"\033[{_interpret_color(fg)}m")
-        except KeyError:
-            raise TypeError(f"Unknown color {fg!r}") from None
-
-    if bg:
-        try:
-            bits.append(f"\033[{_interpret_color(bg, 10)}m")
-        except KeyError:
-            raise TypeError(f"Unknown color {bg!r}") from None
-
-    if bold is not None:
-        bits.append(f"\033[{1 if bold else 22}m")
-    if dim is not None:
-        bits.append(f"\033[{2 if dim else 22}m")
-    if underline is not None:
-        bits.append(f"\033[{4 if underline else 24}m")
-    if overline is not None:
-        bits.append(f"\033[{53 if overline else 55}m")
-    if italic is not None:
-        bits.append(f"\033[{3 if italic else 23}m")
-    if blink is not None:
-        bits.append(f"\033[{5 if blink else 25}m")
-    if reverse is not None:
-        bits.append(f"\033[{7 if reverse else 27}m")
-    if strikethrough is not None:
-        bits.append(f"\033[{9 if strikethrough else 29}m")
-    bits.append(text)
-    if reset:
-        bits.append(_ansi_reset_all)
-    return "".join(bits)
+    return f"{text_style.prefix}{text}{text_style.suffix}"
 
 
 def unstyle(text: str) -> str:
@@ -604,6 +1080,7 @@ def secho(
     nl: bool = True,
     err: bool = False,
     color: bool | None = None,
+    style: Style | None = None,
     **styles: t.Any,
 ) -> None:
     """This function combines :func:`echo` and :func:`style` into one
@@ -621,6 +1098,14 @@ def secho(
     style. If you want to style bytes that represent text, call
     :meth:`bytes.decode` first.
 
+    A :class:`Style` can be passed as ``style``. Other style keyword
+    arguments then change that style::
+
+        click_hotoffthehamster.secho('Hello World!', style=title, underline=True)
+
+    .. versionchanged:: 8.2
+        Added the ``style`` parameter.
+
     .. versionchanged:: 8.0
         A non-string ``message`` is converted to a string. Bytes are
         passed through without style applied.
@@ -628,7 +1113,12 @@ def secho(
     .. versionadded:: 2.0
     """
     if message is not None and not isinstance(message, (bytes, bytearray)):
-        message = style(message, **styles)
+        if style is None:
+            message = _get_style(**styles)(message)
+        elif styles:
+            message = style.replace(**styles)(message)
+        else:
+            message = style(message)
 
     return echo(message, file=file, nl=nl, err=err, color=color)
 
@@ -735,6 +1225,8 @@ def getchar(echo: bool = False) -> str:
     """
     global _getchar
 
+    _flush_output_buffer()
+
     if _getchar is None:
         from ._termui_impl import getchar as f
 
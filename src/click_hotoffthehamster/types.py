@@ -9,11 +9,24 @@ from datetime import datetime
 from gettext import gettext as _
 from gettext import ngettext
 
-from ._compat import _get_argv_encoding, open_stream
+from ._compat import (
+    COMPRESSION_CODECS,
+    DURABILITY_LEVELS,
+    _get_argv_encoding,
+    open_stream,
+)
 from .exceptions import BadParameter
-from .utils import LazyFile, format_filename, safecall
+from .utils import (
+    LazyFile,
+    _FilePrefetcher,
+    _PrefetchedFile,
+    format_filename,
+    safecall,
+)
 
 if t.TYPE_CHECKING:
+    import mmap
+
     import typing_extensions as te
 
     from .core import Context, Parameter
@@ -234,20 +247,120 @@ class Choice(ParamType):
     regardless of ``case_sensitive`` or any ``ctx.token_normalize_func``
     being specified.
 
+    Instead of a sequence, ``choices`` may be a function that takes no
+    arguments and returns the sequence. It is not called until the
+    choices are first needed, such as to convert a value, complete a
+    value, or show help, and its result is remembered after that. This
+    avoids computing expensive choices when the parameter is not used.
+
+    The normalized lookup tables used by :meth:`convert` and
+    :meth:`shell_complete` are built on first use and reused after
+    that. They are rebuilt if :attr:`choices` is assigned a new value,
+    but not if the sequence is modified in place.
+
     See :ref:`choice-opts` for an example.
 
+    :param choices: The sequence of valid values, or a function that
+        returns it.
     :param case_sensitive: Set to false to make choices case
         insensitive. Defaults to true.
+    :param ttl: If ``choices`` is a function, call it again when the
+        remembered result is older than this many seconds. By default
+        the result is kept for the life of the type.
+
+    .. versionchanged:: 8.2
+        ``choices`` can be a function that is called when the choices
+        are first needed. Added the ``ttl`` parameter.
+
+    .. versionchanged:: 8.2
+        Normalized choices are cached, and error messages only list the
+        first :attr:`max_error_choices` choices.
     """
 
     name = "choice"
 
+    #: The maximum number of choices listed in an error message. Any
+    #: remaining choices are summarized with a count.
+    max_error_choices: t.ClassVar[int] = 20
+
     def __init__(
-        self, choices: cabc.Sequence[str], case_sensitive: bool = True
+        self,
+        choices: cabc.Sequence[str] | t.Callable[[], cabc.Sequence[str]],
+        case_sensitive: bool = True,
+        ttl: float | None = None,
     ) -> None:
+        self.ttl = ttl
         self.choices = choices
         self.case_sensitive = case_sensitive
 
+    @property
+    def choices(self) -> cabc.Sequence[str]:
+        import time
+
+        if self._loader is not None and (
+            self._loaded_at is None
+            or (self.ttl is not None and time.monotonic() - self._loaded_at >= self.ttl)
+        ):
+            self._set_loaded_choices(self._loader())
+
+        return self._choices
+
+    @choices.setter
+    def choices(
+        self, value: cabc.Sequence[str] | t.Callable[[], cabc.Sequence[str]]
+    ) -> None:
+        if callable(value):
+            self._loader: t.Callable[[], cabc.Sequence[str]] | None = value
+            self._loaded_at: float | None = None
+            self._reset_choices(())
+        else:
+            self._loader = None
+            self._loaded_at = None
+            self._reset_choices(value)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the choices are available without calling the
+        loader function. Always true if a sequence was given.
+        """
+        return self._loader is None or self._loaded_at is not None
+
+    def _set_loaded_choices(self, value: cabc.Iterable[str]) -> None:
+        import time
+
+        if not isinstance(value, cabc.Sequence):
+            value = tuple(value)
+
+        self._reset_choices(value)
+        self._loaded_at = time.monotonic()
+
+    def snapshot(self) -> list[str]:
+        """Return the current choices as a list that can be serialized,
+        for example as JSON in a manifest generated at build time. The
+        loader function is called if the choices have not been loaded.
+
+        .. versionadded:: 8.2
+        """
+        return list(self.choices)
+
+    def restore(self, snapshot: cabc.Iterable[str]) -> None:
+        """Use choices from a previous :meth:`snapshot` as if they were
+        just returned by the loader function. The loader is not called
+        again until the ``ttl`` expires, if one was given.
+
+        .. versionadded:: 8.2
+        """
+        self._set_loaded_choices(snapshot)
+
+    def _reset_choices(self, value: cabc.Sequence[str]) -> None:
+        self._choices = value
+        self._normed_choices_cache: dict[
+            tuple[t.Callable[[str], str] | None, bool], dict[str, str]
+        ] = {}
+        self._completion_index_cache: dict[
+            bool, tuple[list[str], list[int], list[str]]
+        ] = {}
+
     def to_info_dict(self) -> dict[str, t.Any]:
         info_dict = super().to_info_dict()
         info_dict["choices"] = self.choices
@@ -265,7 +378,79 @@ class Choice(ParamType):
         return f"[{choices_str}]"
 
     def get_missing_message(self, param: Parameter) -> str:
-        return _("Choose from:\n\t{choices}").format(choices=",\n\t".join(self.choices))
+        return _("Choose from:\n\t{choices}").format(
+            choices=",\n\t".join(self._truncated_choices(str))
+        )
+
+    def _truncated_choices(self, fmt: t.Callable[[t.Any], str]) -> list[str]:
+        """Format the choices for an error message, listing at most
+        :attr:`max_error_choices` of them.
+        """
+        choices = self.choices
+        limit = self.max_error_choices
+
+        if len(choices) <= limit:
+            return [fmt(c) for c in choices]
+
+        omitted = len(choices) - limit
+        rv = [fmt(choices[i]) for i in range(limit)]
+        rv.append(
+            ngettext("and {count} other", "and {count} others", omitted).format(
+                count=omitted
+            )
+        )
+        return rv
+
+    def _get_normed_choices(
+        self, normalize_func: t.Callable[[str], str] | None
+    ) -> dict[str, str]:
+        """Map each normalized choice to the original choice. The table
+        is cached per normalize function and case sensitivity.
+        """
+        key = (normalize_func, self.case_sensitive)
+        # Access the choices first, a reload replaces the cache.
+        choices = self.choices
+        cache = self._normed_choices_cache
+
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # An unhashable normalize function can't be cached.
+            return self._build_normed_choices(choices, normalize_func)
+
+        normed_choices = self._build_normed_choices(choices, normalize_func)
+
+        # A new function each invocation, like a lambda created per
+        # context, would otherwise grow the cache without bound.
+        if len(cache) >= 8:
+            cache.clear()
+
+        cache[key] = normed_choices
+        return normed_choices
+
+    def _build_normed_choices(
+        self,
+        choices: cabc.Sequence[str],
+        normalize_func: t.Callable[[str], str] | None,
+    ) -> dict[str, str]:
+        # First do token_normalize_func, then lowercase.
+        normed_choices = {choice: choice for choice in choices}
+
+        if normalize_func is not None:
+            normed_choices = {
+                normalize_func(normed_choice): original
+                for normed_choice, original in normed_choices.items()
+            }
+
+        if not self.case_sensitive:
+            normed_choices = {
+                normed_choice.casefold(): original
+                for normed_choice, original in normed_choices.items()
+            }
+
+        return normed_choices
 
     def convert(
         self, value: t.Any, param: Parameter | None, ctx: Context | None
@@ -275,26 +460,21 @@ class Choice(ParamType):
         # preserve original `value` to produce an accurate message in
         # `self.fail`
         normed_value = value
-        normed_choices = {choice: choice for choice in self.choices}
+        normalize_func = None
 
         if ctx is not None and ctx.token_normalize_func is not None:
-            normed_value = ctx.token_normalize_func(value)
-            normed_choices = {
-                ctx.token_normalize_func(normed_choice): original
-                for normed_choice, original in normed_choices.items()
-            }
+            normalize_func = ctx.token_normalize_func
+            normed_value = normalize_func(value)
 
         if not self.case_sensitive:
             normed_value = normed_value.casefold()
-            normed_choices = {
-                normed_choice.casefold(): original
-                for normed_choice, original in normed_choices.items()
-            }
+
+        normed_choices = self._get_normed_choices(normalize_func)
 
         if normed_value in normed_choices:
             return normed_choices[normed_value]
 
-        choices_str = ", ".join(map(repr, self.choices))
+        choices_str = ", ".join(self._truncated_choices(repr))
         self.fail(
             ngettext(
                 "{value!r} is not {choice}.",
@@ -306,8 +486,37 @@ class Choice(ParamType):
         )
 
     def __repr__(self) -> str:
+        if not self.is_loaded:
+            return f"Choice({self._loader!r})"
+
         return f"Choice({list(self.choices)})"
 
+    def _get_completion_index(self) -> tuple[list[str], list[int], list[str]]:
+        """Return the choices sorted by their completion key, the
+        original position of each, and the choices as strings. The
+        index is cached per case sensitivity.
+        """
+        case_sensitive = self.case_sensitive
+        # Access the choices first, a reload replaces the cache.
+        choices = self.choices
+
+        try:
+            return self._completion_index_cache[case_sensitive]
+        except KeyError:
+            pass
+
+        str_choices = [str(c) for c in choices]
+
+        if case_sensitive:
+            keys = str_choices
+        else:
+            keys = [c.lower() for c in str_choices]
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        index = ([keys[i] for i in order], order, str_choices)
+        self._completion_index_cache[case_sensitive] = index
+        return index
+
     def shell_complete(
         self, ctx: Context, param: Parameter, incomplete: str
     ) -> list[CompletionItem]:
@@ -317,19 +526,34 @@ class Choice(ParamType):
         :param param: The parameter that is requesting completion.
         :param incomplete: Value being completed. May be empty.
 
+        .. versionchanged:: 8.2
+            Matches are found with a cached sorted prefix index.
+
         .. versionadded:: 8.0
         """
+        from bisect import bisect_left
+
         from click_hotoffthehamster.shell_completion import CompletionItem
 
-        str_choices = map(str, self.choices)
+        keys, order, str_choices = self._get_completion_index()
 
-        if self.case_sensitive:
-            matched = (c for c in str_choices if c.startswith(incomplete))
-        else:
+        if not incomplete:
+            return [CompletionItem(c) for c in str_choices]
+
+        if not self.case_sensitive:
             incomplete = incomplete.lower()
-            matched = (c for c in str_choices if c.lower().startswith(incomplete))
 
-        return [CompletionItem(c) for c in matched]
+        matched = []
+
+        for i in range(bisect_left(keys, incomplete), len(keys)):
+            if not keys[i].startswith(incomplete):
+                break
+
+            matched.append(order[i])
+
+        # Keep the order the choices were given in.
+        matched.sort()
+        return [CompletionItem(str_choices[i]) for i in matched]
 
 
 class DateTime(ParamType):
@@ -665,7 +889,42 @@ class File(ParamType):
     completion the file will be moved over to the original location.  This
     is useful if a file regularly read by other users is modified.
 
+    With ``mmap=True`` and ``mode="rb"``, a regular file is returned as
+    a read-only :class:`mmap.mmap` instead of a stream, positioned where
+    the stream was. This includes stdin when it is redirected from a
+    regular file. Pipes, terminals, and empty files are returned as
+    streams. The mapping is closed when the context tears down.
+
+    ``buffering`` is passed to :func:`open` to set the buffer size. With
+    ``sequential=True``, the OS is told that the file will be read from
+    start to end, so it reads further ahead, where
+    :func:`os.posix_fadvise` is available.
+
+    ``compression`` streams the file through the ``"gzip"``, ``"bz2"``,
+    or ``"xz"`` codec from the standard library. With ``"auto"``, the
+    codec is chosen by the file extension, or by the leading bytes of
+    the data when reading, and other files are opened as usual. This
+    works with ``lazy``, ``atomic``, and ``-``, but not with ``mmap``.
+    When writing gzip, ``threads`` compresses blocks of data in that many
+    threads, which still produces a single gzip stream.
+
+    With ``atomic=True``, ``durability="file"`` syncs the data to disk
+    before the file is replaced, and ``"dir"`` also syncs the directory,
+    so the new file survives a power loss. See :func:`atomic_group`.
+
+    With ``prefetch`` set to a number of files, reading parameters that
+    take many files, such as ``nargs=-1``, open and read that many of
+    the files ahead on background threads, in order. At most
+    ``prefetch_bytes`` are buffered, after which the rest of a file is
+    read when it's used. The files are opened when first used, which
+    also raises errors opening them.
+
     See :ref:`file-args` for more information.
+
+    .. versionchanged:: 8.2
+        Added the ``mmap``, ``buffering``, ``sequential``,
+        ``compression``, ``threads``, ``durability``, ``prefetch``, and
+        ``prefetch_bytes`` parameters.
     """
 
     name = "filename"
@@ -678,12 +937,74 @@ class File(ParamType):
         errors: str | None = "strict",
         lazy: bool | None = None,
         atomic: bool = False,
+        mmap: bool = False,
+        buffering: int = -1,
+        sequential: bool = False,
+        compression: str | None = None,
+        threads: int = 1,
+        durability: str = "none",
+        prefetch: int = 0,
+        prefetch_bytes: int = 64 * 1024 * 1024,
     ) -> None:
+        if mmap and (
+            "b" not in mode or any(m in mode for m in "wax+") or lazy or atomic
+        ):
+            raise ValueError(
+                "'mmap' is only supported for reading binary files, without"
+                " 'lazy' or 'atomic'."
+            )
+
+        if compression is not None:
+            if compression != "auto" and compression not in COMPRESSION_CODECS:
+                raise ValueError(f"Unknown compression {compression!r}.")
+
+            if mmap:
+                raise ValueError("'mmap' can't be used with 'compression'.")
+
+            if "+" in mode:
+                raise ValueError("Compressed files can't be opened for updating.")
+
+        if threads != 1 and (
+            threads < 1
+            or compression not in {"gzip", "auto"}
+            or not any(m in mode for m in "wax")
+        ):
+            raise ValueError(
+                "'threads' must be at least 1, and is only supported for"
+                " writing with 'gzip' compression."
+            )
+
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability {durability!r}.")
+
+        if durability != "none" and not atomic:
+            raise ValueError("'durability' is only supported for atomic writes.")
+
+        if prefetch and (
+            prefetch < 0
+            or any(m in mode for m in "wax+")
+            or lazy
+            or mmap
+            or compression is not None
+        ):
+            raise ValueError(
+                "'prefetch' is only supported for reading, without 'lazy',"
+                " 'mmap', or 'compression'."
+            )
+
         self.mode = mode
         self.encoding = encoding
         self.errors = errors
         self.lazy = lazy
         self.atomic = atomic
+        self.mmap = mmap
+        self.buffering = buffering
+        self.sequential = sequential
+        self.compression = compression
+        self.threads = threads
+        self.durability = durability
+        self.prefetch = prefetch
+        self.prefetch_bytes = prefetch_bytes
 
     def to_info_dict(self) -> dict[str, t.Any]:
         info_dict = super().to_info_dict()
@@ -710,12 +1031,24 @@ class File(ParamType):
 
         value = t.cast("str | os.PathLike[str]", value)
 
+        if self.prefetch and ctx is not None and os.fspath(value) != "-":
+            return self._prefetch(os.fspath(value), ctx)
+
         try:
             lazy = self.resolve_lazy_flag(value)
 
             if lazy:
                 lf = LazyFile(
-                    value, self.mode, self.encoding, self.errors, atomic=self.atomic
+                    value,
+                    self.mode,
+                    self.encoding,
+                    self.errors,
+                    atomic=self.atomic,
+                    buffering=self.buffering,
+                    sequential=self.sequential,
+                    compression=self.compression,
+                    threads=self.threads,
+                    durability=self.durability,
                 )
 
                 if ctx is not None:
@@ -724,9 +1057,31 @@ class File(ParamType):
                 return t.cast("t.IO[t.Any]", lf)
 
             f, should_close = open_stream(
-                value, self.mode, self.encoding, self.errors, atomic=self.atomic
+                value,
+                self.mode,
+                self.encoding,
+                self.errors,
+                atomic=self.atomic,
+                buffering=self.buffering,
+                sequential=self.sequential,
+                compression=self.compression,
+                threads=self.threads,
+                durability=self.durability,
             )
 
+            if self.mmap:
+                mapped = _mmap_stream(f)
+
+                if mapped is not None:
+                    # The mapping keeps its own handle to the file.
+                    if should_close:
+                        f.close()
+
+                    if ctx is not None:
+                        ctx.call_on_close(safecall(mapped.close))
+
+                    return t.cast("t.IO[t.Any]", mapped)
+
             # If a context is provided, we automatically close the file
             # at the end of the context execution (or flush out).  If a
             # context does not exist, it's the caller's responsibility to
@@ -741,6 +1096,29 @@ class File(ParamType):
             return f
         except OSError as e:  # noqa: B014
             self.fail(f"'{format_filename(value)}': {e.strerror}", param, ctx)
+        except ValueError as e:
+            # compression="auto" picked a codec from the name that doesn't
+            # support the other options, such as threads.
+            self.fail(f"'{format_filename(value)}': {e}", param, ctx)
+
+    def _prefetch(self, filename: str, ctx: Context) -> t.IO[t.Any]:
+        # All values of the parameter share one prefetcher, which reads
+        # them in the order they are converted.
+        key = f"click_hotoffthehamster.prefetch.{id(self)}.{id(ctx)}"
+        prefetcher = ctx.meta.get(key)
+
+        if prefetcher is None:
+            prefetcher = _FilePrefetcher(self.prefetch, self.prefetch_bytes)
+            ctx.meta[key] = prefetcher
+
+            @ctx.call_on_close
+            def close_prefetcher() -> None:
+                ctx.meta.pop(key, None)
+                prefetcher.close()
+
+        f = _PrefetchedFile(prefetcher, filename, self.mode, self.encoding, self.errors)
+        ctx.call_on_close(f.close_intelligently)
+        return t.cast("t.IO[t.Any]", f)
 
     def shell_complete(
         self, ctx: Context, param: Parameter, incomplete: str
@@ -759,6 +1137,28 @@ class File(ParamType):
         return [CompletionItem(incomplete, type="file")]
 
 
+def _mmap_stream(f: t.IO[t.Any]) -> mmap.mmap | None:
+    """Map a binary stream read-only if it is a regular file that is not
+    empty, positioned at the stream's position. Otherwise return
+    ``None``.
+    """
+    import mmap
+
+    try:
+        fd = f.fileno()
+
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            return None
+
+        pos = f.tell()
+        mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    mapped.seek(min(pos, len(mapped)))
+    return mapped
+
+
 def _is_file_like(value: t.Any) -> te.TypeGuard[t.IO[t.Any]]:
     return hasattr(value, "read") or hasattr(value, "write")
 
@@ -1,18 +1,29 @@
 from __future__ import annotations
 
 import collections.abc as cabc
+import errno
+import io
+import itertools
 import os
 import re
 import sys
+import threading
 import typing as t
+from contextlib import contextmanager
 from functools import update_wrapper
 from types import ModuleType, TracebackType
 
 from ._compat import (
     WIN,
+    _AtomicFile,
+    _check_threads,
+    _compression_from_name,
     _default_text_stderr,
     _default_text_stdout,
     _find_binary_writer,
+    _pop_atomic_group,
+    _push_atomic_group,
+    _wrap_io_open,
     auto_wrap_for_ansi,
     binary_streams,
     open_stream,
@@ -21,6 +32,7 @@ from ._compat import (
     term_len,
     text_streams,
 )
+from .globals import get_current_context
 from .globals import resolve_color_default
 
 if t.TYPE_CHECKING:
@@ -113,6 +125,13 @@ class LazyFile:
     the file but it does perform some basic checks early to see if the
     filename parameter does make sense.  This is useful for safely opening
     files for writing.
+
+    Once the file is open, its methods are bound to the lazy file, so
+    calling them does not go through the proxy again.
+
+    .. versionchanged:: 8.2
+        Added the ``buffering``, ``sequential``, ``compression``,
+        ``threads``, and ``durability`` parameters.
     """
 
     def __init__(
@@ -122,28 +141,55 @@ class LazyFile:
         encoding: str | None = None,
         errors: str | None = "strict",
         atomic: bool = False,
+        buffering: int = -1,
+        sequential: bool = False,
+        compression: str | None = None,
+        threads: int = 1,
+        durability: str = "none",
     ):
         self.name: str = os.fspath(filename)
         self.mode = mode
         self.encoding = encoding
         self.errors = errors
         self.atomic = atomic
+        self.buffering = buffering
+        self.sequential = sequential
+        self.compression = compression
+        self.threads = threads
+        self.durability = durability
         self._f: t.IO[t.Any] | None
         self.should_close: bool
 
         if self.name == "-":
-            self._f, self.should_close = open_stream(filename, mode, encoding, errors)
+            self._f, self.should_close = open_stream(
+                filename,
+                mode,
+                encoding,
+                errors,
+                sequential=sequential,
+                compression=compression,
+                threads=threads,
+            )
         else:
             if "r" in mode:
                 # Open and close the file in case we're opening it for
                 # reading so that we can catch at least some errors in
                 # some cases early.
                 open(filename, mode).close()
+            elif compression == "auto":
+                # The name picks the codec, check it supports the options.
+                _check_threads(mode, _compression_from_name(self.name), threads)
             self._f = None
             self.should_close = True
 
     def __getattr__(self, name: str) -> t.Any:
-        return getattr(self.open(), name)
+        value = getattr(self.open(), name)
+
+        # Bind methods directly, so later calls skip this lookup.
+        if callable(value):
+            self.__dict__[name] = value
+
+        return value
 
     def __repr__(self) -> str:
         if self._f is not None:
@@ -159,7 +205,16 @@ class LazyFile:
             return self._f
         try:
             rv, self.should_close = open_stream(
-                self.name, self.mode, self.encoding, self.errors, atomic=self.atomic
+                self.name,
+                self.mode,
+                self.encoding,
+                self.errors,
+                atomic=self.atomic,
+                buffering=self.buffering,
+                sequential=self.sequential,
+                compression=self.compression,
+                threads=self.threads,
+                durability=self.durability,
             )
         except OSError as e:  # noqa: E402
             from .exceptions import FileError
@@ -201,7 +256,13 @@ class KeepOpenFile:
         self._file: t.IO[t.Any] = file
 
     def __getattr__(self, name: str) -> t.Any:
-        return getattr(self._file, name)
+        value = getattr(self._file, name)
+
+        # Bind methods directly, so later calls skip this lookup.
+        if callable(value):
+            self.__dict__[name] = value
+
+        return value
 
     def __enter__(self) -> KeepOpenFile:
         return self
@@ -221,6 +282,522 @@ class KeepOpenFile:
         return iter(self._file)
 
 
+class _PrefetchEntry:
+    def __init__(self, index: int, filename: str) -> None:
+        self.index = index
+        self.filename = filename
+        #: "pending", "loading", "ready", or "claimed".
+        self.state = "pending"
+        self.claimed = False
+        self.chunks: list[bytes] = []
+        self.size = 0
+        #: The open file if it wasn't read to the end, positioned after
+        #: the chunks.
+        self.file: io.FileIO | None = None
+        self.error: OSError | None = None
+
+
+class _FilePrefetcher:
+    """Open and read files ahead of their use on a pool of threads.
+
+    Files are started in the order they were added. At most ``files``
+    of them are started but not yet used, which also limits the open
+    file descriptors. At most ``max_bytes`` of their data is buffered,
+    given to earlier files first. Using a file takes what was read so
+    far, and the rest is read from its open descriptor.
+    """
+
+    chunk_size = 1024 * 1024
+
+    def __init__(self, files: int, max_bytes: int) -> None:
+        self._files = files
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Threads wait for different things, so each is only woken when
+        # it can continue: workers for a file to start or for buffer
+        # space, and users for a file that's being read.
+        self._can_start = threading.Condition(self._lock)
+        self._can_read = threading.Condition(self._lock)
+        self._loaded = threading.Condition(self._lock)
+        self._entries: list[_PrefetchEntry] = []
+        self._waiting: set[int] = set()
+        self._next = 0
+        self._in_flight = 0
+        self._buffered = 0
+        self._closed = False
+        self._threads: list[threading.Thread] = []
+
+    def add(self, filename: str) -> _PrefetchEntry:
+        with self._lock:
+            entry = _PrefetchEntry(len(self._entries), filename)
+            self._entries.append(entry)
+            self._can_start.notify()
+
+        if len(self._threads) < self._files:
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        return entry
+
+    def _take(self) -> _PrefetchEntry | None:
+        with self._lock:
+            while True:
+                if self._closed:
+                    return None
+
+                # Skip files that were used before their turn.
+                while (
+                    self._next < len(self._entries)
+                    and self._entries[self._next].claimed
+                ):
+                    self._next += 1
+
+                if self._next < len(self._entries) and self._in_flight < self._files:
+                    entry = self._entries[self._next]
+                    self._next += 1
+                    self._in_flight += 1
+                    entry.state = "loading"
+                    return entry
+
+                self._can_start.wait()
+
+    def _work(self) -> None:
+        while True:
+            entry = self._take()
+
+            if entry is None:
+                return
+
+            try:
+                self._load(entry)
+            finally:
+                with self._lock:
+                    entry.state = "ready"
+                    self._loaded.notify_all()
+
+    def _reserve(self, entry: _PrefetchEntry, want: int) -> int:
+        """Wait for buffer space, after any earlier file that's waiting.
+        Returns 0 if the file was used or the prefetcher closed first.
+        """
+        with self._lock:
+            self._waiting.add(entry.index)
+
+            try:
+                while True:
+                    if entry.claimed or self._closed:
+                        return 0
+
+                    n = min(want, self._max_bytes - self._buffered)
+
+                    if n > 0 and min(self._waiting) == entry.index:
+                        self._buffered += n
+                        return n
+
+                    self._can_read.wait()
+            finally:
+                self._waiting.discard(entry.index)
+                self._can_read.notify_all()
+
+    def _load(self, entry: _PrefetchEntry) -> None:
+        try:
+            f = open(entry.filename, "rb", buffering=0)
+            size = os.fstat(f.fileno()).st_size
+        except OSError as e:
+            entry.error = e
+            return
+
+        while True:
+            # Read the rest of a regular file at once if there is space,
+            # which avoids joining chunks.
+            n = self._reserve(entry, max(size - entry.size, self.chunk_size))
+
+            if not n:
+                entry.file = f
+                return
+
+            try:
+                chunk = f.read(n)
+            except OSError as e:
+                chunk = b""
+                entry.error = e
+
+            with self._lock:
+                self._buffered -= n - len(chunk)
+                self._can_read.notify_all()
+
+            if chunk:
+                entry.chunks.append(chunk)
+                entry.size += len(chunk)
+
+            # A regular file is at the end once its size was read,
+            # which saves the read that returns nothing.
+            if not chunk or entry.size == size:
+                f.close()
+                return
+
+    def claim(self, entry: _PrefetchEntry) -> bool:
+        """Take the entry from the prefetcher, waiting if a thread is
+        reading it. Its buffered data no longer counts towards the limit.
+        Returns whether a thread started on the entry.
+        """
+        with self._lock:
+            entry.claimed = True
+            self._can_read.notify_all()
+
+            while entry.state == "loading":
+                self._loaded.wait()
+
+            started = entry.state == "ready"
+
+            if started:
+                self._in_flight -= 1
+                self._buffered -= entry.size
+                self._can_start.notify()
+
+            entry.state = "claimed"
+            return started
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._can_start.notify_all()
+            self._can_read.notify_all()
+            self._loaded.notify_all()
+
+        for thread in self._threads:
+            thread.join()
+
+        for entry in self._entries:
+            if entry.state != "claimed" and entry.file is not None:
+                entry.file.close()
+
+
+class _PrefetchedRaw(io.RawIOBase):
+    """Read the prefetched start of a file, then the rest from the open
+    file.
+    """
+
+    def __init__(self, head: bytes, f: io.FileIO) -> None:
+        self._head = memoryview(head)
+        self._f = f
+        self._pos = 0
+
+    @property
+    def name(self) -> t.Any:
+        return self._f.name
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self._f.seekable()
+
+    def fileno(self) -> int:
+        return self._f.fileno()
+
+    def readinto(self, b: t.Any) -> int | None:
+        if self._pos < len(self._head):
+            data = self._head[self._pos : self._pos + len(b)]
+            n = len(data)
+            b[:n] = data
+        else:
+            n = self._f.readinto(b) or 0
+
+        self._pos += n
+        return n
+
+    def readall(self) -> bytes:
+        head = self._head[self._pos :]
+        rest = self._f.readall()
+        self._pos += len(head) + len(rest)
+        return b"".join((head, rest))
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._f.seek(0, os.SEEK_END)
+
+        self._pos = max(offset, 0)
+        self._f.seek(max(self._pos, len(self._head)))
+        return self._pos
+
+    def close(self) -> None:
+        self._f.close()
+        super().close()
+
+
+class _PrefetchedFile:
+    """A file read ahead by a :class:`_FilePrefetcher`. Like
+    :class:`LazyFile`, it's opened when it's first used, which waits for
+    the data read so far. Errors opening the file are raised then as a
+    :exc:`FileError`.
+    """
+
+    def __init__(
+        self,
+        prefetcher: _FilePrefetcher,
+        filename: str,
+        mode: str = "rb",
+        encoding: str | None = None,
+        errors: str | None = "strict",
+    ) -> None:
+        self.name = filename
+        self.mode = mode
+        self.encoding = encoding
+        self.errors = errors
+        self._prefetcher = prefetcher
+        self._entry = prefetcher.add(filename)
+        self._f: t.IO[t.Any] | None = None
+
+    def __getattr__(self, name: str) -> t.Any:
+        value = getattr(self.open(), name)
+
+        # Bind methods directly, so later calls skip this lookup.
+        if callable(value):
+            self.__dict__[name] = value
+
+        return value
+
+    def __repr__(self) -> str:
+        if self._f is not None:
+            return repr(self._f)
+        return f"<prefetched file '{format_filename(self.name)}' {self.mode}>"
+
+    def open(self) -> t.IO[t.Any]:
+        if self._f is not None:
+            return self._f
+
+        entry = self._entry
+        started = self._prefetcher.claim(entry)
+
+        if entry.error is not None:
+            if entry.file is not None:
+                entry.file.close()
+
+            from .exceptions import FileError
+
+            raise FileError(self.name, hint=entry.error.strerror) from entry.error
+
+        head = b"".join(entry.chunks)
+        entry.chunks.clear()
+        rv: t.IO[t.Any]
+
+        if not started:
+            # Used before a thread got to it, open it as usual.
+            try:
+                rv = _wrap_io_open(self.name, self.mode, self.encoding, self.errors)
+            except OSError as e:
+                from .exceptions import FileError
+
+                raise FileError(self.name, hint=e.strerror) from e
+        elif entry.file is None:
+            rv = io.BytesIO(head)
+        else:
+            rv = io.BufferedReader(_PrefetchedRaw(head, entry.file))
+
+        if "b" not in self.mode and not isinstance(rv, io.TextIOWrapper):
+            rv = io.TextIOWrapper(
+                t.cast(t.BinaryIO, rv), encoding=self.encoding, errors=self.errors
+            )
+
+        self._f = rv
+        return rv
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            return
+
+        # Release the file without reading it.
+        self._prefetcher.claim(self._entry)
+
+        if self._entry.file is not None:
+            self._entry.file.close()
+
+        self._entry.chunks.clear()
+
+    def close_intelligently(self) -> None:
+        self.close()
+
+    def __enter__(self) -> _PrefetchedFile:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close_intelligently()
+
+    def __iter__(self) -> cabc.Iterator[t.Any]:
+        return iter(self.open())
+
+
+class OutputBuffer:
+    """Collects the output of :func:`echo` and writes it in batches
+    instead of flushing the stream on every call.  Use
+    :func:`buffered_output` or the ``buffered_output`` context setting
+    rather than creating this directly.
+
+    Pending output is written when more than ``max_size`` characters or
+    bytes are collected, at most ``max_delay`` seconds after the last
+    write, before prompting for input, before writing to ``stderr``, and
+    when the buffer is closed. If no other call comes in time, a timer
+    thread writes it.
+
+    :param max_size: Write the output once this much is pending.
+    :param max_delay: Write the output if it was last written this many
+        seconds ago. ``None`` only uses the size.
+
+    .. versionadded:: 8.2
+    """
+
+    def __init__(self, max_size: int = 64 * 1024, max_delay: float | None = 0.1):
+        import time
+
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._clock = time.monotonic
+        self._pending: list[tuple[t.IO[t.Any], str | bytes]] = []
+        self._size = 0
+        self._written_at = self._clock()
+        self._lock = threading.RLock()
+        self._timer: threading.Timer | None = None
+
+    def write(self, file: t.IO[t.Any], data: str | bytes) -> None:
+        """Add data to write to a file, and write everything pending if a
+        threshold is reached.
+        """
+        with self._lock:
+            self._pending.append((file, data))
+            self._size += len(data)
+
+            if self.max_delay is None:
+                if self._size < self.max_size:
+                    return
+            elif self._size < self.max_size:
+                delay = self.max_delay - (self._clock() - self._written_at)
+
+                if delay > 0:
+                    if self._timer is None:
+                        self._start_timer(delay)
+
+                    return
+
+            self.flush()
+
+    def _start_timer(self, delay: float) -> None:
+        """Write the pending output after a delay, in case no other call
+        comes to write it. A single timer runs at a time, so writing many
+        small pieces doesn't start a thread for each.
+        """
+
+        def run() -> None:
+            with self._lock:
+                self._timer = None
+
+                if self._pending:
+                    self.flush()
+
+        timer = threading.Timer(delay, run)
+        timer.daemon = True
+        self._timer = timer
+        timer.start()
+
+    def flush(self) -> None:
+        """Write and flush all pending output."""
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+            self._size = 0
+            self._written_at = self._clock()
+
+            # Consecutive writes to the same file are joined into one.
+            # Each file is flushed before switching to the next, so text
+            # and bytes written to the same stream stay in order.
+            for (file, _), items in itertools.groupby(
+                pending, key=lambda item: (item[0], type(item[1]))
+            ):
+                data = [item[1] for item in items]
+                file.write(data[0][:0].join(data))  # type: ignore[arg-type]
+                file.flush()
+
+
+_output_local = threading.local()
+
+
+@contextmanager
+def buffered_output(
+    max_size: int = 64 * 1024, max_delay: float | None = 0.1
+) -> cabc.Iterator[OutputBuffer]:
+    """Collect the output of :func:`echo` and :func:`secho` in the
+    current thread and write it in batches, instead of flushing the
+    stream on every call.  This makes printing many short lines to a
+    pipe or file much faster.
+
+    .. code-block:: python
+
+        with click.buffered_output():
+            for row in rows:
+                click.echo(row)
+
+    See :class:`OutputBuffer` for when the output is written.
+    ``buffer.flush()`` or ``echo(nl=False)`` writes it right away.  Output
+    written without :func:`echo`, such as with :func:`print`, is not
+    collected and can appear before earlier buffered output.
+
+    To buffer the output of a whole command, pass
+    ``context_settings={"buffered_output": True}`` instead.
+
+    :param max_size: Write the output once this many characters or
+        bytes are pending.
+    :param max_delay: Write the output if it was last written this many
+        seconds ago. ``None`` only uses the size.
+
+    .. versionadded:: 8.2
+    """
+    buffer = OutputBuffer(max_size, max_delay)
+    stack = _output_local.__dict__.setdefault("stack", [])
+    stack.append(buffer)
+
+    try:
+        yield buffer
+    finally:
+        stack.pop()
+        buffer.flush()
+
+
+def _get_output_buffer() -> OutputBuffer | None:
+    """Get the output buffer from the innermost :func:`buffered_output`
+    block in this thread, or from the current context.
+    """
+    stack = getattr(_output_local, "stack", None)
+
+    if stack:
+        return stack[-1]  # type: ignore[no-any-return]
+
+    ctx = get_current_context(silent=True)
+
+    if ctx is not None:
+        return ctx._output_buffer
+
+    return None
+
+
+def _flush_output_buffer() -> None:
+    """Write pending buffered output, for example before reading input."""
+    buffer = _get_output_buffer()
+
+    if buffer is not None:
+        buffer.flush()
+
+
 def echo(
     message: t.Any | None = None,
     file: t.IO[t.Any] | None = None,
@@ -241,7 +818,7 @@ def echo(
     -   Supports colors and styles on Windows.
     -   Removes ANSI color and style codes if the output does not look
         like an interactive terminal.
-    -   Always flushes the output.
+    -   Always flushes the output, unless in :func:`buffered_output`.
 
     :param message: The string or bytes to output. Other objects are
         converted to strings.
@@ -252,6 +829,12 @@ def echo(
         default Click will remove color if the output does not look like
         an interactive terminal.
 
+    .. versionchanged:: 8.2
+        Output is collected and written in batches in
+        :func:`buffered_output` or if the ``buffered_output`` context
+        setting is enabled. Writing to ``stderr`` writes pending output
+        first.
+
     .. versionchanged:: 6.0
         Support Unicode output on the Windows console. Click does not
         modify ``sys.stdout``, so ``sys.stdout.write()`` and ``print()``
@@ -290,7 +873,18 @@ def echo(
         else:
             out += b"\n"
 
+    buffer = _get_output_buffer()
+
+    # Keep stdout and stderr in order by writing pending output first.
+    # Output to stderr is never buffered.
+    if buffer is not None and (err or file is sys.stderr):
+        buffer.flush()
+        buffer = None
+
     if not out:
+        if buffer is not None:
+            buffer.flush()
+
         file.flush()
         return
 
@@ -302,14 +896,19 @@ def echo(
         binary_file = _find_binary_writer(file)
 
         if binary_file is not None:
+            if buffer is not None:
+                buffer.write(binary_file, bytes(out))
+                return
+
             file.flush()
             binary_file.write(out)
             binary_file.flush()
             return
 
     # ANSI style code support. For no message or bytes, nothing happens.
-    # When outputting to a file instead of a terminal, strip codes.
-    else:
+    # When outputting to a file instead of a terminal, strip codes. Text
+    # without codes is left as is, except on Windows.
+    elif WIN or "\033" in out:
         color = resolve_color_default(color)
 
         if should_strip_ansi(file, color):
@@ -320,10 +919,127 @@ def echo(
             elif not color:
                 out = strip_ansi(out)
 
+    if buffer is not None:
+        buffer.write(file, out)
+        return
+
     file.write(out)  # type: ignore
     file.flush()
 
 
+#: The number of characters or bytes :func:`echo_lines` collects before
+#: writing them.
+_ECHO_LINES_CHUNK_SIZE = 64 * 1024
+
+
+def echo_lines(
+    lines: cabc.Iterable[t.Any],
+    file: t.IO[t.Any] | None = None,
+    err: bool = False,
+    color: bool | None = None,
+) -> None:
+    """Print each item followed by a newline, the same as calling
+    :func:`echo` for each one, but much faster for many lines.  The
+    stream, color setting, and binary writer are looked up once, and the
+    lines are joined and written in large chunks, with a single flush at
+    the end.
+
+    .. code-block:: python
+
+        click.echo_lines(f"{row.id}\t{row.name}" for row in rows)
+
+    :param lines: The strings or bytes to output. Other objects are
+        converted to strings, and ``None`` prints an empty line.
+    :param file: The file to write to. Defaults to ``stdout``.
+    :param err: Write to ``stderr`` instead of ``stdout``.
+    :param color: Force showing or hiding colors and other styles. By
+        default Click will remove color if the output does not look like
+        an interactive terminal.
+
+    .. versionadded:: 8.2
+    """
+    if file is None:
+        if err:
+            file = _default_text_stderr()
+        else:
+            file = _default_text_stdout()
+
+        # There are no standard streams attached to write to. For example,
+        # pythonw on Windows.
+        if file is None:
+            return
+
+    # Lines are written directly, write anything buffered before them.
+    _flush_output_buffer()
+
+    color = resolve_color_default(color)
+    strip = should_strip_ansi(file, color)
+
+    if WIN and not strip:
+        if auto_wrap_for_ansi is not None:
+            file = auto_wrap_for_ansi(file)  # type: ignore
+        elif not color:
+            strip = True
+
+    text_file = file
+    binary_file: t.IO[t.Any] | None = None
+    target = text_file
+    pending: list[t.Any] = []
+    size = 0
+
+    def write_pending() -> None:
+        nonlocal size
+
+        if pending:
+            target.write(pending[0][:0].join(pending))
+            pending.clear()
+            size = 0
+
+    for line in lines:
+        if line is None:
+            line = "\n"
+        elif isinstance(line, str):
+            if strip and "\033" in line:
+                line = strip_ansi(line)
+
+            line += "\n"
+        elif isinstance(line, (bytes, bytearray)):
+            line = bytes(line) + b"\n"
+        else:
+            line = str(line)
+
+            if strip and "\033" in line:
+                line = strip_ansi(line)
+
+            line += "\n"
+
+        if isinstance(line, str):
+            next_target = text_file
+        else:
+            if binary_file is None:
+                binary_file = _find_binary_writer(text_file) or text_file
+
+            next_target = binary_file
+
+        # Text and bytes usually go to different streams. Write and flush
+        # what is pending for one before switching to the other.
+        if next_target is not target:
+            write_pending()
+            target.flush()
+            target = next_target
+        elif pending and type(pending[0]) is not type(line):
+            write_pending()
+
+        pending.append(line)
+        size += len(line)
+
+        if size >= _ECHO_LINES_CHUNK_SIZE:
+            write_pending()
+
+    write_pending()
+    target.flush()
+
+
 def get_binary_stream(name: t.Literal["stdin", "stdout", "stderr"]) -> t.BinaryIO:
     """Returns a system stream for byte processing.
 
@@ -364,6 +1080,11 @@ def open_file(
     errors: str | None = "strict",
     lazy: bool = False,
     atomic: bool = False,
+    buffering: int = -1,
+    sequential: bool = False,
+    compression: str | None = None,
+    threads: int = 1,
+    durability: str = "none",
 ) -> t.IO[t.Any]:
     """Open a file, with extra behavior to handle ``'-'`` to indicate
     a standard stream, lazy open on write, and atomic write. Similar to
@@ -390,15 +1111,57 @@ def open_file(
         early, then closed until it is read again.
     :param atomic: Write to a temporary file and replace the given file
         on close.
+    :param buffering: The buffer size passed to :func:`open`. Ignored
+        for ``'-'``.
+    :param sequential: Hint to the OS that the file will be read from
+        start to end, so it reads further ahead. Uses
+        :func:`os.posix_fadvise` where it is available.
+    :param compression: Compress or decompress the file with the
+        ``"gzip"``, ``"bz2"``, or ``"xz"`` codec while streaming. With
+        ``"auto"``, the codec is chosen by the file extension, or by the
+        leading bytes of the data when reading.
+    :param threads: When writing gzip, compress blocks of data in this
+        many threads. The output is still a single gzip stream.
+    :param durability: For atomic writes, ``"file"`` syncs the data to
+        disk before it replaces the file, and ``"dir"`` also syncs the
+        directory after, so the new file survives a power loss. See
+        :func:`atomic_group` to sync the directory once for many files.
+
+    .. versionchanged:: 8.2
+        Added the ``buffering``, ``sequential``, ``compression``,
+        ``threads``, and ``durability`` parameters.
 
     .. versionadded:: 3.0
     """
     if lazy:
         return t.cast(
-            "t.IO[t.Any]", LazyFile(filename, mode, encoding, errors, atomic=atomic)
+            "t.IO[t.Any]",
+            LazyFile(
+                filename,
+                mode,
+                encoding,
+                errors,
+                atomic=atomic,
+                buffering=buffering,
+                sequential=sequential,
+                compression=compression,
+                threads=threads,
+                durability=durability,
+            ),
         )
 
-    f, should_close = open_stream(filename, mode, encoding, errors, atomic=atomic)
+    f, should_close = open_stream(
+        filename,
+        mode,
+        encoding,
+        errors,
+        atomic=atomic,
+        buffering=buffering,
+        sequential=sequential,
+        compression=compression,
+        threads=threads,
+        durability=durability,
+    )
 
     if not should_close:
         f = t.cast("t.IO[t.Any]", KeepOpenFile(f))
@@ -406,6 +1169,237 @@ def open_file(
     return f
 
 
+@contextmanager
+def atomic_group() -> cabc.Iterator[None]:
+    """Group the atomic files closed in this block, so each directory
+    they were written to is synced once at the end, instead of once for
+    every file opened with ``durability="dir"``. This makes writing many
+    small files durably much faster. Files are only guaranteed to
+    survive a power loss once the block exits.
+
+    .. code-block:: python
+
+        with atomic_group():
+            for name, data in outputs:
+                with open_file(name, "w", atomic=True, durability="dir") as f:
+                    f.write(data)
+
+    .. versionadded:: 8.2
+    """
+    group = _push_atomic_group()
+
+    try:
+        yield
+    finally:
+        _pop_atomic_group(group)
+        # Files closed before an error were already moved into place and
+        # still need their directory synced.
+        group.commit()
+
+
+def _unwrap_fd_stream(stream: t.Any) -> t.Any:
+    """Return the binary file object under Click's file wrappers, if it
+    reads or writes a file descriptor directly. Streams that transform
+    the data, such as text or compressed files, return ``None``.
+    """
+    while True:
+        if isinstance(stream, KeepOpenFile):
+            stream = stream._file
+        elif isinstance(stream, LazyFile):
+            stream = stream.open()
+        elif isinstance(stream, _AtomicFile):
+            stream = stream._f
+        else:
+            break
+
+    if isinstance(
+        stream, (io.FileIO, io.BufferedReader, io.BufferedWriter, io.BufferedRandom)
+    ):
+        return stream
+
+    return None
+
+
+#: Errors that mean a copy system call doesn't support these files, so
+#: the next method is tried.
+_COPY_UNSUPPORTED_ERRNOS = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EXDEV,
+    errno.ESPIPE,
+    errno.EPERM,
+}
+
+
+def _copy_fd_methods(src_fd: int, dst_fd: int) -> list[t.Callable[[], int]]:
+    import stat
+
+    src_mode = os.fstat(src_fd).st_mode
+    dst_mode = os.fstat(dst_fd).st_mode
+    count = 1 << 30
+    methods = []
+
+    if stat.S_ISREG(src_mode):
+        if stat.S_ISREG(dst_mode) and hasattr(os, "copy_file_range"):
+            methods.append(lambda: os.copy_file_range(src_fd, dst_fd, count))
+
+        # Other platforms only send to sockets.
+        if sys.platform.startswith("linux"):
+
+            def sendfile() -> int:
+                offset = os.lseek(src_fd, 0, os.SEEK_CUR)
+                n = os.sendfile(dst_fd, src_fd, offset, count)
+                os.lseek(src_fd, offset + n, os.SEEK_SET)
+                return n
+
+            methods.append(sendfile)
+
+    if (stat.S_ISFIFO(src_mode) or stat.S_ISFIFO(dst_mode)) and hasattr(os, "splice"):
+        methods.append(lambda: os.splice(src_fd, dst_fd, count))
+
+    return methods
+
+
+def _write_all(
+    dst: t.IO[t.Any], data: bytes | memoryview, copied: int, raw: bool | None = None
+) -> None:
+    """Write all of ``data`` to ``dst``. Unbuffered files may write only
+    part of it. A non-blocking unbuffered file returns ``None`` if
+    nothing could be written, then :exc:`BlockingIOError` is raised with
+    the number of bytes copied so far, rather than losing the data.
+    Other streams may return ``None`` because they don't count what they
+    wrote.
+    """
+    if raw is None:
+        raw = isinstance(dst, io.RawIOBase)
+
+    view = memoryview(data)
+    size = len(view)
+
+    while view:
+        written: int | None = dst.write(view)
+
+        if written is None:
+            if not raw:
+                return
+
+            done = copied + size - len(view)
+            raise BlockingIOError(
+                errno.EAGAIN, "The destination isn't ready for writing.", done
+            )
+
+        view = view[written:]
+
+
+def copy_stream(
+    src: t.IO[t.Any], dst: t.IO[t.Any], buffer_size: int = 1024 * 1024
+) -> int:
+    """Copy the rest of ``src`` to ``dst``, and return the number of
+    bytes (or characters for text streams) that were copied.
+
+    If both streams are binary files with a file descriptor, such as
+    files opened by :class:`File` or :func:`open_file`, or the streams
+    from :func:`get_binary_stream`, the data is copied by the operating
+    system without passing through Python. This uses
+    :func:`os.copy_file_range` or :func:`os.sendfile` from a regular
+    file, and :func:`os.splice` to or from a pipe, where they are
+    available. Data already buffered in ``src`` is copied first, and
+    ``dst`` is flushed before copying, so the order is kept.
+
+    Otherwise, the data is read into a reused buffer of ``buffer_size``
+    and written to ``dst``.
+
+    If ``dst`` is an unbuffered non-blocking file that isn't ready for
+    writing, :exc:`BlockingIOError` is raised, with the number of bytes
+    that were copied in its ``characters_written`` attribute.
+
+    :param src: The stream to read from.
+    :param dst: The stream to write to.
+    :param buffer_size: The size of the chunks to copy if the operating
+        system can't copy the data directly.
+
+    .. versionadded:: 8.2
+    """
+    total = 0
+    src_file = _unwrap_fd_stream(src)
+    dst_file = _unwrap_fd_stream(dst) if src_file is not None else None
+
+    if src_file is not None and dst_file is not None:
+        try:
+            src_fd = src_file.fileno()
+            dst_fd = dst_file.fileno()
+            methods = _copy_fd_methods(src_fd, dst_fd)
+        except (OSError, ValueError):
+            methods = []
+
+        if methods:
+            # Copy what Python already read ahead, after which the file
+            # positions match what the streams have returned so far.
+            peek = getattr(src_file, "peek", None)
+
+            if peek is not None:
+                pending = peek(1)
+
+                if pending:
+                    data = src_file.read(len(pending))
+                    _write_all(dst_file, data, total)
+                    total += len(data)
+
+            dst_file.flush()
+
+        for method in methods:
+            copied = 0
+
+            try:
+                while True:
+                    n = method()
+
+                    if not n:
+                        break
+
+                    copied += n
+            except OSError as e:
+                if e.errno not in _COPY_UNSUPPORTED_ERRNOS:
+                    raise
+
+                total += copied
+                continue
+
+            total += copied
+
+            # Some files, such as in /proc, report no data to these
+            # calls, so only trust the end of the file if data was seen.
+            if copied:
+                return total
+
+    readinto = getattr(src, "readinto", None)
+
+    if readinto is None:
+        while True:
+            data = src.read(buffer_size)
+
+            if not data:
+                return total
+
+            dst.write(data)
+            total += len(data)
+
+    buf = memoryview(bytearray(buffer_size))
+    dst_raw = isinstance(_unwrap_fd_stream(dst), io.RawIOBase)
+
+    while True:
+        n = readinto(buf)
+
+        if not n:
+            return total
+
+        _write_all(dst, buf[:n], total, dst_raw)
+        total += n
+
+
 def format_filename(
     filename: str | bytes | os.PathLike[str] | os.PathLike[bytes],
     shorten: bool = False,
@@ -418,3 +418,52 @@ def test_abort_exceptions_with_disabled_standalone_mode(runner, exc):
     assert rv.exit_code == 1
     assert isinstance(rv.exception.__cause__, exc)
     assert rv.exception.__cause__.args == ("catch me!",)
+
+
+def test_group_help_uses_command_metadata(runner, tmp_path, monkeypatch):
+    import importlib
+    import sys
+
+    names = [f"lazy_sub_{i}" for i in range(5)]
+
+    for name in names:
+        (tmp_path / f"{name}.py").write_text(
+            "import click_hotoffthehamster\n\n"
+            "@click_hotoffthehamster.command()\n"
+            "def cli():\n"
+            '    """Loaded help."""\n'
+        )
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    manifest = {
+        name: click_hotoffthehamster.CommandMetadata(
+            help=f"Run {name}.\n\nMore text.", deprecated=name == names[1]
+        )
+        for name in names
+    }
+    manifest[names[2]].hidden = True
+
+    class LazyGroup(click_hotoffthehamster.Group):
+        def list_commands(self, ctx):
+            return sorted(manifest)
+
+        def get_command(self, ctx, cmd_name):
+            return importlib.import_module(cmd_name).cli
+
+        def get_command_metadata(self, ctx, cmd_name):
+            return manifest.get(cmd_name)
+
+    cli = LazyGroup("cli")
+    result = runner.invoke(cli, ["--help"])
+    assert not result.exception
+    assert "lazy_sub_0  Run lazy_sub_0." in result.output
+    assert "lazy_sub_1  (Deprecated) Run lazy_sub_1." in result.output
+    assert "lazy_sub_2" not in result.output
+    assert [n for n in names if n in sys.modules] == []
+
+    result = runner.invoke(cli, ["lazy_sub_3", "--help"])
+    assert "Loaded help." in result.output
+    assert [n for n in names if n in sys.modules] == ["lazy_sub_3"]
+
+    for name in names:
+        sys.modules.pop(name, None)
@@ -1,3 +1,12 @@
+import io
+import os
+import shutil
+import time
+
+import pytest
+
+import click_hotoffthehamster
+from click_hotoffthehamster._compat import _TerminalInfo
 from click_hotoffthehamster._compat import should_strip_ansi
 
 
@@ -8,3 +17,94 @@ def test_is_jupyter_kernel_output():
     # implementation detail, aka cheapskate test
     JupyterKernelFakeStream.__module__ = "ipykernel.faked"
     assert not should_strip_ansi(stream=JupyterKernelFakeStream())
+
+
+class CountingStream(io.StringIO):
+    def __init__(self, tty):
+        super().__init__()
+        self.tty = tty
+        self.isatty_calls = 0
+
+    def isatty(self):
+        self.isatty_calls += 1
+        return self.tty
+
+
+def test_terminal_info_stream_cached():
+    stream = CountingStream(tty=True)
+    click_hotoffthehamster._compat.terminal_info.clear()
+    stats = click_hotoffthehamster._compat.terminal_info.stats
+    before = dict(stats)
+
+    for _ in range(100):
+        click_hotoffthehamster.echo("\x1b[31mred\x1b[0m", file=stream)
+
+    assert stream.isatty_calls == 1
+    assert stats["isatty"] - before["isatty"] == 1
+    assert stats["isatty_cached"] - before["isatty_cached"] == 99
+    assert stream.getvalue().startswith("\x1b[31m")
+
+
+def test_terminal_info_isatty_replaced(monkeypatch):
+    stream = CountingStream(tty=True)
+    assert not should_strip_ansi(stream)
+    monkeypatch.setattr(click_hotoffthehamster._compat, "isatty", lambda x: False)
+    assert should_strip_ansi(stream)
+
+
+@pytest.fixture
+def terminal_info(monkeypatch):
+    info = _TerminalInfo()
+    calls = []
+
+    def get_terminal_size():
+        calls.append(None)
+        return os.terminal_size((100 + len(calls), 40))
+
+    monkeypatch.setattr(shutil, "get_terminal_size", get_terminal_size)
+    monkeypatch.delenv("COLUMNS", raising=False)
+    monkeypatch.delenv("LINES", raising=False)
+    return info, calls
+
+
+def test_terminal_info_size_expires(terminal_info, monkeypatch):
+    info, calls = terminal_info
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    assert info.get_size().columns == 101
+    assert info.get_size().columns == 101
+    assert len(calls) == 1
+
+    now[0] = info.size_ttl
+    assert info.get_size().columns == 102
+    assert len(calls) == 2
+
+    info.clear()
+    assert info.get_size().columns == 103
+    assert len(calls) == 3
+    assert info.stats == {"isatty": 0, "isatty_cached": 0, "size": 3, "size_cached": 1}
+
+
+def test_terminal_info_size_env(terminal_info, monkeypatch):
+    info, calls = terminal_info
+    info.get_size()
+    info.get_size()
+    assert len(calls) == 1
+
+    monkeypatch.setenv("COLUMNS", "91")
+    info.get_size()
+    monkeypatch.setenv("LINES", "20")
+    info.get_size()
+    info.get_size()
+    assert len(calls) == 3
+
+
+def test_terminal_info_runner_env(runner):
+    @click_hotoffthehamster.command()
+    def cli():
+        click_hotoffthehamster.echo(
+            click_hotoffthehamster._compat.get_terminal_size().columns
+        )
+
+    assert runner.invoke(cli, env={"COLUMNS": "91"}).output == "91\n"
+    assert runner.invoke(cli, env={"COLUMNS": "92"}).output == "92\n"
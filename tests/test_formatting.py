@@ -368,3 +368,125 @@ def test_help_formatter_write_text():
     actual = formatter.getvalue()
     expected = "  Lorem ipsum dolor sit amet,\n  consectetur adipiscing elit\n"
     assert actual == expected
+
+
+def test_cache_help(runner, monkeypatch):
+    @click_hotoffthehamster.command(cache_help=True)
+    @click_hotoffthehamster.option("--name", help="The name.")
+    def cli(name):
+        """Say hello."""
+
+    calls = []
+    format_help = cli.format_help
+
+    def counting_format_help(ctx, formatter):
+        calls.append(formatter.width)
+        format_help(ctx, formatter)
+
+    monkeypatch.setattr(cli, "format_help", counting_format_help)
+    first = runner.invoke(cli, ["--help"], terminal_width=60).output
+    assert runner.invoke(cli, ["--help"], terminal_width=60).output == first
+    assert calls == [60]
+
+    runner.invoke(cli, ["--help"], terminal_width=70)
+    assert calls == [60, 70]
+
+    cli.params.append(click_hotoffthehamster.Option(["--age"], help="The age."))
+    result = runner.invoke(cli, ["--help"], terminal_width=60)
+    assert "--age" in result.output
+    assert calls == [60, 70, 60]
+
+
+def test_cache_help_group_commands(runner):
+    @click_hotoffthehamster.group(cache_help=True)
+    def cli():
+        pass
+
+    @cli.command()
+    def first():
+        pass
+
+    assert "first" in runner.invoke(cli, ["--help"]).output
+
+    @cli.command()
+    def second():
+        pass
+
+    assert "second" in runner.invoke(cli, ["--help"]).output
+
+
+def test_wrap_text_golden():
+    text = (
+        "Choose one of [alpha|beta|gamma|delta|epsilon|zeta] for the"
+        " --very-long-option-name, or pass a well-known value.\n\n"
+        "\b\nKeep\n  this block\n\n"
+        "    Indented paragraph that is wrapped with extra indentation."
+    )
+    assert click_hotoffthehamster.wrap_text(
+        text, 24, initial_indent="> ", subsequent_indent="  ", preserve_paragraphs=True
+    ).splitlines() == [
+        "> Choose one of [alpha|",
+        "  beta|gamma|delta|",
+        "  epsilon|zeta] for the",
+        "  --very-long-option-",
+        "  name, or pass a well-",
+        "  known value.",
+        "",
+        "> Keep",
+        "    this block",
+        "",
+        ">     Indented paragraph",
+        "      that is wrapped",
+        "      with extra",
+        "      indentation.",
+    ]
+
+
+def test_text_wrapper_matches_textwrap():
+    import random
+    import textwrap
+
+    from click_hotoffthehamster._textwrap import TextWrapper
+
+    class Reference(textwrap.TextWrapper):
+        _handle_long_word = TextWrapper._handle_long_word
+
+    words = ["a", "word", "-", "--", "|", "[a|b|c]", " ", "  ", "\n", "é", "\xa0"]
+    words.append("a-very-long-hyphenated-word")
+    rng = random.Random(42)
+
+    for _ in range(2000):
+        text = "".join(rng.choice(words) for _ in range(rng.randint(0, 30)))
+        kwargs = dict(
+            width=rng.randint(7, 30),
+            initial_indent=" " * rng.randint(0, 6),
+            subsequent_indent=" " * rng.randint(0, 6),
+            replace_whitespace=False,
+            break_long_words=rng.random() < 0.8,
+            break_on_hyphens=rng.random() < 0.8,
+            drop_whitespace=rng.random() < 0.9,
+        )
+        expect = Reference(**kwargs).wrap(text)
+        assert TextWrapper(**kwargs).wrap(text) == expect, (text, kwargs)
+
+
+def test_help_formatter_sink(runner):
+    @click_hotoffthehamster.group(epilog="The end.")
+    @click_hotoffthehamster.option("--count", default=1, help="How many.")
+    def cli(count):
+        """The main command.
+
+        With a second paragraph.
+        """
+
+    @cli.command()
+    def sub():
+        """A subcommand."""
+
+    ctx = click_hotoffthehamster.Context(cli, info_name="cli")
+    chunks = []
+    formatter = ctx.make_formatter(sink=chunks.append)
+    cli.format_help(ctx, formatter)
+    assert len(chunks) > 1
+    assert "".join(chunks) == cli.get_help(ctx) + "\n"
+    assert formatter.buffer == []
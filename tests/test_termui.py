@@ -1,10 +1,14 @@
+import io
+import os
 import platform
+import threading
 import time
 
 import pytest
 
 import click_hotoffthehamster._termui_impl
 from click_hotoffthehamster._compat import WIN
+from click_hotoffthehamster._compat import strip_ansi
 
 
 class FakeClock:
@@ -335,6 +339,518 @@ def test_progress_bar_update_min_steps(runner):
     assert bar.pos == 5
 
 
+def test_progressbar_max_fps(runner, monkeypatch):
+    bars = []
+
+    @click_hotoffthehamster.command()
+    def cli():
+        with click_hotoffthehamster.progressbar(
+            range(20), max_fps=200, show_pos=True
+        ) as progress:
+            bars.append(progress)
+            assert progress._render_thread is not None
+
+            for _ in progress:
+                time.sleep(0.01)
+
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda _: True)
+    output = runner.invoke(cli, catch_exceptions=False).output
+    lines = [line for line in output.split("\r") if "[" in line]
+    # Rendered by the thread while iterating, not once per item.
+    assert 2 < len(lines) < 60
+    assert "20/20" in lines[-1]
+    assert bars[0]._render_thread is None
+    assert bars[0].finished
+
+
+def test_progressbar_max_fps_update(runner, monkeypatch):
+    @click_hotoffthehamster.command()
+    def cli():
+        with click_hotoffthehamster.progressbar(
+            length=100_000, max_fps=10, item_show_func=lambda x: f"Item {x}"
+        ) as progress:
+            while not progress.finished:
+                progress.update(10, progress.pos)
+
+            assert progress.pos == 100_000
+
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda _: True)
+    output = runner.invoke(cli, catch_exceptions=False).output
+    assert output.count("Item") < 10
+    assert "100%" in output
+
+
+def test_progressbar_max_fps_hidden(runner):
+    with click_hotoffthehamster.progressbar(range(3), max_fps=10) as progress:
+        assert progress._render_thread is None
+        assert list(progress) == [0, 1, 2]
+
+
+def test_progressbar_iter_batches(runner, monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(time, "time", fake_clock.time)
+
+    with _create_progress(length=10) as progress:
+        batches = []
+
+        for batch in progress.iter_batches(4):
+            batches.append(batch)
+            # One second per item.
+            fake_clock.advance_time(len(batch))
+
+            if progress.pos == 4:
+                assert progress.eta == 6
+
+        assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+        assert progress.pos == 10
+        assert progress.finished
+
+    with _create_progress(length=1) as progress:
+        with pytest.raises(ValueError):
+            next(progress.iter_batches(0))
+
+
+def test_progressbar_track(runner, monkeypatch):
+    @click_hotoffthehamster.command()
+    def cli():
+        with click_hotoffthehamster.progressbar(length=10, show_pos=True) as progress:
+            assert list(progress.track(iter(range(10)), every=3)) == list(range(10))
+
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda _: True)
+    output = runner.invoke(cli, catch_exceptions=False).output
+    lines = [strip_ansi(line).strip() for line in output.split("\r") if "[" in line]
+    assert [line.rsplit(None, 1)[-1] for line in lines] == [
+        "0/10",
+        "3/10",
+        "6/10",
+        "9/10",
+        "10/10",
+    ]
+
+
+def test_rate_estimator():
+    estimator = click_hotoffthehamster.RateEstimator(stall_timeout=5)
+    estimator.reset(0, 100.0)
+
+    for now, pos in ((101.0, 10), (101.0, 20), (102.0, 20), (104.0, 40)):
+        estimator.update(pos, now)
+
+    assert estimator.rate == 10
+    assert not estimator.is_stalled(108.0)
+    assert estimator.is_stalled(109.0)
+
+
+@pytest.mark.parametrize("interval", [0.25, 1, 5])
+def test_ewma_rate_estimator(interval):
+    estimator = click_hotoffthehamster.EWMARateEstimator(half_life=10)
+    estimator.reset(0, 0.0)
+    now = pos = 0
+
+    # 10 steps per second for a minute, then 20 per second.
+    for rate, seconds in ((10, 60), (20, 10)):
+        for _ in range(int(seconds / interval)):
+            now += interval
+            pos += rate * interval
+            estimator.update(pos, now)
+
+            if rate == 10:
+                assert estimator.rate == pytest.approx(10)
+
+    # After one half-life, the rate is halfway to the new rate, however
+    # often it was sampled.
+    assert estimator.rate == pytest.approx(15)
+
+
+def test_progressbar_rate_template(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(time, "time", fake_clock.time)
+    estimator = click_hotoffthehamster.EWMARateEstimator(stall_timeout=10)
+    progress = click_hotoffthehamster.progressbar(
+        length=1_000_000,
+        bar_template="%(rate)s %(elapsed)s %(eta)s",
+        rate_estimator=estimator,
+        rate_unit="B",
+    )
+
+    for _ in range(4):
+        fake_clock.advance_time(0.5)
+        progress.make_step(12_500)
+
+    assert progress.format_progress_line() == "25.0kB/s 00:00:02 00:00:38"
+    fake_clock.advance_time(10)
+    assert progress.format_progress_line() == "stalled 00:00:12 00:00:38"
+
+
+@pytest.mark.parametrize(
+    "rate, expected",
+    [(0, "0.00/s"), (9.999, "10.0/s"), (999.6, "1.00k/s"), (2.5e13, "25.0T/s")],
+)
+def test_progressbar_format_rate(rate, expected):
+    progress = click_hotoffthehamster.progressbar(length=1)
+    progress.rate_estimator = click_hotoffthehamster.RateEstimator()
+    progress.rate_estimator.rate = rate
+    assert progress.format_rate() == expected
+
+
+def test_progressbar_wrap_reader(tmp_path):
+    import hashlib
+
+    path = tmp_path / "data"
+    path.write_bytes(b"x" * 100_000)
+
+    with open(path, "rb") as f:
+        f.seek(1000)
+
+        with click_hotoffthehamster.progressbar(length=0) as progress:
+            reader = progress.wrap_reader(f)
+            # The size left to read is detected.
+            assert progress.length == 99_000
+            digest = hashlib.sha256(reader.read(10)).digest()
+            buffer = bytearray(1000)
+            view = memoryview(buffer)
+            assert reader.readinto(view) == 1000
+            assert reader.readinto1(view) == 1000
+            assert progress.pos == 2010
+            assert digest == hashlib.sha256(b"x" * 10).digest()
+            assert reader.read() == b"x" * 96_990
+            assert progress.pos == progress.length
+
+        with click_hotoffthehamster.progressbar(length=5) as progress:
+            f.seek(0)
+            progress.wrap_reader(f)
+            # A length that was given is kept.
+            assert progress.length == 5
+
+
+def test_progressbar_wrap_reader_lines(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("a\nbb\nccc\ndddd\n")
+
+    with click_hotoffthehamster.progressbar(length=0) as progress:
+        with progress.wrap_reader(open(path)) as reader:
+            assert reader.readline() == "a\n"
+            assert reader.readlines(1) == ["bb\n"]
+            assert list(reader) == ["ccc\n", "dddd\n"]
+
+        assert reader.closed
+        assert progress.pos == progress.length == 14
+
+
+def test_progressbar_wrap_reader_text_position(tmp_path):
+    path = tmp_path / "data.txt"
+    # A stateful encoding, where tell() returns an opaque cookie.
+    path.write_text("\u65e5\u672c" * 5000, encoding="iso-2022-jp")
+    size = path.stat().st_size
+
+    with open(path, encoding="iso-2022-jp") as f:
+        f.read(1)
+
+        with click_hotoffthehamster.progressbar(length=0) as progress:
+            progress.wrap_reader(f)
+            assert progress.length == size - f.buffer.tell()
+
+
+def test_progressbar_wrap_writer(runner):
+    @click_hotoffthehamster.command()
+    @click_hotoffthehamster.argument("src", type=click_hotoffthehamster.File("rb"))
+    @click_hotoffthehamster.argument(
+        "dst", type=click_hotoffthehamster.File("wb", lazy=True)
+    )
+    def cli(src, dst):
+        with click_hotoffthehamster.progressbar(length=0) as progress:
+            reader = progress.wrap_reader(src)
+            writer = progress.wrap_writer(dst)
+            assert progress.length == 6
+            # Wrapping the lazy file does not open it.
+            assert not os.path.exists("dst")
+            writer.write(reader.read(2))
+            writer.writelines([reader.read(2), reader.read(2)])
+
+        click_hotoffthehamster.echo(progress.pos)
+
+    with runner.isolated_filesystem():
+        with open("src", "wb") as f:
+            f.write(b"abcdef")
+
+        result = runner.invoke(cli, ["src", "dst"])
+        assert result.output.endswith("\n12\n")
+
+        with open("dst", "rb") as f:
+            assert f.read() == b"abcdef"
+
+
+def test_progressbar_log_json(runner, monkeypatch):
+    import json
+
+    fake_clock = FakeClock()
+    monkeypatch.setattr(time, "time", fake_clock.time)
+    file = io.StringIO()
+
+    with click_hotoffthehamster.progressbar(
+        length=100, label="Copying", log_format="json", file=file
+    ) as progress:
+        for _ in range(100):
+            fake_clock.advance_time()
+            progress.update(1)
+
+    lines = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert [line["pos"] for line in lines] == list(range(0, 101, 10))
+    assert lines[5] == {
+        "label": "Copying",
+        "pos": 50,
+        "length": 100,
+        "rate": 1.0,
+        "eta": 50.0,
+        "elapsed": 50.0,
+        "finished": False,
+    }
+    assert lines[-1]["finished"]
+
+
+def test_progressbar_log_logfmt(runner, monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(time, "time", fake_clock.time)
+    log_file = io.StringIO()
+
+    @click_hotoffthehamster.command()
+    def cli():
+        with click_hotoffthehamster.progressbar(
+            range(8),
+            label="Two words",
+            item_show_func=lambda item: None if item is None else f"n={item}",
+            log_format="logfmt",
+            log_percent=25,
+            log_file=log_file,
+        ) as progress:
+            for _ in progress:
+                fake_clock.advance_time(0.5)
+
+    assert runner.invoke(cli).output == ""
+    assert log_file.getvalue().splitlines() == [
+        'label="Two words" pos=0 length=8 rate=0.0 eta= elapsed=0.0'
+        " finished=false item=",
+        'label="Two words" pos=2 length=8 rate=2.0 eta=3.0 elapsed=1.0'
+        ' finished=false item="n=1"',
+        'label="Two words" pos=4 length=8 rate=2.0 eta=2.0 elapsed=2.0'
+        ' finished=false item="n=3"',
+        'label="Two words" pos=6 length=8 rate=2.0 eta=1.0 elapsed=3.0'
+        ' finished=false item="n=5"',
+        'label="Two words" pos=8 length=8 rate=2.0 eta=0.0 elapsed=4.0'
+        " finished=true item=",
+    ]
+
+
+def test_progressbar_log_format_invalid():
+    with pytest.raises(ValueError, match="log format"):
+        click_hotoffthehamster.progressbar(length=1, log_format="xml")
+
+
+def _last_frame(output):
+    frame = output.rsplit("\r", 1)[-1]
+    return [strip_ansi(line) for line in frame.splitlines()]
+
+
+def test_multiprogress(monkeypatch):
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda _: True)
+    file = io.StringIO()
+
+    with click_hotoffthehamster.multiprogress(
+        file=file, show_pos=True, width=4
+    ) as multi:
+        first = multi.add(range(3), label="first")
+        second = multi.add(length=2, label="second")
+        assert list(first) == [0, 1, 2]
+        second.update(1)
+        multi.render_progress()
+        assert _last_frame(file.getvalue()) == [
+            "first  [####]  3/3",
+            "second  [##--]  1/2",
+            "Total  [###-]  4/5",
+        ]
+
+        with second:
+            pass
+
+    assert first.finished and second.finished
+    assert file.getvalue().endswith(click_hotoffthehamster._termui_impl.AFTER_BAR)
+    assert _last_frame(file.getvalue()) == [
+        "first  [####]  3/3",
+        "second  [####]  1/2",
+        "Total  [####]  4/5",
+    ]
+
+
+@pytest.mark.parametrize("max_fps", [None, 0, -1])
+def test_multiprogress_not_throttled(monkeypatch, max_fps):
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda _: True)
+    file = io.StringIO()
+
+    with click_hotoffthehamster.multiprogress(
+        file=file, show_pos=True, width=4, max_fps=max_fps, show_total=False
+    ) as multi:
+        assert multi._render_thread is None
+        bar = multi.add(length=2, label="bar")
+        bar.update(1)
+        # Each update is rendered right away.
+        assert _last_frame(file.getvalue()) == ["bar  [##--]  1/2"]
+
+
+def test_multiprogress_small_terminal(monkeypatch):
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda _: True)
+    monkeypatch.setattr(
+        click_hotoffthehamster._termui_impl,
+        "get_terminal_size",
+        lambda: os.terminal_size((30, 5)),
+    )
+    file = io.StringIO()
+
+    with click_hotoffthehamster.multiprogress(
+        file=file, show_pos=True, width=4
+    ) as multi:
+        bars = [multi.add(length=2, label=str(i)) for i in range(6)]
+        bars[0].update(2)
+        bars[1].update(2)
+
+    assert _last_frame(file.getvalue()) == [
+        "2  [----]  0/2",
+        "3  [----]  0/2",
+        "... and 2 more",
+        "Total  [#---]  4/12",
+    ]
+
+
+def test_multiprogress_not_tty():
+    file = io.StringIO()
+
+    with click_hotoffthehamster.multiprogress(
+        file=file, label="Shards", summary_interval=0
+    ) as multi:
+        multi.add(length=2, label="first").update(2)
+        multi.add(length=2, label="second").update(1)
+
+    assert file.getvalue() == "Shards: 3/4 (75%), 1 of 2 done\n"
+
+
+class CountingWriter(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"max_fps": 1000}])
+def test_multiprogress_threads(monkeypatch, kwargs):
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda _: True)
+    file = CountingWriter()
+    count = 64
+    steps = 1000
+
+    with click_hotoffthehamster.multiprogress(
+        file=file, show_pos=True, **kwargs
+    ) as multi:
+        assert multi._render_thread is not None
+        shared = multi.add(length=count * steps, label="shared")
+        bars = [multi.add(length=steps, label=str(i)) for i in range(count)]
+
+        def work(bar):
+            for _ in range(steps):
+                bar.update(1)
+                shared.update(1)
+
+        threads = [threading.Thread(target=work, args=(bar,)) for bar in bars]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+    # Updates only advance counters, the render thread writes frames.
+    assert file.writes < count * steps / 10
+    assert shared.pos == count * steps
+    assert all(bar.pos == steps and bar.finished for bar in bars)
+    assert multi.total.pos == 2 * count * steps
+    assert multi.total.finished
+
+
+def _progress_worker(counter, steps):
+    for _ in range(steps):
+        counter.update(1)
+
+    return steps
+
+
+def test_progress_channel(monkeypatch):
+    from concurrent.futures import ProcessPoolExecutor
+
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda _: True)
+    file = io.StringIO()
+    steps = [100_000, 200_000, 300_000, 400_000]
+    interval = 0.01
+
+    with click_hotoffthehamster.progress_channel(slots=4) as channel:
+        counters = [channel.counter(i) for i in range(4)]
+        values = channel.values
+        reads = []
+
+        def counting_values():
+            reads.append(None)
+            return values()
+
+        monkeypatch.setattr(channel, "values", counting_values)
+
+        with click_hotoffthehamster.progressbar(length=sum(steps), file=file) as bar:
+            start = time.monotonic()
+
+            with channel.watch(bar, interval=interval):
+                with ProcessPoolExecutor(2) as executor:
+                    futures = [
+                        executor.submit(_progress_worker, counter, n)
+                        for counter, n in zip(counters, steps)
+                    ]
+                    assert [future.result() for future in futures] == steps
+
+            elapsed = time.monotonic() - start
+
+        assert values() == steps
+        assert bar.pos == sum(steps)
+        assert bar.finished
+
+    # The parent only reads the counters once per interval, however many
+    # updates the workers make, and once more at the end.
+    assert len(reads) <= elapsed / interval + 2
+    assert len(reads) < sum(steps) / 1000
+    # The counters mapped in this process are closed with the channel.
+    assert all(counter._mmap.closed for counter in counters)
+    assert not os.path.exists(channel.path)
+
+
+def test_progress_channel_bar_per_slot():
+    with click_hotoffthehamster.progress_channel(slots=2) as channel:
+        with click_hotoffthehamster.multiprogress(file=io.StringIO()) as multi:
+            bars = [multi.add(length=3), multi.add(length=3)]
+
+            with channel.watch(*bars):
+                channel.counter(0).update(3)
+                counter = channel.counter(1)
+                counter.update(1)
+                # A counter created for the same slot continues from it.
+                channel.counter(1).update(1)
+
+        assert [bar.pos for bar in bars] == [3, 2]
+        assert bars[0].finished and not bars[1].finished
+
+        with pytest.raises(ValueError):
+            with channel.watch(*bars, bars[0]):
+                pass
+
+        with pytest.raises(IndexError):
+            channel.counter(2)
+
+
 @pytest.mark.parametrize("key_char", ("h", "H", "é", "À", " ", "字", "àH", "àR"))
 @pytest.mark.parametrize("echo", [True, False])
 @pytest.mark.skipif(not WIN, reason="Tests user-input using the msvcrt module.")
@@ -249,6 +249,300 @@ def test_file_surrogates(type, tmp_path):
         type.convert(path, None, None)
 
 
+def test_file_mmap(tmp_path):
+    import mmap
+
+    path = tmp_path / "data"
+    path.write_bytes(b"a\nbb\n")
+    ctx = click_hotoffthehamster.Context(click_hotoffthehamster.Command("cli"))
+    mapped = click_hotoffthehamster.File("rb", mmap=True).convert(path, None, ctx)
+    assert isinstance(mapped, mmap.mmap)
+    assert mapped.readline() == b"a\n"
+    assert mapped[:] == b"a\nbb\n"
+
+    with pytest.raises(TypeError):
+        mapped[0] = 0
+
+    ctx.close()
+    assert mapped.closed
+
+
+def test_file_mmap_stdin(tmp_path, monkeypatch):
+    import mmap
+
+    path = tmp_path / "data"
+    path.write_bytes(b"a\nbb\n")
+    empty = tmp_path / "empty"
+    empty.touch()
+    file_type = click_hotoffthehamster.File("rb", mmap=True)
+
+    with open(path) as stdin:
+        monkeypatch.setattr("sys.stdin", stdin)
+        stdin.buffer.read(2)
+        mapped = file_type.convert("-", None, None)
+        assert isinstance(mapped, mmap.mmap)
+        # Bytes that were already read are skipped.
+        assert mapped.read() == b"bb\n"
+        mapped.close()
+
+    read_fd, write_fd = os.pipe()
+
+    with open(read_fd) as stdin, open(write_fd, "wb") as pipe:
+        monkeypatch.setattr("sys.stdin", stdin)
+        pipe.write(b"data")
+        pipe.close()
+        assert file_type.convert("-", None, None).read() == b"data"
+
+    f = file_type.convert(empty, None, None)
+    assert f.read() == b""
+    f.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"mode": "r"}, {"mode": "rb+"}, {"mode": "wb"}, {"mode": "rb", "lazy": True}],
+)
+def test_file_mmap_invalid(kwargs):
+    with pytest.raises(ValueError, match="mmap"):
+        click_hotoffthehamster.File(mmap=True, **kwargs)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"compression": "zip"}, "Unknown compression"),
+        ({"compression": "gzip", "mode": "rb", "mmap": True}, "mmap"),
+        ({"compression": "auto", "mode": "r+"}, "updating"),
+        ({"compression": "gzip", "mode": "w", "threads": 0}, "threads"),
+        ({"compression": "bz2", "mode": "w", "threads": 2}, "threads"),
+        ({"compression": "gzip", "threads": 2}, "threads"),
+        ({"mode": "w", "durability": "file"}, "atomic"),
+        ({"mode": "w", "atomic": True, "durability": "full"}, "durability"),
+        ({"mode": "w", "prefetch": 2}, "prefetch"),
+        ({"mode": "rb", "mmap": True, "prefetch": 2}, "prefetch"),
+        ({"prefetch": -1}, "prefetch"),
+    ],
+)
+def test_file_options_invalid(kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        click_hotoffthehamster.File(**kwargs)
+
+
+def test_file_threads_auto_not_gzip(runner, tmp_path):
+    @click_hotoffthehamster.command()
+    @click_hotoffthehamster.argument(
+        "out",
+        type=click_hotoffthehamster.File("w", compression="auto", threads=2),
+    )
+    def cli(out):
+        out.write("data")
+
+    result = runner.invoke(cli, [str(tmp_path / "out.txt")])
+    assert result.exit_code == 2
+    assert "only supported for writing with 'gzip'" in result.output
+
+    result = runner.invoke(cli, [str(tmp_path / "out.gz")])
+    assert result.exit_code == 0
+
+
+@pytest.mark.parametrize("mode", ["rb", "r"])
+def test_file_prefetch(runner, tmp_path, monkeypatch, mode):
+    from click_hotoffthehamster.utils import _FilePrefetcher
+
+    # Small chunks and budget, so large files are only partly read ahead.
+    monkeypatch.setattr(_FilePrefetcher, "chunk_size", 100)
+    sizes = [0, 1, 50, 250, 1000, 3, 0, 999]
+    paths = []
+
+    for i, size in enumerate(sizes):
+        path = tmp_path / str(i)
+        path.write_bytes(b"%d" % i * size)
+        paths.append(str(path))
+
+    @click_hotoffthehamster.command()
+    @click_hotoffthehamster.argument(
+        "files",
+        nargs=-1,
+        type=click_hotoffthehamster.File(mode, prefetch=3, prefetch_bytes=300),
+    )
+    def cli(files):
+        # The callback may use files out of order.
+        assert files[5].read() == ("5" * 3 if mode == "r" else b"5" * 3)
+
+        for i, (f, size) in enumerate(zip(files, sizes)):
+            if i == 5:
+                continue
+
+            data = f.read()
+            assert len(data) == size
+            assert set(data) <= ({str(i)} if mode == "r" else {ord(str(i))})
+
+        files[3].seek(200)
+        assert len(files[3].read()) == 50
+        click_hotoffthehamster.echo("ok")
+
+    result = runner.invoke(cli, paths)
+    assert result.output == "ok\n"
+    assert result.exception is None
+
+
+def test_file_prefetch_limits(tmp_path):
+    import time
+
+    from click_hotoffthehamster.utils import _FilePrefetcher
+
+    prefetcher = _FilePrefetcher(3, 250)
+    entries = []
+
+    for i in range(10):
+        path = tmp_path / str(i)
+        path.write_bytes(b"x" * 100)
+        entries.append(prefetcher.add(str(path)))
+
+    def wait_for(sizes):
+        deadline = time.monotonic() + 5
+
+        while [e.size for e in entries] != sizes:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+
+        # Nothing else is read while the files aren't used.
+        time.sleep(0.05)
+        assert [e.size for e in entries] == sizes
+
+    # The budget is given in order, and only three files are started.
+    wait_for([100, 100, 50] + [0] * 7)
+    assert [e.state for e in entries[:4]] == ["ready", "ready", "loading", "pending"]
+    assert prefetcher.claim(entries[0])
+    wait_for([100, 100, 100, 50] + [0] * 6)
+    prefetcher.close()
+    assert entries[3].file.closed
+
+
+def test_file_prefetch_missing(runner, tmp_path):
+    (tmp_path / "a").write_text("a")
+
+    @click_hotoffthehamster.command()
+    @click_hotoffthehamster.argument(
+        "files", nargs=-1, type=click_hotoffthehamster.File(prefetch=2)
+    )
+    def cli(files):
+        for f in files:
+            click_hotoffthehamster.echo(f.read())
+
+    result = runner.invoke(cli, [str(tmp_path / "a"), str(tmp_path / "b")])
+    assert result.exit_code == 1
+    assert result.output.startswith("a\nError: Could not open file")
+
+
 def test_file_error_surrogates():
     message = FileError(filename="\udcff").format_message()
     assert message == "Could not open file '�': unknown error"
+
+
+def test_choice_normed_choices_cached():
+    calls = []
+
+    def normalize(value):
+        calls.append(value)
+        return value.lower()
+
+    ctx = click_hotoffthehamster.Context(
+        click_hotoffthehamster.Command("cli"), token_normalize_func=normalize
+    )
+    choice = click_hotoffthehamster.Choice(["Foo", "Bar"], case_sensitive=False)
+    assert choice.convert("FOO", None, ctx) == "Foo"
+    assert choice.convert("bar", None, ctx) == "Bar"
+    # Two values, plus each choice normalized only once.
+    assert len(calls) == 4
+
+    choice.choices = ["Baz"]
+    assert choice.convert("baz", None, ctx) == "Baz"
+
+    with pytest.raises(click_hotoffthehamster.BadParameter):
+        choice.convert("foo", None, ctx)
+
+
+def test_choice_fail_truncates_choices():
+    choice = click_hotoffthehamster.Choice([f"c{i}" for i in range(100)])
+
+    with pytest.raises(click_hotoffthehamster.BadParameter) as exc_info:
+        choice.convert("x", None, None)
+
+    message = exc_info.value.message
+    assert message.startswith("'x' is not one of 'c0', 'c1',")
+    assert "'c19', and 80 others." in message
+    assert "'c20'" not in message
+
+
+def test_choice_shell_complete_keeps_order():
+    choice = click_hotoffthehamster.Choice(["ab", "b", "Aa", "a", "ac"])
+    ctx = click_hotoffthehamster.Context(click_hotoffthehamster.Command("cli"))
+    param = click_hotoffthehamster.Option(["-c"], type=choice)
+
+    def values(incomplete):
+        return [c.value for c in choice.shell_complete(ctx, param, incomplete)]
+
+    assert values("a") == ["ab", "a", "ac"]
+    assert values("") == ["ab", "b", "Aa", "a", "ac"]
+    assert values("z") == []
+    choice.case_sensitive = False
+    assert values("a") == ["ab", "Aa", "a", "ac"]
+
+
+def test_choice_loader_is_lazy(runner):
+    calls = []
+
+    def load():
+        calls.append(None)
+        return ["a", "b"]
+
+    @click_hotoffthehamster.command()
+    @click_hotoffthehamster.option(
+        "-c", type=click_hotoffthehamster.Choice(load), default="a"
+    )
+    def cli(c):
+        click_hotoffthehamster.echo(c)
+
+    choice = cli.params[0].type
+    assert not calls
+    assert not choice.is_loaded
+    assert repr(choice).startswith("Choice(<function")
+
+    result = runner.invoke(cli, ["-c", "b"])
+    assert result.output == "b\n"
+    result = runner.invoke(cli, ["--help"])
+    assert "[a|b]" in result.output
+    assert len(calls) == 1
+    assert choice.is_loaded
+
+
+def test_choice_loader_ttl(monkeypatch):
+    import time
+
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    results = iter([["a"], ["a", "b"]])
+    choice = click_hotoffthehamster.Choice(lambda: next(results), ttl=10)
+
+    assert choice.convert("a", None, None) == "a"
+
+    with pytest.raises(click_hotoffthehamster.BadParameter):
+        choice.convert("b", None, None)
+
+    now[0] += 10
+    assert choice.convert("b", None, None) == "b"
+
+
+def test_choice_snapshot_restore():
+    choice = click_hotoffthehamster.Choice(lambda: ["a", "b"])
+    snapshot = choice.snapshot()
+    assert snapshot == ["a", "b"]
+
+    def fail():
+        raise AssertionError("loader should not be called")
+
+    restored = click_hotoffthehamster.Choice(fail)
+    restored.restore(snapshot)
+    assert restored.is_loaded
+    assert restored.convert("b", None, None) == "b"
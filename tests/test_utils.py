@@ -1,7 +1,10 @@
+import io
 import os
 import pathlib
 import stat
 import sys
+import time
+from io import FileIO
 from io import StringIO
 
 import pytest
@@ -52,6 +55,179 @@ def test_echo_no_streams(monkeypatch, runner):
         click_hotoffthehamster.echo("test", err=True)
 
 
+class RecordingFile(StringIO):
+    def __init__(self, log=None, name="out"):
+        super().__init__()
+        self.log = [] if log is None else log
+        self.name = name
+        self.flushes = 0
+
+    def write(self, s):
+        self.log.append((self.name, s))
+        return super().write(s)
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_buffered_output():
+    f = RecordingFile()
+
+    with click_hotoffthehamster.buffered_output(max_delay=None):
+        for i in range(1000):
+            click_hotoffthehamster.echo(i, file=f)
+
+        assert f.getvalue() == ""
+
+    assert f.getvalue() == "".join(f"{i}\n" for i in range(1000))
+    assert len(f.log) == 1
+    assert f.flushes == 1
+
+
+def test_buffered_output_thresholds():
+    f = RecordingFile()
+    now = [0.0]
+
+    with click_hotoffthehamster.buffered_output(max_size=12, max_delay=1) as buffer:
+        buffer._clock = lambda: now[0]
+        buffer._written_at = 0
+        click_hotoffthehamster.echo("abcd", file=f)
+        click_hotoffthehamster.echo("efgh", file=f)
+        assert f.getvalue() == ""
+        # The size threshold is reached.
+        click_hotoffthehamster.echo("ij", file=f)
+        assert f.getvalue() == "abcd\nefgh\nij\n"
+        click_hotoffthehamster.echo("k", file=f)
+        assert f.getvalue() == "abcd\nefgh\nij\n"
+        # The time threshold is reached.
+        now[0] = 2
+        click_hotoffthehamster.echo("l", file=f)
+        assert f.getvalue() == "abcd\nefgh\nij\nk\nl\n"
+        # An empty echo writes right away.
+        click_hotoffthehamster.echo("m", file=f)
+        click_hotoffthehamster.echo(nl=False, file=f)
+        assert f.getvalue().endswith("m\n")
+
+
+def test_buffered_output_timer():
+    f = RecordingFile()
+
+    with click_hotoffthehamster.buffered_output(max_delay=0.2) as buffer:
+        click_hotoffthehamster.echo("a", file=f)
+        timer = buffer._timer
+        click_hotoffthehamster.echo("b", file=f)
+        # One timer writes everything pending.
+        assert buffer._timer is timer
+        timer.join()
+        # Written without another call.
+        assert f.getvalue() == "a\nb\n"
+        assert buffer._timer is None
+
+
+def test_buffered_output_stderr_order(monkeypatch):
+    log = []
+    out = RecordingFile(log, "out")
+    err = RecordingFile(log, "err")
+    monkeypatch.setattr(sys, "stderr", err)
+
+    with click_hotoffthehamster.buffered_output():
+        click_hotoffthehamster.echo("a", file=out)
+        click_hotoffthehamster.echo("b", file=out)
+        click_hotoffthehamster.echo("c", err=True)
+        click_hotoffthehamster.echo("d", file=out)
+
+    # Ignore the empty writes used to detect if a stream is binary.
+    log = [item for item in log if item[1]]
+    assert log == [("out", "a\nb\n"), ("err", "c\n"), ("out", "d\n")]
+
+
+def test_buffered_output_prompt(monkeypatch):
+    f = RecordingFile()
+    monkeypatch.setattr(click_hotoffthehamster.utils, "_default_text_stdout", lambda: f)
+    seen = []
+
+    def visible_prompt_func(text):
+        seen.append(f.getvalue())
+        return "x"
+
+    monkeypatch.setattr(
+        click_hotoffthehamster.termui, "visible_prompt_func", visible_prompt_func
+    )
+
+    with click_hotoffthehamster.buffered_output():
+        click_hotoffthehamster.echo("before")
+        assert click_hotoffthehamster.prompt("Name") == "x"
+
+    assert seen == ["before\nName:"]
+
+
+def test_buffered_output_context(runner):
+    buffers = []
+
+    @click_hotoffthehamster.group(context_settings={"buffered_output": True})
+    def cli():
+        click_hotoffthehamster.echo("group")
+
+    @cli.command()
+    @click_hotoffthehamster.pass_context
+    def sub(ctx):
+        buffers.append(ctx._output_buffer)
+        buffers.append(ctx.parent._output_buffer)
+        click_hotoffthehamster.echo("sub")
+
+    @cli.command(context_settings={"buffered_output": False})
+    @click_hotoffthehamster.pass_context
+    def direct(ctx):
+        buffers.append(ctx._output_buffer)
+        click_hotoffthehamster.echo("direct")
+
+    result = runner.invoke(cli, ["sub"])
+    assert result.output == "group\nsub\n"
+    assert buffers[0] is not None
+    assert buffers[0] is buffers[1]
+
+    result = runner.invoke(cli, ["direct"])
+    assert result.output == "group\ndirect\n"
+    assert buffers[2] is None
+
+
+@pytest.mark.parametrize("color", [None, True, False])
+def test_echo_lines_matches_echo(color):
+    lines = ["a", "", None, 42, "\x1b[31mred\x1b[0m", "x" * 100_000, "end"]
+    expect = StringIO()
+
+    for line in lines:
+        click_hotoffthehamster.echo(line, file=expect, color=color)
+
+    f = RecordingFile()
+    click_hotoffthehamster.echo_lines(iter(lines), file=f, color=color)
+    assert f.getvalue() == expect.getvalue()
+    # Two chunks, split after the long line.
+    assert len(f.log) == 2
+    assert f.flushes == 1
+
+
+def test_echo_lines_bytes(capfdbinary):
+    click_hotoffthehamster.echo_lines(["text", b"\xe2\x98\x83", bytearray(b"b"), "end"])
+    out, err = capfdbinary.readouterr()
+    assert out == b"text\n\xe2\x98\x83\nb\nend\n"
+
+    click_hotoffthehamster.echo_lines(["error"], err=True)
+    out, err = capfdbinary.readouterr()
+    assert err == b"error\n"
+
+
+def test_echo_lines_buffered_output():
+    f = RecordingFile()
+
+    with click_hotoffthehamster.buffered_output():
+        click_hotoffthehamster.echo("first", file=f)
+        click_hotoffthehamster.echo_lines(["a", "b"], file=f)
+        click_hotoffthehamster.echo("last", file=f)
+
+    assert f.log == [("out", "first\n"), ("out", "a\nb\n"), ("out", "last\n")]
+
+
 @pytest.mark.parametrize(
     ("styles", "ref"),
     [
@@ -95,6 +271,46 @@ def test_echo_no_streams(monkeypatch, runner):
 def test_styling(styles, ref):
     assert click_hotoffthehamster.style("x y", **styles) == ref
     assert click_hotoffthehamster.unstyle(ref) == "x y"
+    assert click_hotoffthehamster.Style(**styles)("x y") == ref
+
+
+def test_style_object():
+    style = click_hotoffthehamster.Style(fg="red", bold=True)
+    assert style.prefix == "\x1b[31m\x1b[1m"
+    assert style.suffix == "\x1b[0m"
+    assert style(42) == "\x1b[31m\x1b[1m42\x1b[0m"
+    assert repr(style) == "Style(fg='red', bold=True)"
+
+    other = style.replace(fg="green", reset=False)
+    assert other("x") == "\x1b[32m\x1b[1mx"
+    assert style("x") == "\x1b[31m\x1b[1mx\x1b[0m"
+
+    with pytest.raises(TypeError, match="Unknown color 'purple'"):
+        click_hotoffthehamster.Style(fg="purple")
+
+
+def test_style_cached():
+    from click_hotoffthehamster.termui import _get_style
+
+    assert _get_style(fg="red") is _get_style(fg="red")
+    assert _get_style(fg="red") is not _get_style(fg="red", reset=False)
+    # Unhashable colors are not cached but still work.
+    assert _get_style(fg=[1, 2, 3]).prefix == "\x1b[38;2;1;2;3m"
+    assert click_hotoffthehamster.style("x", fg=[1, 2, 3]) == (
+        "\x1b[38;2;1;2;3mx\x1b[0m"
+    )
+
+
+def test_secho_style_object(runner):
+    style = click_hotoffthehamster.Style(fg="blue")
+
+    with runner.isolation() as outstreams:
+        click_hotoffthehamster.secho("a", style=style, color=True)
+        click_hotoffthehamster.secho("b", style=style, underline=True, color=True)
+        click_hotoffthehamster.secho(b"c", style=style)
+        assert outstreams[0].getvalue() == (
+            b"\x1b[34ma\x1b[0m\n\x1b[34m\x1b[4mb\x1b[0m\nc\n"
+        )
 
 
 @pytest.mark.parametrize(("text", "expect"), [("\x1b[?25lx y\x1b[?25h", "x y")])
@@ -216,6 +432,113 @@ def test_echo_via_pager(monkeypatch, capfd, cat, test):
     assert out == expected_output
 
 
+@pytest.mark.skipif(WIN, reason="Different behavior on windows.")
+def test_echo_via_pager_streams(monkeypatch, capfd, tmp_path):
+    # The pager copies the first chunk to a file and the rest to stdout.
+    first = tmp_path / "first"
+    monkeypatch.setitem(
+        os.environ, "PAGER", f"sh -c 'dd bs=1 count=5 of={first} 2>/dev/null; cat'"
+    )
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda x: True)
+
+    def gen():
+        yield "first"
+
+        # The pager must see the first chunk before the rest is produced.
+        for _ in range(500):
+            if first.exists() and first.stat().st_size == 5:
+                break
+
+            time.sleep(0.01)
+
+        yield "rest"
+
+    click_hotoffthehamster.echo_via_pager(gen)
+    out, err = capfd.readouterr()
+    assert first.read_text() == "first"
+    assert out == "rest\n"
+
+
+@pytest.mark.skipif(WIN, reason="Different behavior on windows.")
+@pytest.mark.parametrize("buffer_size", [1, 7, None])
+def test_echo_via_pager_buffer_size(monkeypatch, capfd, buffer_size):
+    monkeypatch.setitem(os.environ, "PAGER", "cat")
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda x: True)
+    lines = [
+        f"\x1b[3{i % 8}mline {i}\x1b[0m\n" if i % 3 else f"{i}\n" for i in range(100)
+    ]
+
+    click_hotoffthehamster.echo_via_pager(lines, color=False, buffer_size=buffer_size)
+    out, err = capfd.readouterr()
+    assert out == click_hotoffthehamster.unstyle("".join(lines)) + "\n"
+
+
+@pytest.mark.skipif(WIN, reason="Different behavior on windows.")
+def test_echo_via_pager_early_exit(monkeypatch, capfd):
+    monkeypatch.setitem(os.environ, "PAGER", "head -c 10")
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda x: True)
+    state = {"count": 0, "closed": False}
+
+    def gen():
+        try:
+            while True:
+                yield f"{state['count'] % 10}"
+                state["count"] += 1
+        finally:
+            state["closed"] = True
+
+    click_hotoffthehamster.echo_via_pager(gen, buffer_size=100)
+    out, err = capfd.readouterr()
+    assert out == "0123456789"
+    assert err == ""
+    assert state["closed"]
+
+
+@pytest.mark.skipif(WIN, reason="Different behavior on windows.")
+def test_echo_via_pager_caller_error(monkeypatch, capfd):
+    monkeypatch.setitem(os.environ, "PAGER", "cat")
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda x: True)
+
+    def gen():
+        yield "a"
+        raise FileNotFoundError("missing")
+
+    # Only errors from writing to the pager are suppressed.
+    with pytest.raises(FileNotFoundError, match="missing"):
+        click_hotoffthehamster.echo_via_pager(gen)
+
+
+@pytest.mark.skipif(WIN, reason="Different behavior on windows.")
+def test_open_pager_help_sink(monkeypatch, capfd):
+    monkeypatch.setitem(os.environ, "PAGER", "cat")
+    monkeypatch.setattr(click_hotoffthehamster._termui_impl, "isatty", lambda x: True)
+
+    @click_hotoffthehamster.command()
+    @click_hotoffthehamster.option("--name", help="The name.")
+    def cli(name):
+        """Greets someone."""
+
+    ctx = click_hotoffthehamster.Context(cli, info_name="cli")
+
+    with click_hotoffthehamster.open_pager() as write:
+        formatter = ctx.make_formatter(sink=write)
+        cli.format_help(ctx, formatter)
+
+    out, err = capfd.readouterr()
+    assert out == cli.get_help(ctx) + "\n"
+    assert formatter.getvalue() == ""
+
+
+@pytest.mark.skipif(WIN, reason="Test does not make sense on Windows.")
+def test_tempfilepager(capfd):
+    with click_hotoffthehamster._termui_impl._tempfilepager("cat", False) as write:
+        write("\x1b[31mred\x1b[0m\n")
+        write("plain\n")
+
+    out, err = capfd.readouterr()
+    assert out == "red\nplain\n"
+
+
 @pytest.mark.skipif(WIN, reason="Test does not make sense on Windows.")
 def test_echo_color_flag(monkeypatch, capfd):
     isatty = True
@@ -451,6 +774,473 @@ def test_iter_lazyfile(tmpdir):
                 assert e_line == a_line.strip()
 
 
+def test_lazyfile_binds_methods(tmp_path):
+    path = tmp_path / "out.txt"
+    lf = click_hotoffthehamster.utils.LazyFile(path, "w", buffering=1)
+    assert not path.exists()
+    lf.write("a\n")
+    # The file's method is stored on the lazy file after the first call.
+    assert lf.__dict__["write"] == lf._f.write
+    # Line buffered, so the line was written through already.
+    assert path.read_text() == "a\n"
+    assert not lf.closed
+    lf.close()
+    assert lf.closed
+
+
+def test_keepopenfile_binds_methods(tmp_path):
+    with open(tmp_path / "in.txt", "w+") as f:
+        kf = click_hotoffthehamster.utils.KeepOpenFile(f)
+        kf.write("a")
+        assert kf.__dict__["write"] == f.write
+        assert "closed" not in kf.__dict__
+
+
+def test_open_file_buffering_sequential(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        os, "posix_fadvise", lambda *args: calls.append(args), raising=False
+    )
+    monkeypatch.setattr(os, "POSIX_FADV_SEQUENTIAL", 2, raising=False)
+    path = tmp_path / "in.bin"
+    path.write_bytes(b"data")
+
+    with click_hotoffthehamster.open_file(
+        str(path), "rb", buffering=0, sequential=True
+    ) as f:
+        # Unbuffered binary files are not wrapped in a buffer.
+        assert isinstance(f, FileIO)
+        assert calls == [(f.fileno(), 0, 0, 2)]
+        assert f.read() == b"data"
+
+
+@pytest.mark.parametrize(
+    ("compression", "name", "module"),
+    [
+        ("gzip", "out", "gzip"),
+        ("bz2", "out", "bz2"),
+        ("xz", "out", "lzma"),
+        ("auto", "out.gz", "gzip"),
+        ("auto", "out.bz2", "bz2"),
+        ("auto", "out.XZ", "lzma"),
+    ],
+)
+@pytest.mark.parametrize("lazy", [True, False])
+@pytest.mark.parametrize("atomic", [True, False])
+def test_open_file_compression(tmp_path, compression, name, module, lazy, atomic):
+    import importlib
+
+    path = str(tmp_path / name)
+    f = click_hotoffthehamster.open_file(
+        path, "w", compression=compression, lazy=lazy, atomic=atomic
+    )
+
+    with f:
+        f.write("line 1\n")
+        f.writelines(["line 2\n"])
+
+        if atomic:
+            assert not os.path.exists(path)
+
+    assert os.listdir(tmp_path) == [name]
+
+    with importlib.import_module(module).open(path, "rt") as f:
+        assert f.read() == "line 1\nline 2\n"
+
+    # Auto detects the codec from the data, not only the extension.
+    os.rename(path, tmp_path / "data")
+
+    with click_hotoffthehamster.open_file(
+        str(tmp_path / "data"), compression="auto", lazy=lazy
+    ) as f:
+        assert list(f) == ["line 1\n", "line 2\n"]
+
+
+def test_open_file_compression_auto_plain(tmp_path):
+    path = tmp_path / "data.txt"
+
+    with click_hotoffthehamster.open_file(str(path), "wb", compression="auto") as f:
+        f.write(b"plain")
+
+    assert path.read_bytes() == b"plain"
+
+    with click_hotoffthehamster.open_file(str(path), "rb", compression="auto") as f:
+        assert isinstance(f, io.BufferedReader)
+        assert f.read() == b"plain"
+
+    with click_hotoffthehamster.open_file(str(path), compression="auto") as f:
+        assert f.read() == "plain"
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="FIFOs are not available.")
+@pytest.mark.parametrize("mode", ["r", "rb"])
+@pytest.mark.parametrize("compressed", [True, False])
+def test_open_file_compression_auto_fifo(tmp_path, mode, compressed):
+    import gzip
+    import threading
+
+    path = str(tmp_path / "fifo")
+    os.mkfifo(path)
+    data = b"line 1\nline 2\n"
+
+    def feed():
+        with open(path, "wb") as f:
+            f.write(gzip.compress(data) if compressed else data)
+
+    writer = threading.Thread(target=feed)
+    writer.start()
+
+    # A FIFO can only be read once, so detection must not consume it.
+    with click_hotoffthehamster.open_file(path, mode, compression="auto") as f:
+        rv = f.read()
+
+    writer.join()
+    assert rv == (data if "b" in mode else data.decode())
+
+
+def test_open_file_compression_std_streams(runner):
+    import gzip
+
+    @click_hotoffthehamster.command()
+    @click_hotoffthehamster.argument(
+        "src", type=click_hotoffthehamster.File("rb", compression="auto")
+    )
+    @click_hotoffthehamster.argument(
+        "dst", type=click_hotoffthehamster.File("w", compression="gzip")
+    )
+    def cli(src, dst):
+        dst.write(src.read().decode().upper())
+
+    result = runner.invoke(cli, ["-", "-"], input=gzip.compress(b"data"))
+    assert result.exception is None
+    assert gzip.decompress(result.stdout_bytes) == b"DATA"
+
+
+@pytest.mark.parametrize("size", [0, 1, 999, 1000, 12345])
+@pytest.mark.parametrize("atomic", [True, False])
+def test_open_file_gzip_threads(tmp_path, monkeypatch, size, atomic):
+    import gzip
+
+    from click_hotoffthehamster._compat import _ParallelGzipWriter
+
+    # Small blocks, so the data spans many blocks and the in-memory
+    # limit is reached.
+    monkeypatch.setattr(_ParallelGzipWriter, "block_size", 1000)
+    data = os.urandom(size // 2).hex().encode() + b"x" * (size % 2)
+    path = tmp_path / "out.gz"
+
+    with click_hotoffthehamster.open_file(
+        str(path), "wb", compression="auto", atomic=atomic, threads=4
+    ) as f:
+        for i in range(0, size, 333):
+            f.write(data[i : i + 333])
+            assert len(f._f._pending) <= 8
+
+        f.flush()
+
+    assert os.listdir(tmp_path) == ["out.gz"]
+    assert gzip.decompress(path.read_bytes()) == data
+
+
+def test_open_file_gzip_threads_text(tmp_path):
+    import gzip
+
+    path = tmp_path / "out"
+
+    with click_hotoffthehamster.open_file(
+        str(path), "w", compression="gzip", threads=2
+    ) as f:
+        f.writelines(f"line {i}\n" for i in range(100_000))
+
+    with gzip.open(path, "rt") as f:
+        assert f.readlines() == [f"line {i}\n" for i in range(100_000)]
+
+
+@pytest.mark.parametrize("mode", ["r+", "w+b"])
+def test_open_file_compression_update(tmp_path, mode):
+    with pytest.raises(ValueError, match="updating"):
+        click_hotoffthehamster.open_file(
+            str(tmp_path / "a.gz"), mode, compression="gzip"
+        )
+
+
+@pytest.fixture(params=[True, False], ids=["anonymous", "named"])
+def anonymous_files(request, monkeypatch):
+    from click_hotoffthehamster import _compat
+
+    if request.param and not _compat._anonymous_files_supported:
+        pytest.skip("O_TMPFILE is not supported.")
+
+    monkeypatch.setattr(_compat, "_anonymous_files_supported", request.param)
+    return request.param
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork.")
+def test_atomic_write_crash(tmp_path, anonymous_files):
+    path = tmp_path / "out.txt"
+    path.write_text("old")
+
+    pid = os.fork()
+
+    if pid == 0:
+        try:
+            f = click_hotoffthehamster.open_file(str(path), "w", atomic=True)
+            f.write("new")
+            f.flush()
+        except BaseException:
+            import traceback
+
+            traceback.print_exc()
+            os._exit(2)
+
+        # Exit without closing, like a process that was killed.
+        os._exit(1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status)
+    assert os.WEXITSTATUS(status) == 1
+    assert path.read_text() == "old"
+
+    if anonymous_files:
+        # Nothing is left behind, since the file never had a name.
+        assert os.listdir(tmp_path) == ["out.txt"]
+
+
+@pytest.mark.parametrize("exists", [True, False])
+@pytest.mark.parametrize("durability", ["none", "file", "dir"])
+def test_atomic_write_durability(tmp_path, anonymous_files, exists, durability):
+    path = tmp_path / "out.txt"
+
+    if exists:
+        path.write_text("old")
+        path.chmod(0o600)
+
+    with click_hotoffthehamster.open_file(
+        str(path), "w", atomic=True, durability=durability
+    ) as f:
+        f.write("new")
+
+    assert path.read_text() == "new"
+    assert os.listdir(tmp_path) == ["out.txt"]
+
+    if exists:
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_atomic_write_sync_calls(tmp_path, monkeypatch, anonymous_files):
+    calls = []
+    monkeypatch.setattr(os, "fsync", lambda fd: calls.append("fsync"))
+    monkeypatch.setattr(os, "fdatasync", lambda fd: calls.append("fdatasync"))
+
+    def write(name, durability):
+        with click_hotoffthehamster.open_file(
+            str(tmp_path / name), "w", atomic=True, durability=durability
+        ) as f:
+            f.write(name)
+
+    write("a", "none")
+    assert calls == []
+    write("b", "file")
+    assert calls == ["fdatasync"]
+    calls.clear()
+    write("c", "dir")
+    assert calls == ["fdatasync", "fsync"]
+    calls.clear()
+
+    with click_hotoffthehamster.atomic_group():
+        for name in "defg":
+            write(name, "dir")
+
+        # The directory is synced once the group exits.
+        assert calls == ["fdatasync"] * 4
+
+    assert calls == ["fdatasync"] * 4 + ["fsync"]
+    assert sorted(os.listdir(tmp_path)) == list("abcdefg")
+    calls.clear()
+
+    with pytest.raises(RuntimeError):
+        with click_hotoffthehamster.atomic_group():
+            write("h", "dir")
+            raise RuntimeError()
+
+    # The files closed before the error are synced too.
+    assert calls == ["fdatasync", "fsync"]
+
+
+@pytest.mark.parametrize("exists", [True, False])
+def test_atomic_write_link_failed(tmp_path, monkeypatch, anonymous_files, exists):
+    import errno
+
+    if not anonymous_files:
+        pytest.skip("Only anonymous files are linked.")
+
+    path = tmp_path / "out.txt"
+
+    if exists:
+        path.write_text("old")
+
+    def link(*args, **kwargs):
+        raise PermissionError(errno.EPERM, "Operation not permitted")
+
+    monkeypatch.setattr(os, "link", link)
+
+    with click_hotoffthehamster.open_file(
+        str(path), "w", atomic=True, durability="file"
+    ) as f:
+        f.write("new" * 1000)
+
+    # The data is copied to a named file instead.
+    assert path.read_text() == "new" * 1000
+    assert os.listdir(tmp_path) == ["out.txt"]
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"atomic": True, "durability": "full"}, "Unknown durability"),
+        ({"durability": "file"}, "only supported for atomic"),
+    ],
+)
+def test_open_file_durability_invalid(tmp_path, kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        click_hotoffthehamster.open_file(str(tmp_path / "a"), "w", **kwargs)
+
+
+@pytest.mark.parametrize(
+    ("name", "mode", "kwargs"),
+    [
+        ("a.gz", "w", {"compression": "gzip", "threads": 0}),
+        ("a.gz", "w", {"compression": "gzip", "threads": -2}),
+        ("a.gz", "w", {"threads": 2}),
+        ("a.bz2", "w", {"compression": "bz2", "threads": 2}),
+        ("a.bz2", "w", {"compression": "auto", "threads": 2}),
+        ("a.txt", "w", {"compression": "auto", "threads": 2}),
+        ("a.gz", "r", {"compression": "gzip", "threads": 2}),
+    ],
+)
+def test_open_file_threads_invalid(tmp_path, name, mode, kwargs):
+    path = tmp_path / name
+    path.write_bytes(b"")
+
+    with pytest.raises(ValueError, match="'threads' must be at least 1"):
+        click_hotoffthehamster.open_file(str(path), mode, **kwargs)
+
+
+def test_copy_stream_file(tmp_path):
+    data = os.urandom(300_000)
+    (tmp_path / "in").write_bytes(data)
+
+    with open(tmp_path / "in", "rb") as src, open(tmp_path / "out", "wb") as dst:
+        # Data buffered on either side is kept in order.
+        assert src.read(10) == data[:10]
+        dst.write(b"head")
+        assert click_hotoffthehamster.copy_stream(src, dst) == len(data) - 10
+        assert src.read() == b""
+        dst.write(b"tail")
+
+    assert (tmp_path / "out").read_bytes() == b"head" + data[10:] + b"tail"
+
+
+@pytest.mark.parametrize("src_pipe", [True, False])
+def test_copy_stream_pipe(tmp_path, src_pipe):
+    import threading
+
+    data = os.urandom(300_000)
+    (tmp_path / "data").write_bytes(data)
+    r, w = os.pipe()
+    result = []
+
+    if src_pipe:
+        src, dst = open(r, "rb"), open(tmp_path / "out", "wb")
+        thread = threading.Thread(target=lambda: (os.write(w, data), os.close(w)))
+    else:
+        src, dst = open(tmp_path / "data", "rb"), open(w, "wb")
+        thread = threading.Thread(target=lambda: result.append(open(r, "rb").read()))
+
+    thread.start()
+
+    with src, dst:
+        assert click_hotoffthehamster.copy_stream(src, dst) == len(data)
+
+    thread.join()
+
+    if src_pipe:
+        assert (tmp_path / "out").read_bytes() == data
+    else:
+        assert result == [data]
+
+
+def test_copy_stream_unsupported(tmp_path, monkeypatch):
+    import errno
+
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(os, "sendfile", unsupported, raising=False)
+    (tmp_path / "in").write_bytes(b"data")
+
+    with open(tmp_path / "in", "rb") as src, open(tmp_path / "out", "wb") as dst:
+        assert click_hotoffthehamster.copy_stream(src, dst, buffer_size=3) == 4
+
+    assert (tmp_path / "out").read_bytes() == b"data"
+
+
+def test_copy_stream_wrapped(tmp_path):
+    import gzip
+    from io import BytesIO
+
+    (tmp_path / "in.gz").write_bytes(gzip.compress(b"data"))
+    dst = BytesIO()
+
+    # Compressed and text files are copied as seen through the wrapper.
+    with click_hotoffthehamster.open_file(str(tmp_path / "in.gz"), "rb") as src:
+        assert click_hotoffthehamster.copy_stream(src, dst) == len(dst.getvalue())
+
+    with click_hotoffthehamster.open_file(
+        str(tmp_path / "in.gz"), "rb", compression="auto"
+    ) as src:
+        dst = BytesIO()
+        assert click_hotoffthehamster.copy_stream(src, dst) == 4
+        assert dst.getvalue() == b"data"
+
+    out = StringIO()
+    assert click_hotoffthehamster.copy_stream(StringIO("text"), out) == 4
+    assert out.getvalue() == "text"
+
+
+@pytest.mark.skipif(WIN, reason="Non-blocking pipes are not available.")
+def test_copy_stream_non_blocking():
+    from io import BytesIO
+
+    data = os.urandom(1024 * 1024)
+    r, w = os.pipe()
+    os.set_blocking(w, False)
+
+    with open(r, "rb") as reader, open(w, "wb", buffering=0) as writer:
+        # The pipe fills up, nothing written is lost or counted twice.
+        with pytest.raises(BlockingIOError) as exc_info:
+            click_hotoffthehamster.copy_stream(BytesIO(data), writer)
+
+        written = exc_info.value.characters_written
+        assert 0 < written < len(data)
+        writer.close()
+        assert reader.read() == data[:written]
+
+
+def test_copy_stream_write_returns_none():
+    class Writer:
+        def __init__(self):
+            self.data = b""
+
+        def write(self, b):
+            self.data += bytes(b)
+
+    dst = Writer()
+    assert click_hotoffthehamster.copy_stream(io.BytesIO(b"data"), dst) == 4
+    assert dst.data == b"data"
+
+
 class MockMain:
     __slots__ = "__package__"
 